@@ -1,7 +1,78 @@
-from typing import List
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from weakref import WeakKeyDictionary
 from habit import Habit
 from functools import reduce
 
+
+class MetricsCache:
+    """
+    Caches derived metrics per habit, keyed by the habit's mutation version.
+
+    Entries are recomputed only after check_off/uncheck changed the habit, and
+    disappear when the habit is evicted or garbage collected.
+    """
+
+    def __init__(self):
+        self._entries: "WeakKeyDictionary[Habit, tuple]" = WeakKeyDictionary()
+
+    def get(self, habit: Habit) -> Dict:
+        """
+        Return the cached metrics for a habit, recomputing them if the habit changed.
+
+        Keys:
+        - completions: number of logged completions
+        - longest_streak: longest uninterrupted streak
+        - last_done: latest completion timestamp or None
+        """
+        version = habit.version
+        entry = self._entries.get(habit)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        metrics = {
+            "completions": habit.get_completion_count(),
+            "longest_streak": habit.get_longest_streak(),
+            "last_done": habit.get_last_completion(),
+        }
+        self._entries[habit] = (version, metrics)
+        return metrics
+
+    def evict(self, habit: Habit):
+        """
+        Drop the cached metrics of a habit.
+        """
+        self._entries.pop(habit, None)
+
+    def clear(self):
+        """
+        Drop all cached metrics.
+        """
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared cache used by the functions below and by HabitManager
+metrics_cache = MetricsCache()
+
+
+def get_habit_metrics(habit: Habit) -> Dict:
+    """
+    Get the cached derived metrics for a single habit.
+    """
+    return metrics_cache.get(habit)
+
+
+def evict_habit(habit: Habit):
+    """
+    Remove a habit's cached metrics, e.g. after it was removed from its manager.
+    """
+    metrics_cache.evict(habit)
+
+
 def get_all_habits(habits: List[Habit]) -> List[str]:
     """
     Return the names of all habits.
@@ -23,15 +94,13 @@ def calculate_streak_for_habit(habit: Habit) -> int:
     return habit.get_current_streak()
 
 
-def calculate_longest_streaks(habits: List[Habit]) -> int:
+def calculate_longest_streaks(habits: Iterable[Habit]) -> int:
     """
     Get the longest streak across all habits.
     """
-    if not habits:
-        return 0
-    return max((h.get_longest_streak() for h in habits), default=0)
+    return max((get_habit_metrics(h)["longest_streak"] for h in habits), default=0)
 
-def get_streak_summary(habits: List[Habit]) -> dict:
+def get_streak_summary(habits: Iterable[Habit]) -> dict:
     """
     Return a summary dictionary of streak analytics across all habits.
 
@@ -40,17 +109,53 @@ def get_streak_summary(habits: List[Habit]) -> dict:
     - longest_streak_overall: the highest single habit streak
     - average_streak: mean of all longest streaks
     """
-    if not habits:
-        return {"total_habits": 0, "longest_streak_overall": 0, "average_streak": 0.0}
-
-    total = len(habits)
-    longest = calculate_longest_streaks(habits)
-    average = round(
-        sum(h.get_longest_streak() for h in habits) / total, 2
+    # Single pass over any iterable, e.g. HabitManager.iter_habits_from_file()
+    total, longest, streak_sum = reduce(
+        lambda acc, streak: (acc[0] + 1, max(acc[1], streak), acc[2] + streak),
+        map(lambda h: get_habit_metrics(h)["longest_streak"], habits),
+        (0, 0, 0),
     )
+    if not total:
+        return {"total_habits": 0, "longest_streak_overall": 0, "average_streak": 0.0}
+    average = round(streak_sum / total, 2)
 
     return {
         "total_habits": total,
         "longest_streak_overall": longest,
         "average_streak": average,
     }
+
+
+# Group metrics below are built from aggregates each Habit keeps up to date on
+# check_off/uncheck, so their cost does not grow with the length of the history
+
+def get_completion_rate(habits: Iterable[Habit], period_start: datetime, period_end: datetime) -> float:
+    """
+    Return the mean completion rate of the habits between two dates (see Habit.completion_rate).
+    """
+    rates = [h.completion_rate(period_start, period_end) for h in habits]
+    return sum(rates) / len(rates) if rates else 0.0
+
+
+def get_rolling_adherence(habits: Iterable[Habit], date: Optional[datetime] = None,
+                          windows: Iterable[int] = (7, 30, 90)) -> Dict[int, float]:
+    """
+    Return the mean adherence of the habits over the last N periods, for every window length N.
+    """
+    windows = tuple(windows)
+    per_habit = [h.rolling_adherence(date, windows) for h in habits]
+    return {n: sum(a[n] for a in per_habit) / len(per_habit) if per_habit else 0.0 for n in windows}
+
+
+def get_streak_histogram(habits: Iterable[Habit]) -> Dict[int, int]:
+    """
+    Return streak length -> number of streaks with that length, across all habits.
+    """
+    return dict(sorted(reduce(lambda total, h: total + Counter(h.streak_histogram()), habits, Counter()).items()))
+
+
+def get_weekday_distribution(habits: Iterable[Habit]) -> List[int]:
+    """
+    Return the number of completions on each weekday (Monday first) across all habits.
+    """
+    return reduce(lambda total, h: [a + b for a, b in zip(total, h.weekday_distribution())], habits, [0] * 7)
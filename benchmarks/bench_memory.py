@@ -0,0 +1,66 @@
+"""
+Memory benchmark: list-backed vs compact completion logs.
+
+Builds a HabitManager with N daily habits and Y years of completions in both
+modes and reports the traced memory of each.
+
+Run from the project root:
+
+    py -m benchmarks.bench_memory
+    py -m benchmarks.bench_memory --habits 1000 --years 5
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+
+from habit import Habit
+from habit_manager import HabitManager
+
+
+def build_manager(habits: int, years: int, compact: bool) -> HabitManager:
+    """
+    Create a manager with `habits` daily habits, each completed every day for `years` years.
+    """
+    manager = HabitManager(compact=compact)
+    end = datetime(2025, 7, 1, 8, 0)
+    days = years * 365
+    for i in range(habits):
+        habit = Habit(f"habit {i}", "daily", compact=compact)
+        habit.completion_log = [end - timedelta(days=d) for d in range(days)]
+        manager.add_habit(habit)
+    return manager
+
+
+def measure(habits: int, years: int, compact: bool) -> int:
+    """
+    Return the bytes still allocated after building the manager.
+    """
+    gc.collect()
+    tracemalloc.start()
+    manager = build_manager(habits, years, compact)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del manager
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.habits} daily habits x {args.years} years "
+          f"({args.habits * args.years * 365:,} completions)")
+    results = {}
+    for compact in (False, True):
+        label = "compact" if compact else "list"
+        results[label] = measure(args.habits, args.years, compact)
+        print(f"{label:>8}: {results[label] / 1024 / 1024:8.1f} MiB")
+    print(f"   ratio: {results['list'] / results['compact']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Scaling benchmark: parallel streak summary over 1, 2, 4, ... worker processes.
+
+Builds N raw habits.json records (no stored metrics, so every log has to be
+parsed) with D days of history and times parallel_streak_summary() with an
+increasing number of workers, up to the CPU count.
+
+Run from the project root:
+
+    py -m benchmarks.bench_parallel_analytics
+    py -m benchmarks.bench_parallel_analytics --habits 200000 --days 90
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from parallel_analytics import parallel_streak_summary
+
+
+def build_records(habits: int, days: int):
+    """
+    Create `habits` records alternating daily/weekly, completed on every other day for `days` days.
+    """
+    end = datetime(2025, 7, 1, 8, 0)
+    log = [(end - timedelta(days=d)).isoformat() for d in range(0, days, 2)]
+    return [{"name": f"habit {i}", "periodicity": "daily" if i % 2 else "weekly",
+             "created_at": end.isoformat(), "completion_log": log} for i in range(habits)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    records = build_records(args.habits, args.days)
+    print(f"{args.habits:,} records x {args.days} days "
+          f"({sum(len(r['completion_log']) for r in records):,} completions), "
+          f"{os.cpu_count()} CPUs")
+
+    workers, baseline = 1, None
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        parallel_streak_summary(records, max_workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:3d} workers: {elapsed:7.2f} s  {args.habits / elapsed:12,.0f} habits/s  "
+              f"speedup {baseline / elapsed:5.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Snapshot benchmark: habits.json vs the binary snapshot format.
+
+Builds a HabitManager with N daily habits and Y years of completions and
+reports the file size, save time, load time and the time to decode every log
+for both formats, plus the time to save again after loading (the CLI's
+load, change, save cycle, which copies unparsed logs).
+
+Run from the project root:
+
+    py -m benchmarks.bench_snapshot
+    py -m benchmarks.bench_snapshot --habits 1000 --years 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.bench_memory import build_manager
+from habit_manager import HabitManager
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(manager: HabitManager, filename: str) -> dict:
+    results = {"save": timed(lambda: manager.save_to_file(filename, merge=False)),
+               "size": os.path.getsize(filename)}
+    loaded = HabitManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["load"] = timed(lambda: loaded.load_from_file(filename))
+    results["resave"] = timed(lambda: loaded.save_to_file(filename))
+    results["decode"] = timed(lambda: [len(h.completion_log) for h in loaded.habits])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    manager = build_manager(args.habits, args.years, compact=False)
+    print(f"{args.habits} daily habits x {args.years} years "
+          f"({args.habits * args.years * 365:,} completions)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {label: measure(manager, os.path.join(tmp_dir, "habits" + suffix))
+                   for label, suffix in (("json", ".json"), ("binary", ".bin"))}
+
+    print(f"{'':>8} {'size (MB)':>10} {'save (s)':>9} {'load (s)':>9} {'resave (s)':>11} {'decode (s)':>11}")
+    for label, r in results.items():
+        print(f"{label:>8} {r['size'] / 1e6:10.2f} {r['save']:9.3f} {r['load']:9.3f} "
+              f"{r['resave']:11.3f} {r['decode']:11.3f}")
+    json_r, bin_r = results["json"], results["binary"]
+    print(f"{'ratio':>8} {json_r['size'] / bin_r['size']:10.1f}x {json_r['save'] / bin_r['save']:8.1f}x "
+          f"{json_r['load'] / bin_r['load']:8.1f}x {json_r['resave'] / bin_r['resave']:10.1f}x "
+          f"{json_r['decode'] / bin_r['decode']:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
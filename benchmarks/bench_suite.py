@@ -0,0 +1,305 @@
+"""
+Benchmark suite: time and memory of the hot paths, compared against a baseline.
+
+Generates a synthetic dataset like load_or_create_sample_data(), scaled to
+N habits x Y years (alternating daily habits and weekly habits done on
+Sundays, with about one period in ten skipped), then times check-offs,
+streaks, analytics, saving and loading (JSON and binary) and the menu table
+(drawn from scratch and redrawn after a change), and the startup time of
+`import main` in a fresh interpreter.
+Every benchmark reports its best and median time over several runs and the
+peak memory of one extra, traced run.
+
+Results are written as JSON. Given a baseline (an earlier results file), any
+benchmark that got slower or used more memory than the threshold allows is
+reported and the script exits with status 1, so it can gate CI.
+
+Run from the project root:
+
+    py -m benchmarks.bench_suite --output bench_results.json
+    py -m benchmarks.bench_suite --save-baseline benchmarks/baseline.json
+    py -m benchmarks.bench_suite --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from analytics import get_streak_summary, metrics_cache
+from habit import Habit
+from habit_manager import HabitManager
+from main import render_habit_table
+from table_view import HabitTable
+
+END = datetime(2025, 7, 1, 8, 0)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Differences below these are noise, whatever the threshold
+MIN_SECONDS = 0.001
+MIN_BYTES = 64 * 1024
+
+# A benchmark returns (setup, run): setup() prepares untimed state, run() is timed
+Benchmark = Callable[[HabitManager, str], Tuple[Callable[[], object], Callable[[object], object]]]
+
+
+def generate_habits(habits: int, years: int, compact: bool = False, seed: int = 0,
+                    end: datetime = END) -> List[Habit]:
+    """
+    Create `habits` habits with `years` years of history ending at `end`.
+
+    Even-numbered habits are daily (done at the same time of day), odd ones
+    weekly (done on Sundays at 09:00), like the sample data. About one period
+    in ten is skipped, so streaks vary. The output only depends on the arguments.
+    """
+    rng = random.Random(seed)
+    result = []
+    for i in range(habits):
+        if i % 2 == 0:
+            habit = Habit(f"daily habit {i}", "daily", compact=compact)
+            dates = [end - timedelta(days=d) for d in range(years * 365)]
+        else:
+            habit = Habit(f"weekly habit {i}", "weekly", compact=compact)
+            sunday = (end - timedelta(days=(end.weekday() + 1) % 7)).replace(hour=9)
+            dates = [sunday - timedelta(weeks=w) for w in range(years * 52)]
+        habit.created_at = end - timedelta(days=years * 365)
+        habit.completion_log = [d for d in dates if rng.random() >= 0.1]
+        result.append(habit)
+    return result
+
+
+def generate_manager(habits: int, years: int, compact: bool = False, seed: int = 0) -> HabitManager:
+    """
+    Create a HabitManager holding generate_habits(habits, years, compact, seed).
+    """
+    manager = HabitManager(compact=compact)
+    manager.load_habits(generate_habits(habits, years, compact, seed))
+    return manager
+
+
+def bench_check_off(manager: HabitManager, tmp_dir: str):
+    def setup():
+        return [(h.name, h.get_last_completion()) for h in manager.habits]
+
+    def run(habits):
+        # One check-off a period after the last completion, then undo it
+        for name, last in habits:
+            date = last + timedelta(days=7)
+            manager.check_off_habit(name, date)
+            manager.uncheck_habit(name, date)
+    return setup, run
+
+
+def bench_longest_streak(manager: HabitManager, tmp_dir: str):
+    def run(_):
+        # Cold: the streak segments are rebuilt from the log first, as after a log change
+        for h in manager.habits:
+            h.rebuild_index()
+        return [h.get_longest_streak() for h in manager.habits]
+    return lambda: None, run
+
+
+def bench_streak_summary(manager: HabitManager, tmp_dir: str):
+    def run(_):
+        # Cold, like bench_longest_streak: no cached metrics and no streak segments
+        metrics_cache.clear()
+        for h in manager.habits:
+            h.rebuild_index()
+        return get_streak_summary(manager.habits)
+    return lambda: None, run
+
+
+def bench_save(suffix: str) -> Benchmark:
+    def bench(manager: HabitManager, tmp_dir: str):
+        filename = os.path.join(tmp_dir, "save" + suffix)
+        return lambda: None, lambda _: manager.save_to_file(filename, merge=False)
+    return bench
+
+
+def bench_load(suffix: str) -> Benchmark:
+    def bench(manager: HabitManager, tmp_dir: str):
+        filename = os.path.join(tmp_dir, "load" + suffix)
+        manager.save_to_file(filename, merge=False)
+
+        def run(_):
+            loaded = HabitManager()
+            loaded.load_from_file(filename)
+            return loaded
+        return lambda: None, run
+    return bench
+
+
+def bench_render_table(manager: HabitManager, tmp_dir: str):
+    return lambda: None, lambda _: render_habit_table(manager, END)
+
+
+def bench_redraw_table(manager: HabitManager, tmp_dir: str):
+    def setup():
+        table = HabitTable()
+        render_habit_table(manager, END, table)
+        return table
+
+    def run(table):
+        # The menu loop after one toggle: only that row is rebuilt
+        habit = manager.habits[0]
+        date = habit.get_last_completion() + timedelta(days=7)
+        manager.check_off_habit(habit.name, date)
+        render_habit_table(manager, END, table)
+        manager.uncheck_habit(habit.name, date)
+        return render_habit_table(manager, END, table)
+    return setup, run
+
+
+def bench_import_main(manager: HabitManager, tmp_dir: str):
+    # A fresh interpreter running `import main`, as at the start of every CLI command.
+    # tests/test_startup.py checks which modules get imported; this catches slow ones.
+    command = [sys.executable, "-c", "import main"]
+    return lambda: None, lambda _: subprocess.run(command, cwd=ROOT, check=True)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "habit.check_off": bench_check_off,
+    "habit.get_longest_streak": bench_longest_streak,
+    "analytics.get_streak_summary": bench_streak_summary,
+    "manager.save_to_file.json": bench_save(".json"),
+    "manager.save_to_file.bin": bench_save(".bin"),
+    "manager.load_from_file.json": bench_load(".json"),
+    "manager.load_from_file.bin": bench_load(".bin"),
+    "main.render_habit_table": bench_render_table,
+    "main.render_habit_table.redraw": bench_redraw_table,
+    "main.import": bench_import_main,
+}
+
+
+def measure(benchmark: Benchmark, manager: HabitManager, tmp_dir: str, repeat: int) -> Dict:
+    """
+    Time `repeat` runs of a benchmark and trace the memory of one more.
+    """
+    setup, run = benchmark(manager, tmp_dir)
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        gc.disable()  # Like timeit: collections triggered by earlier garbage add noise
+        try:
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    result = run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": min(times), "median_seconds": statistics.median(times), "peak_bytes": peak}
+
+
+def run_suite(habits: int, years: int, repeat: int = 5, only: List[str] = ()) -> Dict:
+    """
+    Run the benchmarks (all, or those named in `only`) and return the results document.
+    """
+    manager = generate_manager(habits, years)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+        for name, benchmark in BENCHMARKS.items():
+            if not only or name in only:
+                results[name] = measure(benchmark, manager, tmp_dir, repeat)
+    return {
+        "meta": {"habits": habits, "years": years, "repeat": repeat,
+                 "completions": sum(h.get_completion_count() for h in manager.habits),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "date": datetime.now().isoformat(timespec="seconds")},
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Return a message for every benchmark slower or bigger than the baseline allows,
+    and for every benchmark the baseline has no entry for (it cannot be gated).
+
+    A benchmark regresses when it exceeds the baseline by more than
+    `threshold` (relative) and by more than MIN_SECONDS or MIN_BYTES.
+
+    Raises:
+        ValueError: If the two runs used different dataset sizes.
+    """
+    for key in ("habits", "years"):
+        if current["meta"][key] != baseline["meta"][key]:
+            raise ValueError(f"Baseline was measured with {key}={baseline['meta'][key]}, "
+                             f"not {current['meta'][key]}.")
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            regressions.append(f"{name}: no baseline entry, record one with --save-baseline")
+            continue
+        for key, unit, noise in (("seconds", "s", MIN_SECONDS), ("peak_bytes", "B", MIN_BYTES)):
+            if base[key] and result[key] > base[key] * (1 + threshold) and result[key] - base[key] > noise:
+                regressions.append(f"{name}: {key} {result[key]:.4g}{unit} vs baseline "
+                                   f"{base[key]:.4g}{unit} (+{result[key] / base[key] - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=200)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--only", nargs="*", default=[], choices=list(BENCHMARKS), metavar="NAME",
+                        help="Run only these benchmarks")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline to this file")
+    parser.add_argument("--baseline", help="Compare against this baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Allowed slowdown or memory growth over the baseline (default: 0.5 = 50%%)")
+    args = parser.parse_args()
+
+    report = run_suite(args.habits, args.years, args.repeat, args.only)
+    meta = report["meta"]
+    print(f"{meta['habits']} habits x {meta['years']} years ({meta['completions']:,} completions), "
+          f"best of {meta['repeat']}")
+    for name, r in report["results"].items():
+        print(f"{name:32} {r['seconds'] * 1000:10.2f} ms  (median {r['median_seconds'] * 1000:9.2f} ms)  "
+              f"peak {r['peak_bytes'] / 1e6:8.2f} MB")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(report, baseline, args.threshold)
+        except ValueError as e:
+            print(f"error: {e} Rerun with the baseline's --habits and --years.", file=sys.stderr)
+            sys.exit(2)
+        if regressions:
+            print(f"\nREGRESSIONS (threshold {args.threshold:.0%}):")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
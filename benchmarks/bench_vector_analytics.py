@@ -0,0 +1,64 @@
+"""
+Speed benchmark: per-habit analytics vs the batched NumPy engine.
+
+Builds N habits with D days of history (every other day completed) and times
+the metrics of all habits with the pure-Python fallback and with NumPy.
+
+Run from the project root:
+
+    py -m benchmarks.bench_vector_analytics
+    py -m benchmarks.bench_vector_analytics --habits 100000 --days 60 --compact
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from habit import Habit
+from vector_analytics import HAS_NUMPY, compute_metrics
+
+
+def build_habits(habits: int, days: int, compact: bool = False):
+    """
+    Create `habits` habits alternating daily/weekly, completed on every other day for `days` days.
+    """
+    end = datetime(2025, 7, 1, 8, 0)
+    log = [end - timedelta(days=d) for d in range(0, days, 2)]
+    result = []
+    for i in range(habits):
+        habit = Habit(f"habit {i}", "daily" if i % 2 else "weekly", compact=compact)
+        habit.completion_log = list(log)
+        result.append(habit)
+    return result
+
+
+def timed(habits, session_date, use_numpy: bool) -> float:
+    start = time.perf_counter()
+    compute_metrics(habits, session_date, use_numpy=use_numpy)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--habits", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--compact", action="store_true", help="Use compact completion logs")
+    args = parser.parse_args()
+
+    habits = build_habits(args.habits, args.days, args.compact)
+    session_date = datetime(2025, 7, 1, 12, 0)
+    print(f"{args.habits:,} habits x {args.days} days "
+          f"({sum(len(h.completion_log) for h in habits):,} completions)")
+
+    python_time = timed(habits, session_date, use_numpy=False)
+    print(f"  python: {python_time:8.2f} s")
+    if not HAS_NUMPY:
+        print("   numpy: not installed")
+        return
+    numpy_time = timed(habits, session_date, use_numpy=True)
+    print(f"   numpy: {numpy_time:8.2f} s")
+    print(f" speedup: {python_time / numpy_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
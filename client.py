@@ -0,0 +1,31 @@
+import json
+import socket
+from typing import Dict
+
+# Kept free of the habit modules so client commands start in milliseconds
+
+
+def send_request(socket_path: str, request: Dict, timeout: float = 10.0) -> Dict:
+    """
+    Send one request to a running server (see server.py) and return its response.
+
+    Args:
+        socket_path (str): The server's Unix socket.
+        request (Dict): The request, e.g. {"command": "check", "name": "walk", "date": None}.
+        timeout (float): Seconds to wait for the connection and the response.
+
+    Returns:
+        Dict: {"ok": True, "columns": [...], "rows": [...]} or {"ok": False, "error": "..."}.
+
+    Raises:
+        OSError: If the server cannot be reached or closes the connection.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode())
+        with sock.makefile("r") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The server closed the connection.")
+    return json.loads(line)
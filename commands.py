@@ -0,0 +1,137 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from analytics import get_habit_metrics
+from habit import Habit
+from period import PERIODICITIES
+from summary import STATUS_COLUMNS
+
+# Output columns of every scriptable command
+COLUMNS = {
+    "add": ["name", "command", "changed"],
+    "check": ["name", "command", "changed"],
+    "uncheck": ["name", "command", "changed"],
+    "status": STATUS_COLUMNS,
+    "streaks": ["name", "periodicity", "current_streak", "longest_streak"],
+    "missed": ["name", "periodicity"],
+    "summary": ["total_habits", "total_completions", "longest_streak", "average_streak"],
+}
+
+WRITE_COMMANDS = {"add", "check", "uncheck"}
+
+# Commands answered by queries on a SQLite database, without loading the habits (see execute_sql())
+SQL_COMMANDS = {"check", "uncheck", "streaks", "missed"}
+
+
+def get_streak_summary(habits: List[Habit]) -> Dict:
+    """
+    Return total habits, total completions, the longest streak and the average longest streak.
+    """
+    metrics = [get_habit_metrics(h) for h in habits]
+    return {
+        "total_habits": len(habits),
+        "total_completions": sum(m["completions"] for m in metrics),
+        "longest_streak": max((m["longest_streak"] for m in metrics), default=0),
+        "average_streak": round(sum(m["longest_streak"] for m in metrics) / len(habits), 2) if habits else 0
+    }
+
+
+def execute(manager, request: Dict) -> Tuple[List[str], List[Dict]]:
+    """
+    Run one scriptable command against a loaded HabitManager.
+
+    Used by the CLI for local runs and by the server for requests from clients.
+
+    Args:
+        manager (HabitManager): The manager to read or change.
+        request (Dict): 'command' plus its arguments: 'name' (add/check/uncheck),
+            'periodicity' (add) and 'date' (ISO timestamp or None for now).
+
+    Returns:
+        Tuple[List[str], List[Dict]]: The output columns and rows.
+
+    Raises:
+        ValueError: For unknown commands, habits or periodicities, and duplicate names.
+    """
+    command = request["command"]
+    if command not in COLUMNS:
+        raise ValueError(f"Unknown command {command!r}.")
+    date = datetime.fromisoformat(request["date"]) if request.get("date") else datetime.now()
+    columns = COLUMNS[command]
+
+    if command in WRITE_COMMANDS:
+        name = request["name"].strip().lower()
+        if command == "add" and request.get("periodicity") not in PERIODICITIES:
+            raise ValueError(f"Periodicity must be one of {', '.join(PERIODICITIES)}, "
+                             f"not {request.get('periodicity')!r}.")
+        try:
+            if command == "add":
+                manager.add_habit(Habit(name, request["periodicity"]))
+                changed = True
+            elif command == "check":
+                changed = manager.check_off_habit(name, date)
+            else:
+                changed = manager.uncheck_habit(name, date)
+        except KeyError:
+            raise ValueError(f"No habit named {name!r}.") from None
+        return columns, [{"name": name, "command": command, "changed": changed}]
+
+    if command == "status":
+        rows = []
+        for habit, checked in manager.period_status(date):
+            metrics = get_habit_metrics(habit)
+            rows.append({"name": habit.name, "periodicity": habit.periodicity, "checked": checked,
+                         "completions": metrics["completions"],
+                         "longest_streak": metrics["longest_streak"], "last_done": metrics["last_done"]})
+    elif command == "streaks":
+        rows = [{"name": h.name, "periodicity": h.periodicity,
+                 "current_streak": h.get_current_streak(date),
+                 "longest_streak": get_habit_metrics(h)["longest_streak"]} for h in manager.habits]
+    elif command == "missed":
+        rows = [{"name": h.name, "periodicity": h.periodicity} for h in manager.get_missed_habits(date)]
+    else:
+        rows = [get_streak_summary(manager.habits)]
+    return columns, rows
+
+
+def execute_sql(storage, request: Dict) -> Tuple[List[str], List[Dict]]:
+    """
+    Run one of SQL_COMMANDS against a SQLite database without loading any completion history.
+
+    Check and uncheck look up the period of the habit with one indexed query
+    and write the change through storage.record(); streaks and missed are
+    computed in SQL.
+
+    Args:
+        storage (SqliteStorage): The open database.
+        request (Dict): As for execute().
+
+    Returns:
+        Tuple[List[str], List[Dict]]: The output columns and rows, as execute() returns them.
+
+    Raises:
+        ValueError: For commands not in SQL_COMMANDS and unknown habits.
+    """
+    command = request["command"]
+    if command not in SQL_COMMANDS:
+        raise ValueError(f"Command {command!r} needs the habits loaded.")
+    date = datetime.fromisoformat(request["date"]) if request.get("date") else datetime.now()
+    columns = COLUMNS[command]
+
+    if command in WRITE_COMMANDS:
+        name = request["name"].strip().lower()
+        checked = storage.is_checked(name, date)
+        if checked is None:
+            raise ValueError(f"No habit named {name!r}.")
+        changed = checked != (command == "check")
+        if changed:
+            storage.record(command, name=name, date=date.isoformat())
+        return columns, [{"name": name, "command": command, "changed": changed}]
+
+    if command == "streaks":
+        current, longest = storage.current_streaks(date), storage.longest_streaks()
+        rows = [{"name": name, "periodicity": periodicity, "current_streak": current[name],
+                 "longest_streak": longest[name]} for name, periodicity in storage.list_habits()]
+    else:
+        rows = [{"name": name, "periodicity": periodicity} for name, periodicity in storage.missed_habits(date)]
+    return columns, rows
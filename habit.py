@@ -1,120 +1,615 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from period import DAILY, MONTHLY, WEEKLY, day_mapper, period_days, period_number, period_start
+from streaks import StreakEngine
+
+if TYPE_CHECKING:
+    from snapshot import EncodedLog
+
+# Compact logs store naive datetimes as whole seconds since this epoch
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+SECONDS_PER_DAY = 86400
+
+_THIS_PERIOD = {DAILY: "today", WEEKLY: "this week", MONTHLY: "this month"}
+
+
+def to_epoch_seconds(date: datetime) -> int:
+    """
+    Convert a naive datetime to whole seconds since EPOCH (sub-second precision is dropped).
+    """
+    return (date - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch_seconds(seconds: int) -> datetime:
+    """
+    Convert seconds since EPOCH back to a naive datetime.
+    """
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class CompactLogView(Sequence):
+    """
+    Read-only datetime view over a compact completion log.
+
+    Datetime objects are only created for the entries that are accessed.
+    """
+
+    __slots__ = ("_seconds",)
+
+    def __init__(self, seconds: array):
+        self._seconds = seconds
+
+    @property
+    def seconds(self) -> array:
+        """
+        The underlying array of epoch seconds, e.g. for zero-copy use with NumPy. Do not modify it.
+        """
+        return self._seconds
+
+    def __len__(self) -> int:
+        return len(self._seconds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [from_epoch_seconds(s) for s in self._seconds[index]]
+        return from_epoch_seconds(self._seconds[index])
+
+    def __iter__(self) -> Iterator[datetime]:
+        return map(from_epoch_seconds, self._seconds)
+
 
 class Habit:
     """
     Represents a single habit the user wants to track.
+
+    In compact mode the completion log is kept as a sorted array of epoch
+    seconds instead of a list of datetime objects, which uses a fraction of
+    the memory for long histories.
+
+    Habits loaded from disk keep their serialized log until it is first needed
+    (see set_raw_log()); counts, last completion and longest streak are served
+    from the metadata stored alongside it until then.
     """
 
-    def __init__(self, name: str, periodicity: str):
+    __slots__ = ("name", "periodicity", "created_at", "compact",
+                 "_completion_log", "_indexed_len", "_streaks",
+                 "_weekdays", "_version", "_raw_log", "_meta", "__weakref__")
+
+    def __init__(self, name: str, periodicity: str, compact: bool = False):
         """
         Initialize a new habit with name and periodicity.
 
         Args:
             name (str): Name of the habit.
-            periodicity (str): 'daily' or 'weekly'.
+            periodicity (str): 'daily', 'weekly' or 'monthly'.
+            compact (bool): Store the completion log as a sorted array of epoch seconds.
         """
         self.name = name
-        self.periodicity = periodicity  # Should be 'daily' or 'weekly'
+        self.periodicity = periodicity  # 'daily', 'weekly' or 'monthly' (see period.py)
         self.created_at = datetime.now()  # Timestamp when the habit was created
-        self.completion_log: List[datetime] = []  # Log of datetime entries for each completed check-off
+        self.compact = compact
+        # Sorted log of datetime entries (or epoch seconds in compact mode) for each completed check-off
+        self._completion_log: Union[List[datetime], array] = array("q") if compact else []
+        self._indexed_len = 0  # Log length the index was built for
+        self._streaks = StreakEngine()  # Run-length segments of completed periods
+        self._weekdays = [0] * 7  # Number of log entries per weekday (Monday first)
+        self._version = 0  # Bumped on every change to the completion log
+        self._raw_log: Optional[List[str]] = None  # ISO timestamps not parsed yet
+        self._meta: Optional[Dict] = None  # Precomputed metadata for the raw log
+
+    @property
+    def completion_log(self) -> Sequence[datetime]:
+        """
+        The log of datetime entries for each completed check-off, sorted by time.
+
+        Assigning a new list sorts it in place and rebuilds the streak index.
+        Entries appended to the list directly are picked up (and sorted into
+        place) on the next lookup. In compact mode this is
+        a read-only view; use check_off() and uncheck() to change it.
+        """
+        self._ensure_index()
+        if self.compact:
+            return CompactLogView(self._completion_log)
+        return self._completion_log
+
+    @completion_log.setter
+    def completion_log(self, log: Iterable[datetime]):
+        self._raw_log = self._meta = None
+        if self.compact:
+            self._completion_log = array("q", sorted(to_epoch_seconds(d) for d in log))
+        else:
+            self._completion_log = log if isinstance(log, list) else list(log)
+        self.rebuild_index()
+
+    @property
+    def version(self) -> int:
+        """
+        Mutation counter of the completion log, used to invalidate cached metrics.
+        """
+        if self._raw_log is None:  # A raw log cannot have been changed behind our back
+            self._ensure_index()
+        return self._version
+
+    @property
+    def hydrated(self) -> bool:
+        """
+        False while the log loaded from disk has not been parsed yet.
+        """
+        return self._raw_log is None
+
+    def set_raw_log(self, raw_log: Union[List[str], "EncodedLog"], completion_count: Optional[int] = None,
+                    last_done: Optional[str] = None, longest_streak: Optional[int] = None,
+                    last_streak: Optional[int] = None):
+        """
+        Store a serialized log to be parsed on first access.
+
+        The optional metadata lets get_completion_count(), get_last_completion(),
+        get_longest_streak(), is_checked() and get_current_streak() (for dates
+        from the last completion on) answer without parsing the log.
+        Metadata that is missing is computed by parsing the log when asked for.
+
+        Args:
+            raw_log (Union[List[str], EncodedLog]): ISO timestamps as stored in
+                habits.json, or a log in a binary snapshot (see snapshot.py).
+            completion_count (Optional[int]): Number of entries in the log.
+            last_done (Optional[str]): ISO timestamp of the latest entry (only used with completion_count).
+            longest_streak (Optional[int]): Longest streak of the log.
+            last_streak (Optional[int]): Length of the streak ending at the latest entry.
+        """
+        self._completion_log = array("q") if self.compact else []
+        self._indexed_len = 0
+        self._streaks = StreakEngine()
+        self._weekdays = [0] * 7
+        self._raw_log = raw_log
+        self._meta = {"completion_count": completion_count, "last_done": last_done,
+                      "longest_streak": longest_streak, "last_streak": last_streak}
+        self._version += 1
+
+    @property
+    def raw_log(self) -> Optional[Union[List[str], "EncodedLog"]]:
+        """
+        The log as loaded from disk while it has not been parsed yet, else None.
+        """
+        return self._raw_log
+
+    def serialized_log(self) -> List[str]:
+        """
+        Return the log as ISO timestamps, reusing the raw log if it was never parsed.
+        """
+        if isinstance(self._raw_log, list):
+            return self._raw_log
+        if self._raw_log is not None:
+            return [dt.isoformat() for dt in self._raw_log.datetimes()]
+        return [dt.isoformat() for dt in self.completion_log]
+
+    def _hydrate(self):
+        """
+        Parse the raw log loaded from disk.
+        """
+        raw_log, version = self._raw_log, self._version
+        if isinstance(raw_log, list):
+            self.completion_log = (datetime.fromisoformat(dt) for dt in raw_log)
+        else:
+            self.completion_log = raw_log.datetimes()
+        self._version = version  # Same content, cached metrics stay valid
+
+    def _meta_value(self, key: str):
+        """
+        Return a precomputed metadata value, or None if the log is parsed or the value is missing.
+        """
+        if self._raw_log is None:
+            return None
+        return self._meta.get(key)
+
+    def stored_metrics(self) -> Optional[Tuple[int, int]]:
+        """
+        Return (completion count, longest streak) from the metadata of an unparsed log.
+
+        Returns None if the log is parsed or was loaded without that metadata.
+        """
+        count, longest = self._meta_value("completion_count"), self._meta_value("longest_streak")
+        if count is None or longest is None:
+            return None
+        return count, longest
+
+    def get_completion_count(self) -> int:
+        """
+        Return the number of logged completions.
+        """
+        count = self._meta_value("completion_count")
+        if count is not None:
+            return count
+        self._ensure_index()
+        return len(self._completion_log)
+
+    def _period_bounds(self, date: datetime) -> Tuple[int, int]:
+        """
+        Return the [start, end) epoch seconds of the period containing a date.
+        """
+        first, end = period_days(self.periodicity, date)
+        return (first - EPOCH_ORDINAL) * SECONDS_PER_DAY, (end - EPOCH_ORDINAL) * SECONDS_PER_DAY
+
+    def period_start(self, period: int) -> datetime:
+        """
+        Return midnight at the start of a period number (see period_number()).
+        """
+        return period_start(self.periodicity, period)
+
+    def period_number(self, date: datetime) -> int:
+        """
+        Return the period a date falls into as an integer where adjacent periods differ by one.
+
+        Args:
+            date (datetime): The date to map.
+
+        Returns:
+            int: The period number for this habit's periodicity (see period_number()).
+        """
+        return period_number(self.periodicity, date)
+
+    def period_numbers(self) -> Iterator[int]:
+        """
+        Yield the period number of every log entry (in log order, duplicates included).
+        """
+        self._ensure_index()
+        return self._period_numbers()
+
+    def _period_numbers(self) -> Iterator[int]:
+        return map(day_mapper(self.periodicity), self._days())
+
+    def _days(self) -> Iterator[int]:
+        """
+        Yield the day ordinal of every log entry.
+        """
+        if self.compact:
+            return (seconds // SECONDS_PER_DAY + EPOCH_ORDINAL for seconds in self._completion_log)
+        return map(datetime.toordinal, self._completion_log)
+
+    def rebuild_index(self):
+        """
+        Rebuild the streak segments and weekday counts from the completion log.
+
+        List logs are sorted in place first (cheap when they already are), so
+        both modes can be searched with bisect. The streak segments double as
+        the period index: a period is checked if it lies in a segment.
+        """
+        if not self.compact:
+            self._completion_log.sort()
+        self._streaks = StreakEngine(self._period_numbers())
+        weekdays = [0] * 7
+        for day in self._days():
+            weekdays[(day - 1) % 7] += 1  # Ordinal 1 is a Monday
+        self._weekdays = weekdays
+        self._indexed_len = len(self._completion_log)
+        self._version += 1
+
+    def _ensure_index(self):
+        """
+        Parse a pending raw log and rebuild the index if the log was changed
+        without going through this class.
+        """
+        if self._raw_log is not None:
+            self._hydrate()
+        elif self._indexed_len != len(self._completion_log):
+            self.rebuild_index()
 
-    def check_off(self, date: Optional[datetime] = None):
+    def is_checked(self, date: Optional[datetime] = None) -> bool:
+        """
+        Check whether the habit is completed for the period containing the given date.
+
+        Args:
+            date (Optional[datetime]): The date to look up. Defaults to now.
+
+        Returns:
+            bool: True if there is a completion in that day (daily) or week (weekly).
+        """
+        date = date or datetime.now()
+        if self._meta_value("completion_count") is not None:
+            # Nothing was logged after the last completion, so only its period
+            # can be checked among the current and later periods
+            last_done = self.get_last_completion()
+            if last_done is None:
+                return False
+            period, last_period = self.period_number(date), self.period_number(last_done)
+            if period >= last_period:
+                return period == last_period
+
+        self._ensure_index()
+        return self.period_number(date) in self._streaks
+
+    def add_completion(self, date: datetime) -> bool:
+        """
+        Log a completion for the given date without printing anything.
+
+        Args:
+            date (datetime): The completion timestamp.
+
+        Returns:
+            bool: False if the period of that date was already checked off, else True.
+        """
+        self._ensure_index()
+        if self.is_checked(date):
+            return False
+
+        if self.compact:
+            insort(self._completion_log, to_epoch_seconds(date))
+        else:
+            insort(self._completion_log, date)
+        self._indexed_len += 1
+        self._streaks.add(self.period_number(date))
+        self._weekdays[date.weekday()] += 1
+        self._version += 1
+        return True
+
+    def add_completions(self, dates: Iterable[datetime]) -> int:
+        """
+        Log many completions at once, e.g. when importing history.
+
+        The batch is sorted, deduplicated by period (against itself and the
+        existing log) in one pass and merged into the sorted log, and the index
+        is rebuilt once, instead of one add_completion() call per date.
+
+        Args:
+            dates (Iterable[datetime]): Completion timestamps in any order.
+
+        Returns:
+            int: The number of completions logged; dates in already checked periods are skipped.
+        """
+        self._ensure_index()
+        new_dates = []
+        last_period = None
+        for date in sorted(dates):
+            period = self.period_number(date)
+            if period != last_period and period not in self._streaks:
+                new_dates.append(date)
+            last_period = period
+        if not new_dates:
+            return 0
+
+        if self.compact:
+            self._completion_log.extend(map(to_epoch_seconds, new_dates))
+            self._completion_log = array("q", sorted(self._completion_log))
+        else:
+            self._completion_log.extend(new_dates)  # sort() in rebuild_index merges both sorted runs
+        self.rebuild_index()
+        return len(new_dates)
+
+    def remove_completion(self, date: datetime) -> bool:
+        """
+        Remove every completion in the period of the given date without printing anything.
+
+        Args:
+            date (datetime): A date in the period to clear.
+
+        Returns:
+            bool: True if a completion was removed.
+        """
+        self._ensure_index()
+        start, end = self._period_bounds(date)
+        if not self.compact:
+            start, end = from_epoch_seconds(start), from_epoch_seconds(end)
+        lo = bisect_left(self._completion_log, start)
+        hi = bisect_left(self._completion_log, end)
+        removed = hi > lo
+        for entry in self._completion_log[lo:hi]:
+            day = entry.toordinal() if not self.compact else entry // SECONDS_PER_DAY + EPOCH_ORDINAL
+            self._weekdays[(day - 1) % 7] -= 1
+        del self._completion_log[lo:hi]
+
+        self._indexed_len = len(self._completion_log)
+        if removed:
+            self._streaks.remove(self.period_number(date))
+            self._version += 1
+        return removed
+
+    def check_off(self, date: Optional[datetime] = None) -> bool:
         """
         Mark the habit as completed for the given date or today.
 
-        Prevents duplicate check-ins for the same day (daily) or week (weekly).
+        Prevents duplicate check-ins for the same day (daily), week (weekly) or month (monthly).
 
         Args:
             date (Optional[datetime]): The date to check off. Defaults to now.
+
+        Returns:
+            bool: True if the completion was logged, False if it was a duplicate.
         """
         check_date = date or datetime.now()
 
         # Check if this habit has already been checked off for this period
-        for log_date in self.completion_log:
-            if self.periodicity == 'daily' and log_date.date() == check_date.date():
-                print("Habit already checked off today.")
-                return
-            elif self.periodicity == 'weekly':
-                # Compare ISO week number and year
-                if (log_date.isocalendar()[1] == check_date.isocalendar()[1] and
-                    log_date.year == check_date.year):
-                    print("Habit already checked off this week.")
-                    return
-                
-                
-        # No duplicate found; add the completion timestamp
-        self.completion_log.append(check_date)
+        if not self.add_completion(check_date):
+            print(f"Habit already checked off {_THIS_PERIOD.get(self.periodicity, 'today')}.")
+            return False
+
         print("Habit checked off successfully.")
+        return True
 
-    def uncheck(self):
-        """
-        Remove today's (for daily) or this week's (for weekly) check-off from the log.
+    def uncheck(self, date: Optional[datetime] = None) -> bool:
         """
-        now = datetime.now()
-        new_log = []
+        Remove the check-off for the day, week or month (by periodicity) of the given date.
 
-        for log in self.completion_log:
-            if self.periodicity == "daily" and log.date() == now.date():
-                continue  # skip today's log
-            elif self.periodicity == "weekly":
-                same_week = log.isocalendar()[1] == now.isocalendar()[1]
-                same_year = log.year == now.year
-                if same_week and same_year:
-                    continue  # skip this week's log
-            new_log.append(log)
+        Args:
+            date (Optional[datetime]): A date in the period to uncheck. Defaults to now.
 
-        self.completion_log = new_log
+        Returns:
+            bool: True if a check-off was removed.
+        """
+        removed = self.remove_completion(date or datetime.now())
         print("Habit unchecked for current period.")
+        return removed
 
 
-    def get_current_streak(self) -> int:
+    def get_current_streak(self, date: Optional[datetime] = None) -> int:
         """
         Calculate the current streak based on periodicity.
 
-        NOTE: This is a placeholder and will be implemented in detail later.
+        The streak counts as current if it includes the period of the given date,
+        or ends in the period right before it (today/this week can still be checked off).
+
+        Args:
+            date (Optional[datetime]): The reference date. Defaults to now.
 
         Returns:
-            int: Current streak length (currently just the count of completions).
+            int: Current streak length, or 0 if the streak is broken.
+        """
+        period = self.period_number(date or datetime.now())
+        last_streak = self._meta_value("last_streak")
+        if last_streak is not None and self._meta_value("completion_count") is not None:
+            # From the period of the last completion on, the current streak is
+            # the streak ending there, or nothing once a period was skipped
+            last_done = self.get_last_completion()
+            if last_done is None:
+                return 0
+            last_period = self.period_number(last_done)
+            if period >= last_period:
+                return last_streak if period - last_period <= 1 else 0
+
+        self._ensure_index()
+        return self._streaks.current(period)
+
+    def get_last_streak(self) -> Optional[int]:
         """
-        return len(self.completion_log)
+        Return the length of the streak ending at the latest completion (0 without completions).
+
+        Returns None for an unparsed log loaded without this metadata, rather
+        than parsing it, so saving lazily loaded habits stays cheap.
+        """
+        if self._raw_log is not None:
+            return self._meta.get("last_streak")
+        last_done = self.get_last_completion()
+        return self._streaks.current(self.period_number(last_done)) if last_done else 0
     
     def get_longest_streak(self) -> int:
         """
         Calculate the longest uninterrupted streak of completions.
 
-        Works for both 'daily' and 'weekly' habits.
+        Works for both 'daily' and 'weekly' habits. The streak segments are kept
+        up to date by check_off() and uncheck(), so this is a constant-time read.
         """
-        if not self.completion_log:
-            return 0
+        longest = self._meta_value("longest_streak")
+        if longest is not None:
+            return longest
+        self._ensure_index()
+        return self._streaks.longest
+
+    def completion_rate(self, period_start: datetime, period_end: datetime) -> float:
+        """
+        Return the share of periods from the one containing period_start to the
+        one containing period_end (inclusive) that were completed.
+
+        Counted from the streak segments, so the cost grows with the window,
+        not with the length of the history.
+        """
+        first, last = self.period_number(period_start), self.period_number(period_end)
+        if last < first:
+            return 0.0
+        self._ensure_index()
+        return self._streaks.count_between(first, last) / (last - first + 1)
+
+    def rolling_adherence(self, date: Optional[datetime] = None,
+                          windows: Iterable[int] = (7, 30, 90)) -> Dict[int, float]:
+        """
+        Return the share of completed periods in the last N periods up to the
+        period of the given date (included), for every window length N.
+
+        Args:
+            date (Optional[datetime]): The reference date. Defaults to now.
+            windows (Iterable[int]): Window lengths in periods (days or weeks).
+
+        Returns:
+            Dict[int, float]: Window length -> adherence between 0 and 1.
+        """
+        self._ensure_index()
+        period = self.period_number(date or datetime.now())
+        return {n: self._streaks.count_between(period - n + 1, period) / n for n in windows}
+
+    def streak_histogram(self) -> Dict[int, int]:
+        """
+        Return a mapping of streak length to the number of streaks with that length.
+        """
+        self._ensure_index()
+        return self._streaks.length_histogram()
+
+    def weekday_distribution(self) -> List[int]:
+        """
+        Return the number of completions on each weekday, Monday first.
+        """
+        self._ensure_index()
+        return list(self._weekdays)
+
+    def get_last_completion(self) -> Optional[datetime]:
+        """
+        Return the latest completion timestamp, or None if the habit was never completed.
+        """
+        if self._meta_value("completion_count") is not None:
+            last_done = self._meta_value("last_done")
+            return datetime.fromisoformat(last_done) if last_done else None
+        self._ensure_index()
+        if not self._completion_log:
+            return None
+        if self.compact:
+            return from_epoch_seconds(self._completion_log[-1])
+        return self._completion_log[-1]
 
-        # Sort log in ascending order
-        sorted_log = sorted(self.completion_log)
-        longest = 1
-        current = 1
-
-        for i in range(1, len(sorted_log)):
-            prev = sorted_log[i - 1]
-            curr = sorted_log[i]
-
-            if self.periodicity == "daily":
-                expected = prev.date() + timedelta(days=1)
-                if curr.date() == expected:
-                    current += 1
-                    longest = max(longest, current)
-                elif curr.date() > expected:
-                    current = 1  # Streak broken
-            elif self.periodicity == "weekly":
-                prev_year, prev_week, _ = prev.isocalendar()
-                curr_year, curr_week, _ = curr.isocalendar()
-                if (curr_year == prev_year and curr_week == prev_week + 1) or \
-                    (curr_year == prev_year + 1 and prev_week == 52 and curr_week == 1):
-                    current += 1
-                    longest = max(longest, current)
-                elif (curr_year > prev_year) or (curr_week > prev_week + 1):
-                    current = 1
-
-        return longest
+    def _window(self, period_start: datetime, period_end: datetime) -> Tuple[int, int]:
+        """
+        Return the [lo, hi) slice of the log with entries between both dates (inclusive).
+        """
+        self._ensure_index()
+        if self.compact:
+            period_start, period_end = to_epoch_seconds(period_start), to_epoch_seconds(period_end)
+        return (bisect_left(self._completion_log, period_start),
+                bisect_right(self._completion_log, period_end))
+
+    def completions_between(self, period_start: datetime, period_end: datetime) -> List[datetime]:
+        """
+        Return the completions between two dates (inclusive), oldest first.
+
+        Runs in O(log n + k) for k returned entries.
+
+        Args:
+            period_start (datetime): Start of the time window.
+            period_end (datetime): End of the time window.
+
+        Returns:
+            List[datetime]: The completions in the window.
+        """
+        lo, hi = self._window(period_start, period_end)
+        if self.compact:
+            return [from_epoch_seconds(s) for s in self._completion_log[lo:hi]]
+        return self._completion_log[lo:hi]
+
+    def gaps_between(self, period_start: datetime, period_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Return the runs of missed periods (days or weeks) between two dates.
+
+        Every period touching the window counts as a whole. Each gap is returned as
+        (start of its first missed period, start of the period after its last one).
+        Runs in O(log n + k) for k completions in the window.
+
+        Args:
+            period_start (datetime): Start of the time window.
+            period_end (datetime): End of the time window.
+
+        Returns:
+            List[Tuple[datetime, datetime]]: The gaps, oldest first.
+        """
+        first, last = self.period_number(period_start), self.period_number(period_end)
+        gaps = []
+        expected = first  # First period not known to be completed yet
+        window_end = self.period_start(last + 1) - timedelta(microseconds=1)
+        for date in self.completions_between(self.period_start(first), window_end):
+            period = self.period_number(date)
+            if period > expected:
+                gaps.append((self.period_start(expected), self.period_start(period)))
+            expected = max(expected, period + 1)
+        if expected <= last:
+            gaps.append((self.period_start(expected), self.period_start(last + 1)))
+        return gaps
 
     def is_broken(self, period_start: datetime, period_end: datetime) -> bool:
         """
@@ -127,10 +622,8 @@ class Habit:
         Returns:
             bool: True if no completion happened during the time period, else False.
         """
-        for log in self.completion_log:
-            if period_start <= log <= period_end:
-                return False  # Habit was completed at least once in the period
-        return True  # No completion found in the specified period
+        lo, hi = self._window(period_start, period_end)
+        return lo == hi
     
     
     
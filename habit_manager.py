@@ -1,35 +1,414 @@
 import json
 import os
-from typing import List, Optional
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
 from habit import Habit  # Import the Habit class for habit.py
+from analytics import evict_habit, get_habit_metrics
+from journal import Journal
+from locking import file_lock
+from snapshot import BINARY_SUFFIX, is_binary_snapshot, iter_snapshot_habits, write_snapshot
+from storage import HabitStorage, JsonStorage
+from summary import write_summary
 from datetime import datetime, timedelta
 
 
+def iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator:
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time.
+
+    Only the element being decoded (plus one read chunk) is held in memory, so
+    arbitrarily large files can be processed in a single pass.
+
+    Args:
+        f (IO[str]): Text file positioned at the start of the array.
+        chunk_size (int): Number of characters read per refill.
+
+    Raises:
+        ValueError: If the file is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def next_char():
+        """Skip whitespace and return the next character (refilling as needed), or '' at EOF."""
+        nonlocal buffer, pos, eof
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos] if pos < len(buffer) else ""
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+
+    def end_of_array():
+        """Consume the closing ']' and make sure only whitespace follows it."""
+        nonlocal pos
+        pos += 1
+        if next_char():
+            raise ValueError("Unexpected data after the JSON array.")
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array.")
+    pos += 1
+    if next_char() == "]":
+        end_of_array()
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number cut by the buffer edge decodes as its prefix (e.g. "-25" of
+                # "-25.0e3"), so only accept a value followed by a delimiter
+                if eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            # Grow the buffer geometrically so a large element is not re-parsed too often
+            chunk = f.read(max(chunk_size, len(buffer) - pos))
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+        yield value
+        buffer, pos = buffer[end:], 0
+
+        separator = next_char()
+        if separator == "]":
+            end_of_array()
+            return
+        if separator != ",":
+            raise ValueError("Expected ',' or ']' in JSON array.")
+        pos += 1
+
+
+def iter_check_off_csv(f: IO[str]) -> Iterator[Tuple[str, datetime]]:
+    """
+    Stream (habit name, date) pairs from a CSV file with the columns name,date.
+
+    Dates are ISO dates or timestamps. Timestamps with a UTC offset are
+    converted to naive local time, like the rest of the log. A header row
+    starting with 'name' and blank lines are skipped; names are lower-cased
+    like in the menu.
+
+    Args:
+        f (IO[str]): Text file opened with newline=''.
+
+    Raises:
+        ValueError: If a row has fewer than two columns or an invalid date.
+    """
+    import csv  # Only needed for imports; keeps the module cheap to load
+
+    for line_no, row in enumerate(csv.reader(f), 1):
+        if not row or (line_no == 1 and row[0].strip().lower() == "name"):
+            continue
+        if len(row) < 2:
+            raise ValueError(f"Line {line_no}: expected name,date.")
+        try:
+            date = datetime.fromisoformat(row[1].strip())
+        except ValueError:
+            raise ValueError(f"Line {line_no}: invalid date {row[1]!r}.") from None
+        if date.tzinfo is not None:
+            date = date.astimezone().replace(tzinfo=None)
+        yield row[0].strip().lower(), date
+
+
+def synchronized(method):
+    """
+    Run a HabitManager method while holding the manager's lock.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class HabitManager:
     """
     Manages a list of habits and handles saving, loading, and operations on them.
+
+    Habits are indexed by name (names are unique) and by periodicity, so lookups,
+    removal and periodicity filters do not scan the whole collection.
+
+    Once a storage backend is attached (see attach_storage() and open_journal()),
+    every add, remove, check and uncheck made through the manager is persisted
+    as a single change instead of rewriting the whole file.
+
+    The manager's methods are thread-safe. Saving to a JSON file holds the
+    file's advisory lock and merges what other sessions wrote to it since
+    this one loaded it (see merge_from_file()), so concurrent sessions do not
+    overwrite each other's check-offs. Change habits through the manager,
+    not through Habit methods, so those changes are merged correctly.
     """
 
-    def __init__(self):
-        self.habits: List[Habit] = []
+    __slots__ = ("compact", "storage", "_by_name", "_by_periodicity", "_habit_list", "_version",
+                 "_lock", "_source", "_added", "_removed", "_checked", "_unchecked")
+
+    def __init__(self, compact: bool = False):
+        """
+        Args:
+            compact (bool): Load habits with compact (array-backed) completion logs.
+        """
+        self.compact = compact
+        self.storage: Optional[HabitStorage] = None  # Set by attach_storage()
+        self._by_name: Dict[str, Habit] = {}  # Name -> habit, in insertion order
+        self._by_periodicity: Dict[str, Dict[str, Habit]] = {}  # Periodicity -> name -> habit
+        self._habit_list: Optional[List[Habit]] = None  # Cached ordered list for `habits`
+        self._version = 0  # Bumped whenever habits are added or removed
+        self._lock = threading.RLock()
+        # Changes since the last load/save of `_source`, needed to merge with the file
+        self._source: Optional[str] = None  # JSON file the habits were last loaded from or saved to
+        self._added: set = set()  # Names added here
+        self._removed: set = set()  # Names removed here
+        self._checked: Dict[str, set] = {}  # Name -> period numbers checked here
+        self._unchecked: Dict[str, set] = {}  # Name -> period numbers unchecked here
+
+    @property
+    def habits(self) -> List[Habit]:
+        """
+        All habits in insertion order.
+
+        The list is cached between changes; use add_habit() and remove_habit()
+        instead of modifying it.
+        """
+        with self._lock:
+            if self._habit_list is None:
+                self._habit_list = list(self._by_name.values())
+            return self._habit_list
+
+    @property
+    def version(self) -> int:
+        """
+        Mutation counter for adding and removing habits.
+        """
+        return self._version
+
+    def _changed(self):
+        self._habit_list = None
+        self._version += 1
+
+    def _clear(self):
+        for h in self._by_name.values():
+            evict_habit(h)
+        self._by_name = {}
+        self._by_periodicity = {}
+        self._changed()
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
 
+    def _insert(self, habit: Habit):
+        self._by_name[habit.name] = habit
+        self._by_periodicity.setdefault(habit.periodicity, {})[habit.name] = habit
+        self._changed()
+
+    def _replace(self, habit: Habit):
+        """
+        Swap in a new object for an existing habit, keeping its position.
+        """
+        old = self._by_name[habit.name]
+        del self._by_periodicity[old.periodicity][habit.name]
+        evict_habit(old)
+        self._by_name[habit.name] = habit
+        self._by_periodicity.setdefault(habit.periodicity, {})[habit.name] = habit
+        self._changed()
+
+    def _forget_changes(self, source: Optional[str]):
+        """
+        Mark the current state as in sync with `source`.
+        """
+        self._source = source
+        self._added = set()
+        self._removed = set()
+        self._checked = {}
+        self._unchecked = {}
+
+    def _pop(self, name: str) -> Optional[Habit]:
+        habit = self._by_name.pop(name, None)
+        if habit is not None:
+            del self._by_periodicity[habit.periodicity][name]
+            evict_habit(habit)
+            self._changed()
+        return habit
+
+    @synchronized
+    def load_habits(self, habits: Iterable[Habit]):
+        """
+        Replace all habits, e.g. with ones read by a storage backend.
+
+        Unlike add_habit(), this does not record changes to the attached storage.
+        Later habits with an already used name are merged into the first one.
+
+        Args:
+            habits (Iterable[Habit]): The habits to load.
+        """
+        self._clear()
+        self._forget_changes(None)
+        for habit in habits:
+            existing = self._by_name.get(habit.name)
+            if existing is not None:
+                # Older files may contain the same name twice; merge their logs
+                existing.completion_log = list(existing.completion_log) + list(habit.completion_log)
+                continue
+            self._insert(habit)
+
+    @synchronized
     def add_habit(self, habit: Habit):
         """
         Add a new habit to the list.
 
         Args:
             habit (Habit): The habit to add.
+
+        Raises:
+            ValueError: If a habit with the same name already exists.
+        """
+        if habit.name in self._by_name:
+            raise ValueError(f"A habit named '{habit.name}' already exists.")
+        self._insert(habit)
+        self._added.add(habit.name)
+        self._removed.discard(habit.name)
+        self._checked.pop(habit.name, None)
+        self._unchecked.pop(habit.name, None)
+        self._record("add", name=habit.name, periodicity=habit.periodicity,
+                      created_at=habit.created_at.isoformat(),
+                      completion_log=habit.serialized_log())
+
+    def get_habit(self, name: str) -> Optional[Habit]:
         """
-        self.habits.append(habit)
+        Get a habit by its name.
 
-    def remove_habit(self, name: str):
+        Args:
+            name (str): The name of the habit.
+
+        Returns:
+            Optional[Habit]: The habit, or None if it does not exist.
+        """
+        return self._by_name.get(name)
+
+    def has_habit(self, name: str) -> bool:
+        """
+        Check whether a habit with the given name exists.
+        """
+        return name in self._by_name
+
+    @synchronized
+    def remove_habit(self, name: str) -> Optional[Habit]:
         """
         Remove a habit by its name.
 
         Args:
             name (str): The name of the habit to remove.
+
+        Returns:
+            Optional[Habit]: The removed habit, or None if it did not exist.
+        """
+        habit = self._pop(name)
+        if habit is not None:
+            self._added.discard(name)
+            self._removed.add(name)
+            self._checked.pop(name, None)
+            self._unchecked.pop(name, None)
+            self._record("remove", name=name)
+        return habit
+
+    @synchronized
+    def check_off_habit(self, name: str, date: Optional[datetime] = None) -> bool:
+        """
+        Check off a habit by name and journal the change. Nothing is printed.
+
+        Args:
+            name (str): The name of the habit.
+            date (Optional[datetime]): The date to check off. Defaults to now.
+
+        Returns:
+            bool: True if the completion was logged, False if it was a duplicate.
+
+        Raises:
+            KeyError: If no habit with that name exists.
+        """
+        date = date or datetime.now()
+        habit = self._by_name[name]
+        if not habit.add_completion(date):
+            return False
+        period = habit.period_number(date)
+        self._checked.setdefault(name, set()).add(period)
+        self._unchecked.get(name, set()).discard(period)
+        self._record("check", name=name, date=date.isoformat())
+        return True
+
+    @synchronized
+    def bulk_check_off(self, records: Iterable[Tuple[str, datetime]]) -> int:
+        """
+        Check off many (habit name, date) pairs at once and persist them with a single save.
+
+        Records are grouped per habit and handed to Habit.add_completions(), so
+        every habit is sorted, deduplicated and re-indexed once. Nothing is
+        printed and nothing is journaled per record; an attached storage saves
+        the full state once at the end.
+
+        Args:
+            records (Iterable[Tuple[str, datetime]]): (habit name, completion timestamp) pairs.
+
+        Returns:
+            int: The number of completions logged.
+
+        Raises:
+            KeyError: If a record names an unknown habit. No habit is changed in that case.
         """
-        self.habits = [h for h in self.habits if h.name != name]
+        batches: Dict[str, List[datetime]] = {}
+        for name, date in records:
+            batches.setdefault(name, []).append(date)
+        unknown = [name for name in batches if name not in self._by_name]
+        if unknown:
+            raise KeyError(f"Unknown habits: {', '.join(unknown)}")
+
+        added = 0
+        for name, dates in batches.items():
+            habit = self._by_name[name]
+            added += habit.add_completions(dates)
+            periods = set(map(habit.period_number, dates))
+            self._checked.setdefault(name, set()).update(periods)
+            if name in self._unchecked:
+                self._unchecked[name].difference_update(periods)
+        if added and self.storage is not None:
+            self.storage.save(self)
+        return added
+
+    @synchronized
+    def uncheck_habit(self, name: str, date: Optional[datetime] = None) -> bool:
+        """
+        Uncheck a habit by name for the period of the given date and journal the change.
+        Nothing is printed.
+
+        Args:
+            name (str): The name of the habit.
+            date (Optional[datetime]): A date in the period to uncheck. Defaults to now.
+
+        Returns:
+            bool: True if a check-off was removed.
+
+        Raises:
+            KeyError: If no habit with that name exists.
+        """
+        date = date or datetime.now()
+        habit = self._by_name[name]
+        if not habit.remove_completion(date):
+            return False
+        period = habit.period_number(date)
+        self._checked.get(name, set()).discard(period)
+        self._unchecked.setdefault(name, set()).add(period)
+        self._record("uncheck", name=name, date=date.isoformat())
+        return True
 
     def get_habits_by_periodicity(self, periodicity: str) -> List[Habit]:
         """
@@ -41,7 +420,54 @@ class HabitManager:
         Returns:
             List[Habit]: Matching habits.
         """
-        return [h for h in self.habits if h.periodicity == periodicity]
+        return list(self._by_periodicity.get(periodicity, {}).values())
+
+    @synchronized
+    def period_status(self, date: Optional[datetime] = None) -> List[Tuple[Habit, bool]]:
+        """
+        Get the checked status of every habit for the period containing the date.
+
+        Each lookup is a search of the habit's streak segments by period number
+        (or uses the stored last completion for unparsed logs), so no log is scanned.
+
+        Args:
+            date (Optional[datetime]): The session date. Defaults to now.
+
+        Returns:
+            List[Tuple[Habit, bool]]: (habit, checked) pairs in insertion order.
+        """
+        date = date or datetime.now()
+        return [(habit, habit.is_checked(date)) for habit in self.habits]
+
+    @synchronized
+    def get_missed_habits(self, date: Optional[datetime] = None) -> List[Habit]:
+        """
+        Get the habits not checked off for the period containing the date.
+
+        Args:
+            date (Optional[datetime]): The session date. Defaults to now.
+
+        Returns:
+            List[Habit]: Missed habits in insertion order.
+        """
+        return [habit for habit, checked in self.period_status(date) if not checked]
+
+    @synchronized
+    def get_broken_habits(self, period_start: datetime, period_end: datetime) -> List[Habit]:
+        """
+        Get the habits that missed at least one period (day or week) between two dates.
+
+        Uses Habit.gaps_between(), so each habit costs O(log n + k) for k
+        completions in the window rather than a scan of its whole history.
+
+        Args:
+            period_start (datetime): Start of the time window.
+            period_end (datetime): End of the time window.
+
+        Returns:
+            List[Habit]: Habits with gaps, in insertion order.
+        """
+        return [habit for habit in self.habits if habit.gaps_between(period_start, period_end)]
 
     def get_longest_streak(self) -> Optional[int]:
         """
@@ -52,7 +478,7 @@ class HabitManager:
         """
         if not self.habits:
             return None
-        return max(h.get_current_streak() for h in self.habits)
+        return max(get_habit_metrics(h)["longest_streak"] for h in self.habits)
 
     def get_longest_streak_for_habit(self, name: str) -> Optional[int]:
         """
@@ -64,46 +490,276 @@ class HabitManager:
         Returns:
             Optional[int]: The streak, or None if the habit was not found.
         """
-        for h in self.habits:
-            if h.name == name:
-                return h.get_current_streak()
-        return None
+        habit = self._by_name.get(name)
+        if habit is None:
+            return None
+        return get_habit_metrics(habit)["longest_streak"]
 
-    def save_to_file(self, filename: str = "habits.json"):
+    @synchronized
+    def attach_storage(self, storage: HabitStorage):
         """
-        Save habits to a JSON file.
+        Persist every later change made through the manager to a storage backend.
+
+        Args:
+            storage (HabitStorage): The backend, e.g. JsonStorage or SqliteStorage.
+        """
+        self.close_storage()
+        self.storage = storage
+        storage.attach(self)
+
+    def open_journal(self, filename: str = "habits.json", compact_every: int = 1000):
+        """
+        Start journaling changes made through the manager next to a JSON snapshot.
+
+        Load the snapshot first (load_from_file replays an existing journal);
+        from then on add_habit, remove_habit, check_off_habit and uncheck_habit
+        append one record each, and the journal is folded into a new snapshot
+        every `compact_every` records.
+
+        Args:
+            filename (str): The snapshot file the journal belongs to.
+            compact_every (int): Number of records between automatic compactions.
+        """
+        self.attach_storage(JsonStorage(filename, compact_every))
+
+    def batch(self):
+        """
+        Context manager that makes the changes recorded inside it durable with a single write.
+        """
+        if self.storage is None:
+            return nullcontext()
+        return self.storage.batch()
+
+    @synchronized
+    def checkpoint(self):
+        """
+        Bring the attached storage into a compact, fully written state (e.g. on exit).
+        """
+        if self.storage is not None:
+            self.storage.checkpoint(self)
+
+    @synchronized
+    def close_storage(self):
+        """
+        Detach the storage backend and close its files.
+        """
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+
+    def _record(self, op: str, **fields):
+        if self.storage is not None:
+            self.storage.record(op, **fields)
+
+    @synchronized
+    def _apply_record(self, record: dict):
+        """
+        Apply one journal record without journaling it again.
+        """
+        op, name = record["op"], record["name"]
+        habit = self._by_name.get(name)
+        if op == "add" and habit is None:
+            habit = Habit(name, record["periodicity"], compact=self.compact)
+            habit.created_at = datetime.fromisoformat(record["created_at"])
+            habit.completion_log = (datetime.fromisoformat(dt) for dt in record.get("completion_log", []))
+            self._insert(habit)
+        elif op == "remove":
+            self._pop(name)
+        elif op == "check" and habit is not None:
+            habit.add_completion(datetime.fromisoformat(record["date"]))
+        elif op == "uncheck" and habit is not None:
+            habit.remove_completion(datetime.fromisoformat(record["date"]))
+
+    @synchronized
+    def save_to_file(self, filename: str = "habits.json", merge: bool = True):
+        """
+        Save habits to a JSON file, plus its summary file (see summary.py).
+
+        Files ending in .bin are written in the binary snapshot format instead
+        (see snapshot.py), which is much smaller and faster to load.
+
+        Each habit's completion count, last completion and longest streak are
+        stored next to its log so a later load can skip parsing the log.
+
+        The file's advisory lock is held throughout. Unless merge is False, the
+        file's current content (snapshot and journal) is first merged into this
+        manager (see merge_from_file()). The data is written to a temporary file
+        and renamed into place, so readers see either the old or the new
+        snapshot, and the journal, now folded into the snapshot, is emptied.
 
         Args:
             filename (str): File name to save to.
+            merge (bool): Merge changes other sessions made to the file first.
+        """
+        with file_lock(filename):
+            if merge:
+                self.merge_from_file(filename)
+            rows = self._summary_rows()
+            tmp_file = filename + ".tmp"
+            if filename.endswith(BINARY_SUFFIX):
+                write_snapshot(tmp_file, self.habits, rows)
+            else:
+                records = []
+                for h, row in zip(self.habits, rows):
+                    records.append({
+                        "name": h.name,
+                        "periodicity": h.periodicity,
+                        "created_at": h.created_at.isoformat(),
+                        "completion_count": row["completions"],
+                        "last_done": row["last_done"],
+                        "longest_streak": row["longest_streak"],
+                        "last_streak": h.get_last_streak(),
+                        "completion_log": h.serialized_log()
+                    })
+                with open(tmp_file, "w") as f:
+                    json.dump(records, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, filename)
+            Journal.truncate(Journal.path_for(filename))
+            write_summary(filename, rows)
+            self._forget_changes(filename)
+
+    @synchronized
+    def merge_from_file(self, filename: str = "habits.json"):
+        """
+        Merge the current content of a JSON file and its journal into this manager.
+
+        Completion logs are merged by period, three-way against the state this
+        manager last loaded from or saved to the file: check-offs made by other
+        sessions are added unless this manager unchecked that period since,
+        and periods other sessions unchecked are dropped unless this manager
+        checked them again since. Instead of a copy of that base, the periods
+        checked here are tracked: a period this manager has that is missing
+        from the file and was not checked here was in the base, so another
+        session unchecked it. Habits added elsewhere are added, and habits
+        removed here stay removed. A habit missing from the file is dropped if
+        it was loaded from it (another session removed it) and kept if it was
+        added here. Habits whose log this manager never parsed take the file's
+        log without parsing it.
+
+        Args:
+            filename (str): The JSON snapshot to merge.
+        """
+        with file_lock(filename):
+            disk = HabitManager(compact=self.compact)
+            if os.path.exists(filename):
+                disk.load_habits(self.iter_habits_from_file(filename, self.compact, lazy=True))
+            for record in Journal.read(Journal.path_for(filename)):
+                disk._apply_record(record)
+
+        for name, theirs in disk._by_name.items():
+            if name in self._removed:
+                continue
+            mine = self._by_name.get(name)
+            if mine is None:
+                self._insert(theirs)
+            elif mine.periodicity != theirs.periodicity or mine.created_at != theirs.created_at:
+                self._replace(theirs)  # Removed and re-added elsewhere
+            elif not mine.hydrated:
+                # Unparsed, so unchanged here: adopt the file's log without parsing it
+                log = theirs.raw_log if theirs.raw_log is not None else theirs.serialized_log()
+                if log != mine.raw_log:
+                    last = theirs.get_last_completion()
+                    mine.set_raw_log(log, theirs.get_completion_count(), last.isoformat() if last else None,
+                                     theirs.get_longest_streak(), theirs.get_last_streak())
+            else:
+                if self._source == filename and name not in self._added:
+                    # In the base and in this manager but not in the file: unchecked elsewhere
+                    checked = self._checked.get(name, ())
+                    on_disk = set(theirs.period_numbers())
+                    for period in set(mine.period_numbers()) - on_disk:
+                        if period not in checked:
+                            mine.remove_completion(mine.period_start(period))
+                unchecked = self._unchecked.get(name, ())
+                mine.add_completions(d for d in theirs.completion_log
+                                     if mine.period_number(d) not in unchecked)
+        if self._source == filename:
+            for name in [n for n in self._by_name if n not in disk._by_name and n not in self._added]:
+                self._pop(name)
+
+    @synchronized
+    def save_summary(self, filename: str = "habits.json"):
+        """
+        Rewrite the summary of a snapshot after its journal changed, so the
+        status command can keep skipping the snapshot.
+
+        Args:
+            filename (str): The snapshot file the summary belongs to.
         """
-        with open(filename, "w") as f:
-            json.dump([{
+        write_summary(filename, self._summary_rows())
+
+    def _summary_rows(self) -> List[Dict]:
+        rows = []
+        for h in self.habits:
+            metrics = get_habit_metrics(h)
+            rows.append({
                 "name": h.name,
                 "periodicity": h.periodicity,
-                "created_at": h.created_at.isoformat(),
-                "completion_log": [dt.isoformat() for dt in h.completion_log]
-            } for h in self.habits], f, indent=4)
+                "completions": metrics["completions"],
+                "longest_streak": metrics["longest_streak"],
+                "last_done": metrics["last_done"].isoformat() if metrics["last_done"] else None,
+            })
+        return rows
+
+    @staticmethod
+    def iter_habits_from_file(filename: str = "habits.json", compact: bool = False,
+                              lazy: bool = True) -> Iterator[Habit]:
+        """
+        Stream habits from a JSON file, parsing one habit object at a time.
 
+        Useful for single-pass analytics over files too large to load at once.
+        Only the snapshot is read; changes still in its journal are not applied.
+        Binary snapshots (see snapshot.py) are recognized by their header.
+
+        Args:
+            filename (str): File name to read from.
+            compact (bool): Create habits with compact completion logs.
+            lazy (bool): Keep each log unparsed until first needed (see Habit.set_raw_log).
+
+        Yields:
+            Habit: The next habit in the file.
+        """
+        if is_binary_snapshot(filename):
+            yield from iter_snapshot_habits(filename, compact, lazy)
+            return
+        with open(filename, "r") as f:
+            for item in iter_json_array(f):
+                habit = Habit(item["name"], item["periodicity"], compact=compact)
+                habit.created_at = datetime.fromisoformat(item["created_at"])
+                # Handle missing completion_log gracefully
+                completion_log = item.get("completion_log", [])
+                if lazy:
+                    habit.set_raw_log(completion_log, item.get("completion_count"), item.get("last_done"),
+                                      item.get("longest_streak"), item.get("last_streak"))
+                else:
+                    # Assigning the log rebuilds the habit's streak index; compact
+                    # habits pack the parsed dates straight into their array
+                    habit.completion_log = (datetime.fromisoformat(dt) for dt in completion_log)
+                yield habit
+
+    @synchronized
     def load_from_file(self, filename: str = "habits.json"):
         """
-        Load habits from a JSON file.
+        Load habits from a JSON file and replay its journal, if there is one.
 
         Args:
             filename (str): File name to load from.
         """
-        try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-                self.habits = []
-                for item in data:
-                    habit = Habit(item["name"], item["periodicity"])
-                    habit.created_at = datetime.fromisoformat(item["created_at"])
-                    # Handle missing completion_log gracefully
-                    completion_log = item.get("completion_log", [])
-                    habit.completion_log = [datetime.fromisoformat(dt) for dt in completion_log]
-                    self.habits.append(habit)
-        except FileNotFoundError:
-            print("No saved habits found. Starting with an empty list.")
+        with file_lock(filename):  # Not in the middle of another session's save
+            if os.path.exists(filename):
+                # Compact managers optimize for memory, so their logs are parsed
+                # straight into arrays instead of being kept as ISO strings;
+                # binary logs are smaller still and stay encoded until used
+                lazy = not self.compact or is_binary_snapshot(filename)
+                self.load_habits(self.iter_habits_from_file(filename, self.compact, lazy=lazy))
+            else:
+                self.load_habits([])
+                print("No saved habits found. Starting with an empty list.")
+
+            for record in Journal.read(Journal.path_for(filename)):
+                self._apply_record(record)
+            self._forget_changes(filename)
 
     def load_or_create_sample_data(self, session_date: datetime, filename: str = "habits.json"):
         """
@@ -123,20 +779,21 @@ class HabitManager:
 
         # Create daily habits with 28 days of data
         for name in daily_habits:
-            habit = Habit(name.lower(), "daily")
-            for days_ago in range(28):
-                habit.completion_log.append(now - timedelta(days=days_ago))
+            habit = Habit(name.lower(), "daily", compact=self.compact)
+            habit.completion_log = [now - timedelta(days=days_ago) for days_ago in range(28)]
             self.add_habit(habit)
 
     # Create weekly habits with 4 weeks of data
         for name in weekly_habits:
-            habit = Habit(name.lower(), "weekly")
+            habit = Habit(name.lower(), "weekly", compact=self.compact)
+            weekly_log = []
             for weeks_ago in range(4):
                 # Always add log on a fixed weekday (e.g., Sunday = 6)
                 weekly_date = (now - timedelta(weeks=weeks_ago)).replace(hour=9, minute=0, second=0, microsecond=0)
                 while weekly_date.weekday() != 6:  # 6 = Sunday
                     weekly_date -= timedelta(days=1)
-                habit.completion_log.append(weekly_date)
+                weekly_log.append(weekly_date)
+            habit.completion_log = weekly_log
             self.add_habit(habit)
 
         self.save_to_file(filename)
@@ -0,0 +1,151 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class Journal:
+    """
+    Append-only, line-delimited log of habit changes stored next to a JSON snapshot.
+
+    Every add, remove, check and uncheck is written as one JSON line and flushed
+    to disk right away, so a write costs O(1) no matter how much history the
+    snapshot holds, and a crash loses at most the operation in flight.
+    HabitManager periodically compacts the journal into a fresh snapshot.
+
+    All records are idempotent (adding an existing habit or checking a checked
+    period is a no-op), so replaying a journal over a snapshot that already
+    contains some of its records is safe.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000):
+        """
+        Args:
+            path (str): Path of the journal file.
+            compact_every (int): Number of records after which the owner should compact.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self._file = None
+        self._batch_depth = 0  # > 0 while appends are collected for a single fsync
+        self._repair()
+        self._records = sum(1 for _ in self.read(path))  # Records since the last compaction
+
+    @staticmethod
+    def path_for(snapshot: str) -> str:
+        """
+        Return the journal path belonging to a snapshot file.
+        """
+        return snapshot + ".journal"
+
+    @staticmethod
+    def read(path: str) -> Iterator[Dict]:
+        """
+        Yield the records of a journal file in order.
+
+        A truncated last line (from a crash mid-write) is ignored.
+
+        Args:
+            path (str): Path of the journal file.
+        """
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        return  # Incomplete trailing write
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def _repair(self):
+        """
+        Cut off a partially written last line so new records start on a fresh line.
+        """
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    f.truncate(data.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            pass
+
+    def append(self, op: str, **fields):
+        """
+        Append one record and force it to disk.
+
+        Args:
+            op (str): 'add', 'remove', 'check' or 'uncheck'.
+            **fields: The record's JSON-serializable fields.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps({"op": op, **fields}) + "\n")
+        if not self._batch_depth:
+            self._sync()
+        self._records += 1
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect the appends made inside the block and force them to disk once at the end.
+
+        A crash inside the block may lose all of its records, so callers should
+        only acknowledge them after the block has exited.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._sync()
+
+    @property
+    def in_batch(self) -> bool:
+        """
+        True inside a batch() block.
+        """
+        return self._batch_depth > 0
+
+    def _sync(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def needs_compaction(self) -> bool:
+        """
+        Check whether enough records accumulated to warrant a new snapshot.
+        """
+        return self._records >= self.compact_every
+
+    @staticmethod
+    def truncate(path: str):
+        """
+        Empty a journal file, leaving missing or already empty files untouched.
+        """
+        try:
+            if os.path.getsize(path):
+                open(path, "w").close()
+        except FileNotFoundError:
+            pass
+
+    def reset(self):
+        """
+        Truncate the journal after its records were written into a snapshot.
+        """
+        self.close()
+        self.truncate(self.path)
+        self._records = 0
+
+    def close(self):
+        """
+        Close the underlying file handle.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self._records
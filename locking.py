@@ -0,0 +1,88 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _ProcessLock:
+    """
+    One advisory lock file shared by all threads of this process.
+
+    OS file locks are held per process (flock even per open file), so threads
+    are serialized by an RLock and only the outermost acquire takes the OS lock.
+    That makes nested acquires from the same thread safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.fd = None
+
+    def acquire(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self.fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+            except BaseException:
+                if self.fd is not None:
+                    os.close(self.fd)
+                    self.fd = None
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+            os.close(self.fd)
+            self.fd = None
+        self.thread_lock.release()
+
+
+_locks: Dict[str, _ProcessLock] = {}
+_locks_guard = threading.Lock()
+
+
+def lock_path_for(filename: str) -> str:
+    """
+    Return the lock file guarding a snapshot and its journal.
+    """
+    return filename + ".lock"
+
+
+@contextmanager
+def file_lock(filename: str) -> Iterator[None]:
+    """
+    Hold the exclusive advisory lock of a snapshot file (across threads and processes).
+
+    Everyone who writes the snapshot or its journal takes this lock, so a
+    save never interleaves with another process's save or journal append.
+    The lock is reentrant within a thread.
+
+    Args:
+        filename (str): The snapshot file (the lock itself lives in `<filename>.lock`).
+    """
+    path = os.path.abspath(lock_path_for(filename))
+    with _locks_guard:
+        lock = _locks.setdefault(path, _ProcessLock(path))
+    lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
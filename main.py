@@ -1,20 +1,18 @@
-from habit_manager import HabitManager
-from habit import Habit
+# Only cheap modules are imported up front; the habit, storage and table
+# modules are imported by the code paths that need them (see `python -X importtime main.py status`).
+import argparse
+import contextlib
+import json
 import os
 import sys
-from datetime import datetime, timedelta
-from tabulate import tabulate
+from datetime import datetime
 
 def get_streak_summary(habits):
-    summary = {
-        "total_habits": len(habits),
-        "total_completions": sum(len(h.completion_log) for h in habits),
-        "longest_streak": max((h.get_longest_streak() for h in habits), default=0),
-        "average_streak": round(sum(h.get_longest_streak() for h in habits) / len(habits), 2) if habits else 0
-    }
-    return summary
-
-def print_menu():
+    from commands import get_streak_summary
+
+    return get_streak_summary(habits)
+
+def print_menu(paged=False):
     print("\nMenu:")
     print("1. Add a new habit")
     print("2. Remove a habit")
@@ -23,10 +21,279 @@ def print_menu():
     print("5. Show habits by longest streak")
     print("6. Show missed habits for this period")
     print("7. Show overall streak summary")
+    if paged:
+        print("n. Next page of habits")
+        print("p. Previous page of habits")
     print("0. Exit")
 
-def main():
-    
+def parse_args(argv=None):
+    # Storage options are accepted before and after the command
+    storage_options = argparse.ArgumentParser(add_help=False)
+    storage_options.add_argument("--file", default=argparse.SUPPRESS,
+                                 help="JSON file to store habits in (default: habits.json)")
+    storage_options.add_argument("--db", default=argparse.SUPPRESS,
+                                 help="SQLite database to use instead of the JSON file")
+    storage_options.add_argument("--profile", action="store_true", default=argparse.SUPPRESS,
+                                 help="Time the hot paths and print call counts and latencies at exit "
+                                      "(or set HABIT_PROFILE=1)")
+    storage_options.add_argument("--profile-out", default=argparse.SUPPRESS, metavar="FILE",
+                                 help="Profile and also write cProfile stats to FILE "
+                                      "(or set HABIT_PROFILE_OUT)")
+
+    parser = argparse.ArgumentParser(description="Habit Tracker CLI. Without a command, starts the interactive menu.",
+                                     parents=[storage_options])
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("migrate", parents=[storage_options],
+                          help="Copy the JSON file into the SQLite database (--db, default: habits.db)")
+
+    # Options of the scriptable commands, which print JSON or TSV
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument("--format", choices=["tsv", "json"], default="tsv",
+                                help="Output format (default: tsv)")
+    output_options.add_argument("--socket", help="Send the command to the server listening on this socket")
+    date_options = argparse.ArgumentParser(add_help=False)
+    date_options.add_argument("--date", type=parse_date, help="Date to use (YYYY-MM-DD), defaults to today")
+    command_options = [storage_options, output_options]
+
+    add_parser = subparsers.add_parser("add", parents=command_options, help="Add a habit")
+    add_parser.add_argument("name")
+    add_parser.add_argument("periodicity", choices=["daily", "weekly"])
+
+    for command, help_text in (("check", "Check off a habit for the day/week of --date"),
+                               ("uncheck", "Uncheck a habit for the day/week of --date")):
+        command_parser = subparsers.add_parser(command, parents=command_options + [date_options], help=help_text)
+        command_parser.add_argument("name")
+
+    subparsers.add_parser("status", parents=command_options + [date_options],
+                          help="Show every habit with its check status and metrics")
+    subparsers.add_parser("streaks", parents=command_options + [date_options],
+                          help="Show the current and longest streak of every habit")
+    subparsers.add_parser("missed", parents=command_options + [date_options],
+                          help="List habits not checked off for the current period")
+    subparsers.add_parser("summary", parents=command_options,
+                          help="Show totals and the longest and average streak")
+
+    serve_parser = subparsers.add_parser("serve", parents=[storage_options],
+                                         help="Keep the habits in memory and serve commands over a Unix socket")
+    serve_parser.add_argument("--socket", default="habits.sock", help="Socket to listen on (default: habits.sock)")
+
+    import_parser = subparsers.add_parser("import", parents=[storage_options],
+                                          help="Check off habits in bulk from a CSV file with the columns name,date")
+    import_parser.add_argument("csv_file", help="CSV file to import")
+
+    args = parser.parse_args(argv)
+    args.file = getattr(args, "file", "habits.json")
+    args.db = getattr(args, "db", None)
+    if args.command == "serve" and args.db:
+        parser.error("serve only serves JSON files (--file); --db is not supported")
+    args.profile_out = getattr(args, "profile_out", None) or os.environ.get("HABIT_PROFILE_OUT")
+    args.profile = (getattr(args, "profile", False) or bool(args.profile_out)
+                    or os.environ.get("HABIT_PROFILE", "") not in ("", "0"))
+    return args
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD") from None
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+def write_rows(rows, columns, fmt, out=None):
+    """
+    Print rows (dicts) as a JSON array or as TSV with a header line.
+    """
+    out = out or sys.stdout
+    if fmt == "json":
+        json.dump([{c: row[c] for c in columns} for row in rows], out, default=format_value)
+        out.write("\n")
+        return
+    out.write("\t".join(columns) + "\n")
+    for row in rows:
+        out.write("\t".join(format_value(row[c]) for c in columns) + "\n")
+
+def load_json(manager, filename):
+    # Keep load messages off stdout, which carries the command's output
+    with contextlib.redirect_stdout(sys.stderr):
+        manager.load_from_file(filename)
+
+def run_command(args):
+    """
+    Run one of the scriptable commands and print its result.
+
+    With --socket the command is sent to a running server. Otherwise read-only
+    commands load the JSON file without parsing completion logs (metrics come
+    from the stored metadata), and changes are appended to the journal
+    instead of rewriting the file.
+
+    Returns:
+        int: The exit code.
+    """
+    session_date = getattr(args, "date", None)
+    request = {"command": args.command, "name": getattr(args, "name", None),
+               "periodicity": getattr(args, "periodicity", None),
+               "date": session_date.isoformat() if session_date else None}
+
+    if args.socket:
+        from client import send_request
+
+        try:
+            response = send_request(args.socket, request)
+        except OSError as e:
+            print(f"error: cannot reach the server at {args.socket}: {e}", file=sys.stderr)
+            return 1
+        if not response["ok"]:
+            print(f"error: {response['error']}", file=sys.stderr)
+            return 1
+        write_rows(response["rows"], response["columns"], args.format)
+        return 0
+
+    summary = None
+    if args.command == "status" and not args.db:
+        from summary import STATUS_COLUMNS, read_summary, status_rows
+
+        # Cold-start path: answered from the summary file, without importing
+        # the habit modules or reading the snapshot
+        summary = read_summary(args.file)
+        rows = status_rows(summary, session_date or datetime.now()) if summary else None
+        if rows is not None:
+            write_rows(rows, STATUS_COLUMNS, args.format)
+            return 0
+    if args.db:
+        from commands import SQL_COMMANDS, execute_sql
+
+        if args.command in SQL_COMMANDS:
+            from sqlite_storage import SqliteStorage
+
+            # Answered by indexed queries and single-row writes, without loading any completion history
+            storage = SqliteStorage(args.db)
+            try:
+                columns, rows = execute_sql(storage, request)
+            except ValueError as e:
+                print(f"error: {e}", file=sys.stderr)
+                return 1
+            finally:
+                storage.close()
+            write_rows(rows, columns, args.format)
+            return 0
+
+    from commands import WRITE_COMMANDS, execute
+
+    writing = args.command in WRITE_COMMANDS
+    manager = load_manager(args, attach=writing)
+    try:
+        columns, rows = execute(manager, request)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if not args.db and (writing or (args.command == "status" and summary is None)):
+            try:
+                # Keep the status fast path valid after a journal append, or
+                # prepare it for the next status call
+                manager.save_summary(args.file)
+            except OSError:
+                pass
+        manager.close_storage()
+
+    write_rows(rows, columns, args.format)
+    return 0
+
+def load_manager(args, attach=True):
+    """
+    Load the habits from the JSON file or database, and attach it as storage
+    unless the caller only reads.
+    """
+    from habit_manager import HabitManager
+
+    manager = HabitManager()
+    if args.db:
+        from sqlite_storage import SqliteStorage
+
+        storage = SqliteStorage(args.db)
+        storage.load(manager)
+        if attach:
+            manager.attach_storage(storage)
+        else:
+            storage.close()
+    else:
+        load_json(manager, args.file)
+        if attach:
+            manager.open_journal(args.file)
+    return manager
+
+def import_csv(args):
+    from habit_manager import iter_check_off_csv
+
+    manager = load_manager(args)
+    try:
+        with open(args.csv_file, newline="") as f:
+            added = manager.bulk_check_off(iter_check_off_csv(f))
+    except (KeyError, OSError, ValueError) as e:
+        print(f"error: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close_storage()
+    print(f"✅ Imported {added} check-offs from {args.csv_file}.")
+    return 0
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile:
+        from profiling import enable_profiling
+
+        profiler = enable_profiling(args.profile_out)
+        # Also time the table; patched here because this module may be running as __main__
+        profiler.instrument(sys.modules[__name__], ["render_habit_table"], "main")
+
+    if args.command == "migrate":
+        from sqlite_storage import migrate_json_to_sqlite
+
+        db_file = args.db or "habits.db"
+        count = migrate_json_to_sqlite(args.file, db_file)
+        print(f"✅ Migrated {count} habits from {args.file} to {db_file}.")
+        return
+    if args.command == "serve":
+        from server import serve
+
+        print(f"Serving {args.file} on {args.socket} (Ctrl+C to stop).", file=sys.stderr)
+        try:
+            serve(args.file, args.socket)
+        except RuntimeError as e:
+            print(f"error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    if args.command in ("add", "check", "uncheck", "status", "streaks", "missed", "summary"):
+        sys.exit(run_command(args))
+    if args.command == "import":
+        sys.exit(import_csv(args))
+
+    run_interactive(args)
+
+def render_habit_table(manager, session_date, table=None):
+    """
+    Return the habit table shown above the interactive menu.
+
+    Pass the same table_view.HabitTable on every call to redraw incrementally
+    and keep the current page; without one, the first page is drawn from scratch.
+    """
+    from table_view import HabitTable  # Only the interactive menu draws tables
+
+    return (table or HabitTable()).render(manager, session_date)
+
+
+def run_interactive(args):
+    from habit import Habit
+    from habit_manager import HabitManager
+    from sqlite_storage import SqliteStorage
+    from table_view import HabitTable
+
         # Ask user for a working date
     print("📅 Welcome to the Habit Tracker!")
     use_today = input("Use today's date? (Y/n): ").strip().lower()
@@ -45,46 +312,25 @@ def main():
 
 
     manager = HabitManager()
-    manager.load_or_create_sample_data(session_date)  # Load from file or generate sample habits if file doesn't exist
+    if args.db:
+        storage = SqliteStorage(args.db)
+        storage.load(manager)
+        manager.attach_storage(storage)  # Every change is written as a single row update
+    else:
+        manager.load_or_create_sample_data(session_date, args.file)  # Load from file or generate sample habits if file doesn't exist
+        manager.open_journal(args.file)  # Persist every change as one appended journal line
 
+    table = HabitTable()  # Kept across redraws: only changed rows are rebuilt
     while True:
         # 📌 Show current habits with simulated checkboxes
         if manager.habits:
             print("\n📌 Your Habits:")
-
-            table_data = []
-            now = session_date
-
-            for idx, h in enumerate(manager.habits, 1):
-                is_checked = False
-                last_date = h.completion_log[-1].date() if h.completion_log else "N/A"
-
-                for log in h.completion_log:
-                    if h.periodicity == "daily" and log.date() == now.date():
-                        is_checked = True
-                        break
-                    elif h.periodicity == "weekly" and log.isocalendar()[1] == now.isocalendar()[1] and log.year == now.year:
-                        is_checked = True
-                        break
-
-                checkbox = "[x]" if is_checked else "[ ]"
-                table_data.append([
-                    idx,
-                    checkbox,
-                    h.name.title(),
-                    h.periodicity,
-                    len(h.completion_log),
-                    h.get_longest_streak(),
-                    last_date
-                ])
-
-            headers = ["#", "check", "Habit", "Type", "Completions", "Longest Streak", "Last Done"]
-            print(tabulate(table_data, headers=headers, tablefmt="fancy_grid"))
+            print(render_habit_table(manager, session_date, table))
         else:
             print("\n📭 You have no habits yet.")
 
-        print_menu()
-        choice = input("Enter your choice: ").strip()
+        print_menu(paged=table.page_count(len(manager.habits)) > 1)
+        choice = input("Enter your choice: ").strip().lower()
 
         if choice == "1":
             name = input("Enter habit name: ").strip().lower()
@@ -93,15 +339,19 @@ def main():
                 print("Invalid periodicity.")
             else:
                 habit = Habit(name, periodicity)
-                manager.add_habit(habit)
-                manager.save_to_file()
+                try:
+                    manager.add_habit(habit)
+                except ValueError as e:
+                    print(f"❌ {e}")
+                    continue
                 print("✅ Habit added.")
 
         elif choice == "2":
             name = input("Enter the name of the habit to delete: ").strip().lower()
-            manager.remove_habit(name)
-            manager.save_to_file()
-            print("🗑️ Habit removed.")
+            if manager.remove_habit(name) is None:
+                print("❌ No habit with that name.")
+            else:
+                print("🗑️ Habit removed.")
 
         elif choice == "3":
             if not manager.habits:
@@ -120,25 +370,13 @@ def main():
 
                     print(f"🔁 Selected: {habit.name.title()} ({habit.periodicity})")
 
-                    now = session_date
-                    # Check if the habit is already checked for today
-                    # Simulate checking/unchecking based on periodicity
-                    is_checked = False
-
-                    for log in habit.completion_log:
-                        if habit.periodicity == "daily" and log.date() == now.date():
-                            is_checked = True
-                            break
-                        elif habit.periodicity == "weekly":
-                            if log.isocalendar()[1] == now.isocalendar()[1] and log.year == now.year:
-                                is_checked = True
-                                break
+                    is_checked = habit.is_checked(session_date)
 
                     if is_checked:
-                        habit.uncheck()
+                        manager.uncheck_habit(habit.name, session_date)
                         print(f"❌ Unchecked {habit.name} for this {habit.periodicity}.")
                     else:
-                        habit.check_off(session_date)
+                        manager.check_off_habit(habit.name, session_date)
                         print(f"✔️ Checked off {habit.name} for {session_date.date()}.")
                 except Exception as e:
                     print(f"An error occurred: {e}")
@@ -151,7 +389,7 @@ def main():
                 if not filtered:
                     print("No habits found for this periodicity.")
                 for h in filtered:
-                    print(f"📌 {h.name} – {len(h.completion_log)} completions")
+                    print(f"📌 {h.name} – {h.get_completion_count()} completions")
                     
         elif choice == "5":
             if not manager.habits:
@@ -163,22 +401,7 @@ def main():
                     print(f"- {h.name.title()} ({h.periodicity}) – Longest streak: {h.get_longest_streak()}")
 
         elif choice == "6":
-            missed = []
-            now = session_date
-            # Check for missed habits
-
-            for habit in manager.habits:
-                is_checked = False
-                for log in habit.completion_log:
-                    if habit.periodicity == "daily" and log.date() == now.date():
-                        is_checked = True
-                        break
-                    elif habit.periodicity == "weekly":
-                        if log.isocalendar()[1] == now.isocalendar()[1] and log.year == now.year:
-                            is_checked = True
-                            break
-                if not is_checked:
-                    missed.append(habit)
+            missed = manager.get_missed_habits(session_date)
 
             if missed:
                 print("\n❌ Missed Habits:")
@@ -194,7 +417,17 @@ def main():
                 print(f"{key.replace('_', ' ').title()}: {value}")
 
 
+        elif choice == "n":
+            if not table.next_page(len(manager.habits)):
+                print("Already on the last page.")
+
+        elif choice == "p":
+            if not table.previous_page():
+                print("Already on the first page.")
+
         elif choice == "0":
+            manager.checkpoint()
+            manager.close_storage()
             print("👋 Goodbye!")
             sys.exit()
 
@@ -0,0 +1,173 @@
+"""
+Streak analytics for very large habit collections, spread over a process pool.
+
+Habits (or the raw records of habits.json) are cut into chunks; every worker
+reduces its chunk to a small partial aggregate (habit count, completions,
+longest streak, sum of longest streaks and a histogram of longest streaks)
+and the parent process merges the partials. Workers only ever receive
+periodicities and serialized logs, never Habit objects, so little has to be
+pickled: unparsed logs are sent as the ISO strings read from disk.
+
+The pool only pays off when logs have to be parsed: raw records without
+stored metrics, habits loaded lazily from such files, and compact logs.
+Parsed habits, and records and lazily loaded habits with stored metrics,
+are answered from their metrics in the parent, and chunks made only of those
+never reach the pool, which is not even started when no chunk needs it.
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from analytics import get_habit_metrics
+from habit import EPOCH_ORDINAL, SECONDS_PER_DAY, CompactLogView, Habit
+from period import day_mapper
+
+# (habits, completions, longest streak, sum of longest streaks, histogram of longest streaks)
+Partial = Tuple[int, int, int, int, Counter]
+
+
+def _longest_run(periods: List[int]) -> int:
+    longest = run = 0
+    previous = None
+    for p in sorted(set(periods)):
+        run = run + 1 if previous is not None and p == previous + 1 else 1
+        longest = max(longest, run)
+        previous = p
+    return longest
+
+
+def _payload(item: Union[Habit, Dict]) -> tuple:
+    """
+    Turn a habit or a habits.json record into what a worker needs.
+
+    Returns ("metrics", completions, longest) when the answer is already known
+    here (a parsed habit, or a record or unparsed habit with stored metadata),
+    ("iso", periodicity, log) for other unparsed logs and ("seconds",
+    periodicity, array) for compact logs.
+    """
+    if isinstance(item, dict):
+        if item.get("completion_count") is not None and item.get("longest_streak") is not None:
+            return "metrics", item["completion_count"], item["longest_streak"]
+        return "iso", item["periodicity"], item.get("completion_log", [])
+    if not item.hydrated:
+        stored = item.stored_metrics()
+        if stored is not None:
+            return ("metrics",) + stored
+        return "iso", item.periodicity, item.serialized_log()
+    log = item.completion_log
+    if isinstance(log, CompactLogView):
+        return "seconds", item.periodicity, log.seconds
+    metrics = get_habit_metrics(item)  # Kept up to date incrementally, so no work to offload
+    return "metrics", metrics["completions"], metrics["longest_streak"]
+
+
+def _analyse_chunk(chunk: List[tuple]) -> Partial:
+    """
+    Reduce one chunk of payloads to a partial aggregate (runs in the workers).
+    """
+    completions = longest = streak_sum = 0
+    histogram = Counter()
+    for payload in chunk:
+        if payload[0] == "metrics":
+            count, streak = payload[1], payload[2]
+        else:
+            kind, periodicity, log = payload
+            if kind == "iso":
+                days = [date.fromisoformat(stamp[:10]).toordinal() for stamp in log]
+            else:
+                days = [seconds // SECONDS_PER_DAY + EPOCH_ORDINAL for seconds in log]
+            periods = list(map(day_mapper(periodicity), days))
+            count, streak = len(log), _longest_run(periods)
+        completions += count
+        longest = max(longest, streak)
+        streak_sum += streak
+        histogram[streak] += 1
+    return len(chunk), completions, longest, streak_sum, histogram
+
+
+def merge_partials(partials: Iterable[Partial]) -> Partial:
+    """
+    Combine partial aggregates (in any order) into one.
+    """
+    habits = completions = longest = streak_sum = 0
+    histogram = Counter()
+    for part in partials:
+        habits += part[0]
+        completions += part[1]
+        longest = max(longest, part[2])
+        streak_sum += part[3]
+        histogram.update(part[4])
+    return habits, completions, longest, streak_sum, histogram
+
+
+def _chunks(items: Iterable[Union[Habit, Dict]], chunk_size: int) -> Iterator[List[tuple]]:
+    it = iter(items)
+    while True:
+        chunk = [_payload(item) for item in islice(it, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunks(chunks: Iterator[List[tuple]], max_workers: int) -> Iterator[Partial]:
+    """
+    Analyse chunks in a process pool, keeping only a few chunks in flight at once.
+
+    Chunks whose answers are all known already are reduced here, and the pool
+    is only started for the first chunk with logs to analyse.
+    """
+    pool = None
+    pending = set()
+    try:
+        for chunk in chunks:
+            if all(payload[0] == "metrics" for payload in chunk):
+                yield _analyse_chunk(chunk)  # Just sums: cheaper than pickling it to a worker
+                continue
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=max_workers)
+            pending.add(pool.submit(_analyse_chunk, chunk))
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        yield from (future.result() for future in pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def parallel_streak_summary(items: Iterable[Union[Habit, Dict]], max_workers: Optional[int] = None,
+                            chunk_size: int = 2000) -> Dict:
+    """
+    Parallel version of analytics.get_streak_summary, with a few extra keys.
+
+    Keys:
+    - total_habits: total number of tracked habits
+    - longest_streak_overall: the highest single habit streak
+    - average_streak: mean of all longest streaks
+    - total_completions: number of logged completions
+    - streak_histogram: longest streak length -> number of habits
+
+    Args:
+        items (Iterable[Union[Habit, Dict]]): Habits, or raw habits.json records
+            (e.g. from habit_manager.iter_json_array); consumed lazily.
+        max_workers (Optional[int]): Number of worker processes (default: CPU
+            count). With 1, the chunks are analysed in this process, as are
+            chunks that only hold parsed habits or records and habits with
+            stored metrics.
+        chunk_size (int): Number of habits per task.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = _chunks(items, chunk_size)
+    partials = map(_analyse_chunk, chunks) if max_workers == 1 else _map_chunks(chunks, max_workers)
+    habits, completions, longest, streak_sum, histogram = merge_partials(partials)
+    return {
+        "total_habits": habits,
+        "longest_streak_overall": longest,
+        "average_streak": round(streak_sum / habits, 2) if habits else 0.0,
+        "total_completions": completions,
+        "streak_histogram": dict(sorted(histogram.items())),
+    }
@@ -0,0 +1,144 @@
+"""
+Period arithmetic shared by the streak, dedupe and storage code.
+
+Every periodicity maps a date to an integer period number where adjacent
+periods differ by exactly one, so "same period", "next period" and streaks
+are plain integer comparisons, correct across year boundaries and 53-week
+ISO years:
+
+- daily: the day's ordinal (date.toordinal())
+- weekly: the number of the ISO week (Monday to Sunday), counted from the week
+  of ordinal day 1, a Monday: (ordinal - 1) // 7
+- monthly: year * 12 + month - 1
+
+Everything is computed from the day ordinal. Months use a precomputed table
+of the ordinal of each month's first day, searched with bisect.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Callable, Dict, Tuple
+
+DAILY = "daily"
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+PERIODICITIES = (DAILY, WEEKLY, MONTHLY)
+
+# Years covered by the month table; months outside it are computed with date.fromordinal()
+_TABLE_YEARS = range(1900, 2201)
+_FIRST_MONTH = _TABLE_YEARS.start * 12
+_MONTH_STARTS = [date(year, month, 1).toordinal() for year in _TABLE_YEARS for month in range(1, 13)]
+_TABLE_END = date(_TABLE_YEARS.stop, 1, 1).toordinal()
+
+
+def week_of_day(day: int) -> int:
+    """
+    Return the ISO week number of a day ordinal (works on NumPy arrays too).
+    """
+    return (day - 1) // 7
+
+
+def month_of_day(day: int) -> int:
+    """
+    Return the month number (year * 12 + month - 1) of a day ordinal.
+    """
+    if _MONTH_STARTS[0] <= day < _TABLE_END:
+        return _FIRST_MONTH + bisect_right(_MONTH_STARTS, day) - 1
+    d = date.fromordinal(day)
+    return d.year * 12 + d.month - 1
+
+
+def _day_of_day(day: int) -> int:
+    return day
+
+
+# Periodicity -> function mapping a day ordinal to its period number
+DAY_TO_PERIOD: Dict[str, Callable[[int], int]] = {
+    DAILY: _day_of_day,
+    WEEKLY: week_of_day,
+    MONTHLY: month_of_day,
+}
+
+
+def _unknown(periodicity: str) -> ValueError:
+    return ValueError(f"Unknown periodicity {periodicity!r}.")
+
+
+def day_mapper(periodicity: str) -> Callable[[int], int]:
+    """
+    Return the function mapping day ordinals to period numbers, for use in loops.
+
+    Raises:
+        ValueError: If the periodicity is unknown.
+    """
+    try:
+        return DAY_TO_PERIOD[periodicity]
+    except KeyError:
+        raise _unknown(periodicity) from None
+
+
+def day_to_period(periodicity: str, day: int) -> int:
+    """
+    Map a day ordinal to its period number.
+
+    Raises:
+        ValueError: If the periodicity is unknown.
+    """
+    return day_mapper(periodicity)(day)
+
+
+def period_number(periodicity: str, date: datetime) -> int:
+    """
+    Map a date to an integer period where adjacent periods differ by exactly one.
+
+    Args:
+        periodicity (str): 'daily', 'weekly' or 'monthly'.
+        date (datetime): The date to map.
+
+    Returns:
+        int: The period number.
+
+    Raises:
+        ValueError: If the periodicity is unknown.
+    """
+    if periodicity == WEEKLY:
+        return (date.toordinal() - 1) // 7
+    if periodicity == DAILY:
+        return date.toordinal()
+    if periodicity == MONTHLY:
+        return date.year * 12 + date.month - 1
+    raise _unknown(periodicity)
+
+
+def period_start_day(periodicity: str, period: int) -> int:
+    """
+    Return the ordinal of the first day of a period number.
+
+    Raises:
+        ValueError: If the periodicity is unknown.
+    """
+    if periodicity == DAILY:
+        return period
+    if periodicity == WEEKLY:
+        return period * 7 + 1  # Ordinal 1 is a Monday
+    if periodicity == MONTHLY:
+        if 0 <= period - _FIRST_MONTH < len(_MONTH_STARTS):
+            return _MONTH_STARTS[period - _FIRST_MONTH]
+        year, month = divmod(period, 12)
+        return date(year, month + 1, 1).toordinal()
+    raise _unknown(periodicity)
+
+
+def period_start(periodicity: str, period: int) -> datetime:
+    """
+    Return midnight at the start of a period number.
+    """
+    return datetime.fromordinal(period_start_day(periodicity, period))
+
+
+def period_days(periodicity: str, date: datetime) -> Tuple[int, int]:
+    """
+    Return the [first, end) day ordinals of the period containing a date.
+    """
+    period = period_number(periodicity, date)
+    return period_start_day(periodicity, period), period_start_day(periodicity, period + 1)
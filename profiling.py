@@ -0,0 +1,222 @@
+"""
+Opt-in instrumentation of the hot paths (persistence, streaks, analytics, table rendering).
+
+Enabled for a CLI session with `--profile` or HABIT_PROFILE=1. The methods
+and functions listed in TARGETS are wrapped with timers that record every
+call's wall time in a latency histogram; when the process exits, call counts,
+totals and percentiles per operation are printed to stderr. Times are
+inclusive: save_to_file includes the merge_from_file it calls.
+
+With `--profile-out FILE` or HABIT_PROFILE_OUT=FILE the whole session also
+runs under cProfile and its stats are written to FILE for pstats/snakeviz.
+
+Nothing is wrapped unless profiling is enabled, so normal runs pay nothing.
+"""
+
+import atexit
+import importlib
+import sys
+import time
+from functools import wraps
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple
+
+ENV_VAR = "HABIT_PROFILE"
+PSTATS_ENV_VAR = "HABIT_PROFILE_OUT"
+
+# Module or "module.Class" -> names of the functions or methods to time
+TARGETS: Dict[str, List[str]] = {
+    "habit_manager.HabitManager": ["load_from_file", "save_to_file", "merge_from_file", "save_summary",
+                                   "checkpoint", "load_habits", "check_off_habit", "uncheck_habit",
+                                   "bulk_check_off", "period_status"],
+    "storage.JsonStorage": ["save", "record"],
+    "habit.Habit": ["get_current_streak", "get_longest_streak", "rebuild_index", "_hydrate",
+                    "add_completion", "remove_completion"],
+    "analytics": ["get_habit_metrics", "calculate_longest_streaks", "get_streak_summary",
+                  "get_completion_rate", "get_rolling_adherence", "get_streak_histogram",
+                  "get_weekday_distribution"],
+}
+
+
+class LatencyHistogram:
+    """
+    Call count, total and a power-of-two histogram of latencies in nanoseconds.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * 64  # Bucket i holds latencies in [2**(i-1), 2**i) ns
+
+    def add(self, ns: int):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[ns.bit_length()] += 1
+
+    def percentile(self, q: float) -> int:
+        """
+        Return an upper bound (in ns) for the q-th quantile (0 < q <= 1).
+        """
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(1 << i, self.max_ns)
+        return self.max_ns
+
+    def nonempty_buckets(self) -> List[Tuple[int, int]]:
+        """
+        Return (upper bound in ns, count) for every bucket with calls.
+        """
+        return [(1 << i, n) for i, n in enumerate(self.buckets) if n]
+
+
+def _format_ns(ns: int) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3g}{unit}"
+    return f"{ns}ns"
+
+
+class Profiler:
+    """
+    Wraps functions and methods with timers and collects their latency histograms.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, LatencyHistogram] = {}
+        self._patched: List[Tuple[object, str, Callable]] = []  # (owner, attribute, original)
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """
+        Return a wrapper of func that records each call's latency under `name`.
+        """
+        histogram = self.stats.setdefault(name, LatencyHistogram())
+        clock = time.perf_counter_ns
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.add(clock() - start)
+        wrapper.__wrapped_by_profiler__ = True
+        return wrapper
+
+    def instrument(self, owner, names: Iterable[str], label: str):
+        """
+        Replace owner.<name> (a module or class attribute) with a timed wrapper.
+
+        Module functions are also replaced in every loaded module that imported
+        them by name, e.g. `from analytics import get_habit_metrics`.
+        """
+        for name in names:
+            original = getattr(owner, name)
+            if getattr(original, "__wrapped_by_profiler__", False):
+                continue
+            wrapper = self.timed(f"{label}.{name}", original)
+            self._patch(owner, name, original, wrapper)
+            if not isinstance(owner, type):
+                for module in list(sys.modules.values()):
+                    if module is not owner and getattr(module, name, None) is original:
+                        self._patch(module, name, original, wrapper)
+
+    def _patch(self, owner, name: str, original: Callable, wrapper: Callable):
+        setattr(owner, name, wrapper)
+        self._patched.append((owner, name, original))
+
+    def install(self, targets: Optional[Dict[str, List[str]]] = None):
+        """
+        Instrument the hot paths (TARGETS by default).
+        """
+        for target, names in (targets or TARGETS).items():
+            module_name, _, class_name = target.partition(".")
+            owner = importlib.import_module(module_name)
+            if class_name:
+                owner = getattr(owner, class_name)
+            self.instrument(owner, names, class_name or module_name)
+
+    def uninstall(self):
+        """
+        Restore every wrapped function and method.
+        """
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def report(self, out: Optional[IO[str]] = None):
+        """
+        Print call counts, totals, percentiles and histograms, slowest total first.
+        """
+        out = out or sys.stderr
+        rows = sorted(((name, h) for name, h in self.stats.items() if h.count),
+                      key=lambda item: item[1].total_ns, reverse=True)
+        print("\nProfile (inclusive wall time per operation):", file=out)
+        if not rows:
+            print("  no instrumented calls", file=out)
+            return
+        width = max(len(name) for name, _ in rows)
+        print(f"  {'operation':<{width}} {'calls':>8} {'total':>9} {'mean':>9} {'p50':>9} "
+              f"{'p90':>9} {'p99':>9} {'max':>9}", file=out)
+        for name, h in rows:
+            print(f"  {name:<{width}} {h.count:>8} {_format_ns(h.total_ns):>9} "
+                  f"{_format_ns(h.total_ns // h.count):>9} {_format_ns(h.percentile(0.5)):>9} "
+                  f"{_format_ns(h.percentile(0.9)):>9} {_format_ns(h.percentile(0.99)):>9} "
+                  f"{_format_ns(h.max_ns):>9}", file=out)
+        print("\nLatency histograms (calls per bucket, by upper bound):", file=out)
+        for name, h in rows:
+            buckets = "  ".join(f"<{_format_ns(bound)}:{n}" for bound, n in h.nonempty_buckets())
+            print(f"  {name:<{width}} {buckets}", file=out)
+
+
+_active: Optional[Profiler] = None
+
+
+def active_profiler() -> Optional[Profiler]:
+    """
+    Return the profiler of this session, or None if profiling is off.
+    """
+    return _active
+
+
+def enable_profiling(pstats_file: Optional[str] = None, out: Optional[IO[str]] = None) -> Profiler:
+    """
+    Instrument the hot paths for the rest of the process and report at exit.
+
+    Args:
+        pstats_file (Optional[str]): Also run cProfile and dump its stats to this file at exit.
+        out (Optional[IO[str]]): Where to print the report (default: stderr).
+
+    Returns:
+        Profiler: The session's profiler (calling this again returns the same one).
+    """
+    global _active
+    if _active is not None:
+        return _active
+    _active = Profiler()
+    _active.install()
+
+    cprofile = None
+    if pstats_file:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    def finish():
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(pstats_file)
+        _active.report(out)
+        if cprofile is not None:
+            print(f"\ncProfile stats written to {pstats_file} (python -m pstats {pstats_file})",
+                  file=out or sys.stderr)
+
+    atexit.register(finish)
+    return _active
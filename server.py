@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import socket
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from commands import WRITE_COMMANDS, execute
+from habit_manager import HabitManager
+
+DEFAULT_SOCKET = "habits.sock"
+
+
+class HabitServer:
+    """
+    Long-running daemon that keeps one HabitManager in memory and serves
+    commands (see commands.py) over a Unix domain socket.
+
+    The protocol is one JSON object per line in both directions: a request
+    like {"command": "check", "name": "walk", "date": null} is answered with
+    {"ok": true, "columns": [...], "rows": [...]} or {"ok": false, "error": "..."}.
+
+    Reads are answered straight from memory. Writes go through a queue to a
+    single writer task, which applies everything queued so far, makes the
+    whole batch durable with one journal fsync and only then replies. Being
+    the only writer of habits.json, the server keeps concurrent clients from
+    overwriting each other's changes.
+    """
+
+    def __init__(self, filename: str = "habits.json", socket_path: str = DEFAULT_SOCKET,
+                 max_batch: int = 256):
+        """
+        Args:
+            filename (str): The JSON snapshot to serve.
+            socket_path (str): Path of the Unix socket to listen on.
+            max_batch (int): Maximum number of writes made durable together.
+        """
+        self.filename = filename
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.manager = HabitManager()
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """
+        Load the habits and start listening.
+
+        Raises:
+            RuntimeError: If another server already listens on the socket.
+        """
+        self._claim_socket()
+        with contextlib.redirect_stdout(sys.stderr):
+            self.manager.load_from_file(self.filename)
+        self.manager.open_journal(self.filename)
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+
+    async def serve_forever(self):
+        """
+        Start the server and serve until cancelled, then shut down cleanly.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stop accepting clients, finish queued writes and write a fresh snapshot.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+        self.manager.checkpoint()
+        self.manager.close_storage()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.socket_path)
+
+    def _claim_socket(self):
+        """
+        Remove a stale socket file, or refuse to start if a server is using it.
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self.socket_path)
+                return
+        raise RuntimeError(f"A server is already listening on {self.socket_path}.")
+
+    def _run(self, request: Dict) -> Dict:
+        try:
+            columns, rows = execute(self.manager, request)
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "columns": columns, "rows": rows}
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    command = request["command"]
+                except (ValueError, KeyError, TypeError):
+                    response = {"ok": False, "error": "Expected a JSON object with a 'command'."}
+                else:
+                    if command in WRITE_COMMANDS:
+                        future = asyncio.get_running_loop().create_future()
+                        await self._queue.put((request, future))
+                        response = await future
+                    else:
+                        response = self._run(request)
+                writer.write((json.dumps(response, default=lambda value: value.isoformat()) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _writer(self):
+        """
+        Apply queued writes in batches, each made durable with one fsync before replying.
+        """
+        while True:
+            batch: List[Tuple[Dict, asyncio.Future]] = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                with self.manager.batch():
+                    responses = [self._run(request) for request, _ in batch]
+                if any(response["ok"] for response in responses):
+                    self.manager.save_summary(self.filename)
+            except Exception as e:  # Storage failure: report it to every waiting client
+                responses = [{"ok": False, "error": f"Write failed: {e}"}] * len(batch)
+            for (_, future), response in zip(batch, responses):
+                if not future.cancelled():
+                    future.set_result(response)
+                self._queue.task_done()
+
+
+def serve(filename: str = "habits.json", socket_path: str = DEFAULT_SOCKET):
+    """
+    Run a server in the foreground until interrupted (Ctrl+C or SIGTERM).
+    """
+    server = HabitServer(filename, socket_path)
+
+    async def run():
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await server.serve_forever()
+
+    with contextlib.suppress(KeyboardInterrupt, asyncio.CancelledError):
+        asyncio.run(run())
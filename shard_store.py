@@ -0,0 +1,283 @@
+"""
+Multi-tenant habit storage: one JSON snapshot (and HabitManager) per user.
+
+Users' files live in one directory, optionally spread over hash-partitioned
+subdirectories so no single directory grows huge. Only the managers of users
+a request touches are loaded; they are kept in an LRU cache bounded by the
+number of open managers and by their estimated memory, and evicted managers
+are written back to disk if they changed.
+
+Analytics across users fan out over a process pool, one user file per task,
+so they use all cores and never load every user into this process.
+"""
+
+import contextlib
+import io
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from analytics import get_habit_metrics
+from commands import get_streak_summary
+from habit_manager import HabitManager
+
+# Rough bytes held per loaded habit and per completion (see benchmarks/bench_memory.py)
+HABIT_BYTES = 700
+COMPLETION_BYTES = 136
+COMPACT_COMPLETION_BYTES = 10
+
+_USER_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*\Z")
+
+
+def estimate_size(manager: HabitManager) -> int:
+    """
+    Estimate the bytes a loaded manager holds, without parsing unparsed logs.
+    """
+    per_completion = COMPACT_COMPLETION_BYTES if manager.compact else COMPLETION_BYTES
+    return sum(HABIT_BYTES + per_completion * h.get_completion_count() for h in manager.habits)
+
+
+def _fingerprint(manager: HabitManager) -> Tuple[int, Tuple[Tuple[str, int], ...]]:
+    # Version counters only grow: adding, removing or replacing a habit bumps the
+    # manager's, and log changes bump the habit's. Compared as a whole, not summed,
+    # since a removal can raise one counter by as much as it drops the sum of the others
+    return manager.version, tuple((h.name, h.version) for h in manager.habits)
+
+
+def _load(path: str, compact: bool) -> HabitManager:
+    manager = HabitManager(compact=compact)
+    if os.path.exists(path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.load_from_file(path)
+    return manager
+
+
+def _run_on_file(func: Callable[[HabitManager], object], path: str, compact: bool):
+    # Process pool task: load one user's file in the worker and analyse it there
+    return func(_load(path, compact))
+
+
+def user_summary(manager: HabitManager) -> Dict:
+    """
+    Return the streak summary (see commands.get_streak_summary) of one user's habits.
+    """
+    return get_streak_summary(manager.habits)
+
+
+def _streak_totals(manager: HabitManager) -> Tuple[int, int, int, int]:
+    # Partial aggregate of one user: habits, completions, longest streak, sum of longest streaks
+    streaks = [get_habit_metrics(h)["longest_streak"] for h in manager.habits]
+    completions = sum(h.get_completion_count() for h in manager.habits)
+    return len(streaks), completions, max(streaks, default=0), sum(streaks)
+
+
+class _Entry:
+    __slots__ = ("manager", "size", "fingerprint", "pins")
+
+    def __init__(self, manager: HabitManager):
+        self.manager = manager
+        self.size = estimate_size(manager)
+        self.fingerprint = _fingerprint(manager)
+        self.pins = 0
+
+
+class ShardedHabitStore:
+    """
+    Per-user habit files with an LRU cache of loaded HabitManagers.
+
+    Use open() to work with a user's habits:
+
+        with store.open("alice") as manager:
+            manager.check_off_habit("walk")
+
+    A manager stays cached after its block ends and is written back (with
+    HabitManager.save_to_file, which locks and merges) when it is evicted,
+    on flush() and on close(). Managers inside an open() block are never
+    evicted, so the cache may exceed its limits while many users are open.
+    The store is thread-safe; several processes may share a directory, since
+    every write-back merges with the file's current content.
+    """
+
+    def __init__(self, directory: str, partitions: int = 0, max_open: int = 128,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024, compact: bool = False):
+        """
+        Args:
+            directory (str): Directory holding the user files (created if missing).
+            partitions (int): Number of hash-partitioned subdirectories, or 0 to
+                keep all user files directly in `directory`.
+            max_open (int): Maximum number of cached managers.
+            max_bytes (Optional[int]): Maximum estimated memory of the cached
+                managers (see estimate_size()), or None for no limit.
+            compact (bool): Load habits with compact (array-backed) completion logs.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.partitions = partitions
+        self.max_open = max_open
+        self.max_bytes = max_bytes
+        self.compact = compact
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        self.loads = 0  # Number of user files read so far
+        self.write_backs = 0  # Number of user files written so far
+
+    def path_for(self, user: str) -> str:
+        """
+        Return the JSON snapshot holding a user's habits.
+
+        Raises:
+            ValueError: If the user id is not usable as a file name.
+        """
+        if not _USER_ID.match(user):
+            raise ValueError(f"Invalid user id {user!r}.")
+        if not self.partitions:
+            return os.path.join(self.directory, user + ".json")
+        shard = zlib.crc32(user.encode()) % self.partitions
+        return os.path.join(self.directory, f"{shard:03d}", user + ".json")
+
+    def users(self) -> List[str]:
+        """
+        Return every user with a file in the store or a cached manager, sorted.
+        """
+        found = set()
+        if self.partitions:
+            dirs = [os.path.join(self.directory, f"{s:03d}") for s in range(self.partitions)]
+        else:
+            dirs = [self.directory]
+        for d in dirs:
+            with contextlib.suppress(FileNotFoundError):
+                found.update(f[:-len(".json")] for f in os.listdir(d) if f.endswith(".json"))
+        with self._lock:
+            found.update(self._cache)
+        return sorted(found)
+
+    def __len__(self) -> int:
+        """Return the number of cached managers."""
+        return len(self._cache)
+
+    @property
+    def cached_bytes(self) -> int:
+        """Estimated memory of the cached managers, as of their last use."""
+        return self._cached_bytes
+
+    @contextlib.contextmanager
+    def open(self, user: str) -> Iterator[HabitManager]:
+        """
+        Load (or reuse) a user's manager and keep it cached while the block runs.
+
+        Users without a file start with an empty manager; its file is written
+        when the manager is written back with changes.
+        """
+        with self._lock:
+            entry = self._cache.get(user)
+            if entry is None:
+                entry = _Entry(_load(self.path_for(user), self.compact))
+                self.loads += 1
+                self._cache[user] = entry
+                self._cached_bytes += entry.size
+            else:
+                self._cache.move_to_end(user)
+            entry.pins += 1
+        try:
+            yield entry.manager
+        finally:
+            with self._lock:
+                entry.pins -= 1
+                size = estimate_size(entry.manager)
+                self._cached_bytes += size - entry.size
+                entry.size = size
+                self._evict()
+
+    def _over_limit(self) -> bool:
+        return (len(self._cache) > self.max_open
+                or (self.max_bytes is not None and self._cached_bytes > self.max_bytes))
+
+    def _evict(self):
+        """
+        Drop least recently used, unpinned managers until the cache fits its limits.
+        """
+        for user in list(self._cache):
+            if not self._over_limit():
+                break
+            entry = self._cache[user]
+            if entry.pins:
+                continue
+            self._write_back(user, entry)
+            del self._cache[user]
+            self._cached_bytes -= entry.size
+
+    def _write_back(self, user: str, entry: _Entry):
+        fingerprint = _fingerprint(entry.manager)
+        if fingerprint == entry.fingerprint:
+            return
+        path = self.path_for(user)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry.manager.save_to_file(path)
+        entry.fingerprint = _fingerprint(entry.manager)  # The merge may have changed it again
+        self.write_backs += 1
+
+    def flush(self):
+        """
+        Write every changed cached manager back to its file (keeping it cached).
+        """
+        with self._lock:
+            for user, entry in self._cache.items():
+                self._write_back(user, entry)
+
+    def close(self):
+        """
+        Write back all changes and empty the cache.
+        """
+        with self._lock:
+            self.flush()
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    def map_users(self, func: Callable[[HabitManager], object], users: Optional[Iterable[str]] = None,
+                  max_workers: Optional[int] = None, chunksize: int = 16) -> Dict[str, object]:
+        """
+        Run func on every user's habits in a process pool and collect the results.
+
+        Cached changes are flushed first so the workers see them. Each worker
+        loads the user files it is given, so func must be a picklable,
+        module-level function taking a HabitManager.
+
+        Args:
+            func (Callable[[HabitManager], object]): The per-user analysis, e.g. user_summary.
+            users (Optional[Iterable[str]]): The users to analyse (default: all).
+            max_workers (Optional[int]): Number of processes (default: CPU count).
+            chunksize (int): Number of users sent to a worker at once.
+
+        Returns:
+            Dict[str, object]: Each user's result.
+        """
+        users = self.users() if users is None else list(users)
+        self.flush()
+        paths = [self.path_for(u) for u in users]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(_run_on_file, [func] * len(paths), paths,
+                               [self.compact] * len(paths), chunksize=chunksize)
+            return dict(zip(users, results))
+
+    def summary(self, max_workers: Optional[int] = None) -> Dict:
+        """
+        Combine every user's streak summary into totals across the store.
+
+        Returns:
+            Dict: users, total_habits, total_completions, longest_streak and
+            average_streak (the mean longest streak over all habits).
+        """
+        totals = list(self.map_users(_streak_totals, max_workers=max_workers).values())
+        total_habits = sum(t[0] for t in totals)
+        return {
+            "users": len(totals),
+            "total_habits": total_habits,
+            "total_completions": sum(t[1] for t in totals),
+            "longest_streak": max((t[2] for t in totals), default=0),
+            "average_streak": round(sum(t[3] for t in totals) / total_habits, 2) if total_habits else 0,
+        }
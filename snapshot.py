@@ -0,0 +1,264 @@
+"""
+Binary snapshot format, an alternative to habits.json (see HabitManager.save_to_file).
+
+Layout (little-endian):
+
+    header       magic b"HTRK", format version (u16), reserved (u16), habit count (u32)
+    habit table  one entry per habit (see _ENTRY) followed by the UTF-8 name
+    data         one block per habit with its completion log
+
+Each log block stores the sorted timestamps as columns of unsigned LEB128
+varints: the day ordinals as deltas (the first day is kept in the table),
+then the seconds of the day and the microseconds. When every entry of a habit
+shares the same time of day, the time columns collapse into a single value.
+A daily habit checked off at the same time every day therefore takes one byte
+per completion, against about 40 in habits.json.
+
+Readers map the file with mmap and only decode the habit table; a habit's log
+is decoded when the habit is first used (see EncodedLog and Habit.set_raw_log).
+"""
+
+import mmap
+import os
+import struct
+from datetime import datetime, time, timedelta
+from itertools import accumulate, repeat
+from operator import add, sub
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from habit import EPOCH, EPOCH_ORDINAL, SECONDS_PER_DAY, CompactLogView, Habit
+from period import PERIODICITIES
+
+MAGIC = b"HTRK"
+FORMAT_VERSION = 1
+BINARY_SUFFIX = ".bin"  # Snapshots with this suffix are saved in the binary format
+
+_HEADER = struct.Struct("<4sHHI")
+# name length, periodicity, log flags, created_at (µs), completion count, longest streak,
+# last completion (µs or _NO_DATE), first day ordinal, data offset, data length
+_ENTRY = struct.Struct("<HBBqIIqIQI")
+_NO_DATE = -(1 << 63)
+_PERIODICITIES = PERIODICITIES  # Stored by index; new periodicities are only ever appended
+
+# Log flags
+_SAME_TIME = 1  # All entries share one time of day, stored once
+_MICROSECONDS = 2  # Entries have a microseconds column (only without _SAME_TIME)
+
+
+def is_binary_snapshot(filename: str) -> bool:
+    """
+    Return True if the file starts with the binary snapshot magic.
+    """
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def _to_micros(date: datetime) -> int:
+    return (date - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(micros: int) -> datetime:
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def _write_varints(values: List[int], out: bytearray):
+    if not values or max(values) < 0x80:
+        out += bytes(values)  # Common case: every value fits in one byte
+        return
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def _read_varints(buf, pos: int, count: int) -> Tuple[List[int], int]:
+    chunk = buf[pos:pos + count]
+    if len(chunk) == count and (not count or max(chunk) < 0x80):
+        return list(chunk), pos + count
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(value)
+    return values, pos
+
+
+class EncodedLog:
+    """
+    A habit's completion log still encoded in a mapped snapshot, decoded on demand.
+    """
+
+    __slots__ = ("_buf", "_offset", "_length", "_count", "_first_day", "_flags")
+
+    def __init__(self, buf, offset: int, length: int, count: int, first_day: int, flags: int):
+        self._buf = buf
+        self._offset = offset
+        self._length = length
+        self._count = count
+        self._first_day = first_day
+        self._flags = flags
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EncodedLog):
+            return NotImplemented
+        return (self._count, self._first_day, self._flags, self.data) == \
+               (other._count, other._first_day, other._flags, other.data)
+
+    @property
+    def data(self) -> bytes:
+        """
+        The encoded block, copied out of the mapped file.
+        """
+        return self._buf[self._offset:self._offset + self._length]
+
+    def datetimes(self) -> Iterator[datetime]:
+        """
+        Decode the log as datetimes, oldest first.
+        """
+        count = self._count
+        if not count:
+            return iter(())
+        buf = self._buf
+        deltas, pos = _read_varints(buf, self._offset, count - 1)
+        dates = map(datetime.fromordinal, accumulate(deltas, initial=self._first_day))
+        if self._flags & _SAME_TIME:
+            (seconds, micros), _ = _read_varints(buf, pos, 2)
+            return map(add, dates, repeat(timedelta(0, seconds, micros)))
+        seconds, pos = _read_varints(buf, pos, count)
+        if self._flags & _MICROSECONDS:
+            micros, _ = _read_varints(buf, pos, count)
+        else:
+            micros = [0] * count
+        return (date + timedelta(0, second, micro) for date, second, micro in zip(dates, seconds, micros))
+
+
+def _time_seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def encode_log(habit: Habit) -> Tuple[bytes, int, int]:
+    """
+    Encode a habit's completion log.
+
+    Returns:
+        Tuple[bytes, int, int]: The data block, the first day ordinal and the log flags.
+    """
+    raw_log = habit.raw_log
+    if isinstance(raw_log, EncodedLog):  # Loaded from a binary snapshot and never parsed: copy it
+        return raw_log.data, raw_log._first_day, raw_log._flags
+
+    log = habit.completion_log
+    if isinstance(log, CompactLogView):
+        days = [s // SECONDS_PER_DAY + EPOCH_ORDINAL for s in log.seconds]
+        seconds = [s % SECONDS_PER_DAY for s in log.seconds]
+        micros = [0] * len(days)
+    else:
+        days = list(map(datetime.toordinal, log))
+        times = list(map(datetime.time, log))
+        if times and times.count(times[0]) == len(times):
+            seconds, micros = [_time_seconds(times[0])], [times[0].microsecond]  # Same time everywhere
+        else:
+            seconds = list(map(_time_seconds, times))
+            micros = [t.microsecond for t in times]
+    if not days:
+        return b"", 0, 0
+
+    out = bytearray()
+    _write_varints(list(map(sub, days[1:], days)), out)
+    if seconds.count(seconds[0]) == len(seconds) and micros.count(micros[0]) == len(micros):
+        _write_varints([seconds[0], micros[0]], out)
+        return bytes(out), days[0], _SAME_TIME
+    _write_varints(seconds, out)
+    if any(micros):
+        _write_varints(micros, out)
+        return bytes(out), days[0], _MICROSECONDS
+    return bytes(out), days[0], 0
+
+
+def write_snapshot(filename: str, habits: Iterable[Habit], rows: List[Dict]):
+    """
+    Write habits to a binary snapshot.
+
+    Args:
+        filename (str): The file to write (replaced if it exists).
+        habits (Iterable[Habit]): The habits, in order.
+        rows (List[Dict]): Per habit, its completions, longest_streak and
+            last_done (ISO timestamp or None), as HabitManager._summary_rows() returns them.
+    """
+    entries, blocks = [], []
+    table_size = 0
+    for habit, row in zip(habits, rows):
+        name = habit.name.encode()
+        data, first_day, flags = encode_log(habit)
+        last_done = _to_micros(datetime.fromisoformat(row["last_done"])) if row["last_done"] else _NO_DATE
+        entries.append((name, _PERIODICITIES.index(habit.periodicity), flags, _to_micros(habit.created_at),
+                        row["completions"], row["longest_streak"], last_done, first_day, len(data)))
+        blocks.append(data)
+        table_size += _ENTRY.size + len(name)
+
+    offset = _HEADER.size + table_size
+    with open(filename, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries)))
+        for name, periodicity, flags, created, count, longest, last_done, first_day, length in entries:
+            f.write(_ENTRY.pack(len(name), periodicity, flags, created, count, longest,
+                                last_done, first_day, offset, length))
+            f.write(name)
+            offset += length
+        for data in blocks:
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def iter_snapshot_habits(filename: str, compact: bool = False, lazy: bool = True) -> Iterator[Habit]:
+    """
+    Stream habits from a binary snapshot.
+
+    The file is memory-mapped and only the habit table is read up front.
+
+    Args:
+        filename (str): The snapshot to read.
+        compact (bool): Create habits with compact completion logs.
+        lazy (bool): Keep each log encoded until first needed (see Habit.set_raw_log).
+
+    Raises:
+        ValueError: If the file is not a binary snapshot or has an unknown version.
+    """
+    with open(filename, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _, count = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{filename} is not a binary habit snapshot.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {filename}.")
+
+    pos = _HEADER.size
+    for _ in range(count):
+        (name_len, periodicity, flags, created, completions, longest, last_done,
+         first_day, offset, length) = _ENTRY.unpack_from(buf, pos)
+        pos += _ENTRY.size
+        name = buf[pos:pos + name_len].decode()
+        pos += name_len
+
+        habit = Habit(name, _PERIODICITIES[periodicity], compact=compact)
+        habit.created_at = _from_micros(created)
+        log = EncodedLog(buf, offset, length, completions, first_day, flags)
+        if lazy:
+            last = _from_micros(last_done).isoformat() if last_done != _NO_DATE else None
+            habit.set_raw_log(log, completions, last, longest)
+        else:
+            habit.completion_log = log.datetimes()
+        yield habit
@@ -0,0 +1,246 @@
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from habit import Habit
+from period import period_number
+from habit_manager import HabitManager
+from storage import HabitStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS habits (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    periodicity TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completions (
+    habit_id INTEGER NOT NULL REFERENCES habits(id),
+    period_key INTEGER NOT NULL,
+    completed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_habit_period ON completions (habit_id, period_key);
+"""
+
+# Gaps-and-islands: within one habit, consecutive period keys share the same
+# (period_key - row_number) value, so each group is one streak.
+LONGEST_STREAKS_SQL = """
+WITH periods AS (
+    SELECT DISTINCT habit_id, period_key FROM completions
+),
+islands AS (
+    SELECT habit_id,
+           period_key - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period_key) AS island
+    FROM periods
+),
+streaks AS (
+    SELECT habit_id, COUNT(*) AS length FROM islands GROUP BY habit_id, island
+)
+SELECT h.name, COALESCE(MAX(s.length), 0)
+FROM habits h LEFT JOIN streaks s ON s.habit_id = h.id
+GROUP BY h.id
+ORDER BY h.id
+"""
+
+# The streak still alive at the session's period: the last island of the
+# periods up to it, if it reaches the period or the one before
+CURRENT_STREAKS_SQL = """
+WITH periods AS (
+    SELECT DISTINCT c.habit_id, c.period_key,
+           CASE h.periodicity WHEN 'weekly' THEN :week WHEN 'monthly' THEN :month ELSE :day END AS ref
+    FROM completions c JOIN habits h ON h.id = c.habit_id
+    WHERE c.period_key <= CASE h.periodicity WHEN 'weekly' THEN :week WHEN 'monthly' THEN :month ELSE :day END
+),
+islands AS (
+    SELECT habit_id, ref, period_key,
+           period_key - ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY period_key) AS island
+    FROM periods
+),
+streaks AS (
+    SELECT habit_id, MAX(ref) AS ref, MAX(period_key) AS last, COUNT(*) AS length
+    FROM islands GROUP BY habit_id, island
+)
+SELECT h.name, COALESCE(MAX(CASE WHEN s.last >= s.ref - 1 THEN s.length END), 0)
+FROM habits h LEFT JOIN streaks s ON s.habit_id = h.id
+GROUP BY h.id
+ORDER BY h.id
+"""
+
+IS_CHECKED_SQL = """
+SELECT EXISTS (
+    SELECT 1 FROM completions c
+    WHERE c.habit_id = h.id
+      AND c.period_key = CASE h.periodicity WHEN 'weekly' THEN :week WHEN 'monthly' THEN :month ELSE :day END
+)
+FROM habits h
+WHERE h.name = :name
+"""
+
+MISSED_SQL = """
+SELECT h.name, h.periodicity
+FROM habits h
+WHERE NOT EXISTS (
+    SELECT 1 FROM completions c
+    WHERE c.habit_id = h.id
+      AND c.period_key = CASE h.periodicity WHEN 'weekly' THEN :week WHEN 'monthly' THEN :month ELSE :day END
+)
+ORDER BY h.id
+"""
+
+
+class SqliteStorage(HabitStorage):
+    """
+    Stores habits in a SQLite database with one row per habit and per completion.
+
+    Each completion carries its period key (see period.period_number), indexed
+    together with the habit id, so "is this period checked" and streak queries
+    run in SQL without loading every Habit into memory.
+    """
+
+    def __init__(self, path: str = "habits.db"):
+        """
+        Args:
+            path (str): Path of the database file.
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def load(self, manager):
+        habits: Dict[int, Habit] = {}
+        for habit_id, name, periodicity, created_at in self.conn.execute(
+                "SELECT id, name, periodicity, created_at FROM habits ORDER BY id"):
+            habit = Habit(name, periodicity, compact=manager.compact)
+            habit.created_at = datetime.fromisoformat(created_at)
+            habits[habit_id] = habit
+
+        logs: Dict[int, List[datetime]] = {habit_id: [] for habit_id in habits}
+        for habit_id, completed_at in self.conn.execute(
+                "SELECT habit_id, completed_at FROM completions ORDER BY habit_id, completed_at"):
+            logs[habit_id].append(datetime.fromisoformat(completed_at))
+
+        for habit_id, habit in habits.items():
+            habit.completion_log = logs[habit_id]
+        manager.load_habits(habits.values())
+
+    def save(self, manager):
+        with self.conn:
+            self.conn.execute("DELETE FROM completions")
+            self.conn.execute("DELETE FROM habits")
+            for habit in manager.habits:
+                self._insert_habit(habit.name, habit.periodicity, habit.created_at,
+                                   habit.completion_log)
+
+    def record(self, op: str, **fields):
+        name = fields["name"]
+        with self.conn:
+            if op == "add":
+                self._insert_habit(name, fields["periodicity"],
+                                   datetime.fromisoformat(fields["created_at"]),
+                                   [datetime.fromisoformat(dt) for dt in fields.get("completion_log", [])])
+                return
+
+            row = self.conn.execute("SELECT id, periodicity FROM habits WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return
+            habit_id, periodicity = row
+            if op == "remove":
+                self.conn.execute("DELETE FROM completions WHERE habit_id = ?", (habit_id,))
+                self.conn.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
+            elif op == "check":
+                date = datetime.fromisoformat(fields["date"])
+                self.conn.execute("INSERT INTO completions (habit_id, period_key, completed_at) VALUES (?, ?, ?)",
+                                  (habit_id, period_number(periodicity, date), date.isoformat()))
+            elif op == "uncheck":
+                date = datetime.fromisoformat(fields["date"])
+                self.conn.execute("DELETE FROM completions WHERE habit_id = ? AND period_key = ?",
+                                  (habit_id, period_number(periodicity, date)))
+
+    def close(self):
+        self.conn.close()
+
+    def _insert_habit(self, name: str, periodicity: str, created_at: datetime, completion_log):
+        cursor = self.conn.execute(
+            "INSERT INTO habits (name, periodicity, created_at) VALUES (?, ?, ?)",
+            (name, periodicity, created_at.isoformat()))
+        habit_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO completions (habit_id, period_key, completed_at) VALUES (?, ?, ?)",
+            ((habit_id, period_number(periodicity, dt), dt.isoformat()) for dt in completion_log))
+
+    def habit_count(self) -> int:
+        """
+        Return the number of stored habits.
+        """
+        return self.conn.execute("SELECT COUNT(*) FROM habits").fetchone()[0]
+
+    def list_habits(self) -> List[Tuple[str, str]]:
+        """
+        Return (name, periodicity) of every habit, in insertion order.
+        """
+        return self.conn.execute("SELECT name, periodicity FROM habits ORDER BY id").fetchall()
+
+    @staticmethod
+    def _period_params(session_date: datetime) -> Dict[str, int]:
+        """
+        Return the period keys of the date for every periodicity, as query parameters.
+        """
+        return {"day": period_number("daily", session_date), "week": period_number("weekly", session_date),
+                "month": period_number("monthly", session_date)}
+
+    def is_checked(self, name: str, session_date: datetime) -> Optional[bool]:
+        """
+        Check whether a habit is checked off in the period of the date, with one indexed lookup.
+
+        Returns:
+            Optional[bool]: The check status, or None if no habit has that name.
+        """
+        row = self.conn.execute(IS_CHECKED_SQL, {"name": name, **self._period_params(session_date)}).fetchone()
+        return None if row is None else bool(row[0])
+
+    def missed_habits(self, session_date: datetime) -> List[Tuple[str, str]]:
+        """
+        Return (name, periodicity) of every habit not checked off in the period of the date.
+
+        Args:
+            session_date (datetime): The date whose day/week is inspected.
+        """
+        return self.conn.execute(MISSED_SQL, self._period_params(session_date)).fetchall()
+
+    def longest_streaks(self) -> Dict[str, int]:
+        """
+        Return the longest streak of every habit, computed in SQL.
+        """
+        return dict(self.conn.execute(LONGEST_STREAKS_SQL).fetchall())
+
+    def current_streaks(self, session_date: datetime) -> Dict[str, int]:
+        """
+        Return the current streak of every habit at the date, computed in SQL.
+
+        Matches Habit.get_current_streak(): a streak is current if it includes
+        the period of the date or ends in the period right before it.
+        """
+        return dict(self.conn.execute(CURRENT_STREAKS_SQL, self._period_params(session_date)).fetchall())
+
+
+def migrate_json_to_sqlite(json_file: str = "habits.json", db_file: str = "habits.db") -> int:
+    """
+    Copy every habit of a JSON snapshot (and its journal) into a SQLite database.
+
+    Existing rows in the database are replaced.
+
+    Args:
+        json_file (str): The JSON snapshot to read.
+        db_file (str): The database to write.
+
+    Returns:
+        int: The number of migrated habits.
+    """
+    manager = HabitManager()
+    manager.load_from_file(json_file)
+    storage = SqliteStorage(db_file)
+    try:
+        storage.save(manager)
+    finally:
+        storage.close()
+    return len(manager)
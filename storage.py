@@ -0,0 +1,115 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+
+from journal import Journal
+from locking import file_lock
+
+
+class HabitStorage(ABC):
+    """
+    Interface for the persistence backend attached to a HabitManager.
+
+    The manager calls record() once for every change made through it
+    ('add', 'remove', 'check', 'uncheck', with the same fields as journal
+    records) and checkpoint() when the session ends.
+    """
+
+    def attach(self, manager):
+        """
+        Called by HabitManager.attach_storage(). Defaults to a no-op.
+        """
+
+    @abstractmethod
+    def load(self, manager):
+        """
+        Fill the manager with the stored habits.
+        """
+
+    @abstractmethod
+    def save(self, manager):
+        """
+        Replace the stored data with the manager's full state.
+        """
+
+    @abstractmethod
+    def record(self, op: str, **fields):
+        """
+        Persist a single change.
+
+        Args:
+            op (str): 'add', 'remove', 'check' or 'uncheck'.
+            **fields: The change's fields (name, periodicity, created_at, completion_log, date).
+        """
+
+    def batch(self):
+        """
+        Context manager grouping the records written inside it into one durable write.
+        Defaults to writing every record on its own.
+        """
+        return nullcontext()
+
+    def checkpoint(self, manager):
+        """
+        Bring the storage into a compact, fully written state. Defaults to a no-op.
+        """
+
+    def close(self):
+        """
+        Release open files or connections. Defaults to a no-op.
+        """
+
+
+class JsonStorage(HabitStorage):
+    """
+    JSON snapshot (habits.json) plus an append-only journal of changes since the snapshot.
+    """
+
+    def __init__(self, filename: str = "habits.json", compact_every: int = 1000):
+        """
+        Args:
+            filename (str): The JSON snapshot file.
+            compact_every (int): Number of journal records between automatic compactions.
+        """
+        self.filename = filename
+        self.journal = Journal(Journal.path_for(filename), compact_every)
+        self._manager = None  # Manager to snapshot when the journal is full
+
+    def attach(self, manager):
+        self._manager = manager
+
+    def load(self, manager):
+        manager.load_from_file(self.filename)
+
+    def save(self, manager):
+        """
+        Write a fresh snapshot (merged with other sessions' changes) and truncate the journal.
+
+        The snapshot is written to a temporary file and renamed into place, so a
+        crash leaves either the old snapshot plus journal or the new snapshot.
+        """
+        with file_lock(self.filename):
+            manager.save_to_file(self.filename)
+            self.journal.reset()
+
+    def record(self, op: str, **fields):
+        with file_lock(self.filename):  # Never append while another session compacts
+            self.journal.append(op, **fields)
+        if not self.journal.in_batch:  # Inside a batch, compaction waits until the batch is synced
+            self._compact_if_needed()
+
+    @contextmanager
+    def batch(self):
+        with self.journal.batch() as journal:
+            yield journal
+        if not self.journal.in_batch:
+            self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self._manager is not None and self.journal.needs_compaction():
+            self.save(self._manager)
+
+    def checkpoint(self, manager):
+        self.save(manager)
+
+    def close(self):
+        self.journal.close()
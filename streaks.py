@@ -0,0 +1,192 @@
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+class StreakEngine:
+    """
+    Keeps the completed periods of a habit as run-length segments of consecutive period numbers.
+
+    Period numbers are integers where adjacent periods differ by exactly one
+    (see Habit.period_number). Adding or removing a period locates its segment
+    with an O(log n) bisect; inserting or deleting a segment shifts the segment
+    lists, O(n) in the worst case (a memmove, cheap for the segment counts
+    habits have). Extending or shrinking an existing segment is O(log n), and
+    the longest streak is an O(1) read.
+    """
+
+    __slots__ = ("_starts", "_ends", "_lengths", "_longest")
+
+    def __init__(self, periods: Iterable[int] = ()):
+        """
+        Build the segments from any iterable of period numbers (duplicates and any order allowed).
+
+        Args:
+            periods (Iterable[int]): Completed period numbers.
+        """
+        self._starts: List[int] = []  # First period of each segment, ascending
+        self._ends: List[int] = []  # Last period of each segment (inclusive)
+        self._lengths: Counter = Counter()  # Segment length -> number of segments with that length
+        self._longest = 0
+
+        for period in sorted(set(periods)):
+            if self._ends and self._ends[-1] == period - 1:
+                self._ends[-1] = period
+            else:
+                self._starts.append(period)
+                self._ends.append(period)
+        for start, end in zip(self._starts, self._ends):
+            self._lengths[end - start + 1] += 1
+        self._longest = max(self._lengths, default=0)
+
+    def __contains__(self, period: int) -> bool:
+        i = bisect_right(self._starts, period) - 1
+        return i >= 0 and self._ends[i] >= period
+
+    def __len__(self) -> int:
+        """
+        Return the number of segments (separate streaks).
+        """
+        return len(self._starts)
+
+    @property
+    def longest(self) -> int:
+        """
+        Length of the longest streak.
+        """
+        return self._longest
+
+    def segments(self) -> List[Tuple[int, int]]:
+        """
+        Return all segments as (first period, last period) pairs in ascending order.
+        """
+        return list(zip(self._starts, self._ends))
+
+    def length_histogram(self) -> Dict[int, int]:
+        """
+        Return a mapping of streak length to the number of streaks with that length.
+        """
+        return dict(self._lengths)
+
+    def count_between(self, first: int, last: int) -> int:
+        """
+        Return the number of completed periods from `first` to `last` (inclusive).
+
+        Only the segments overlapping the range are visited, so the cost
+        depends on the range, not on the length of the history.
+        """
+        total = 0
+        i = max(bisect_right(self._starts, first) - 1, 0)
+        while i < len(self._starts) and self._starts[i] <= last:
+            total += max(min(self._ends[i], last) - max(self._starts[i], first) + 1, 0)
+            i += 1
+        return total
+
+    def current(self, period: int) -> int:
+        """
+        Return the length of the streak that is still alive at the given period.
+
+        A streak is alive if it covers the given period, or ends in the period
+        right before it (the current period can still be completed).
+
+        Args:
+            period (int): The reference period number.
+
+        Returns:
+            int: The streak length, or 0 if no streak is alive.
+        """
+        if not self._starts:
+            return 0
+        # Fast path: the reference period is at or after the latest segment
+        i = len(self._starts) - 1
+        if self._starts[i] > period:
+            i = bisect_right(self._starts, period) - 1
+            if i < 0:
+                return 0
+        if self._ends[i] >= period - 1:
+            return min(self._ends[i], period) - self._starts[i] + 1
+        return 0
+
+    def add(self, period: int) -> bool:
+        """
+        Add a completed period, merging with neighbouring segments.
+
+        Args:
+            period (int): The period number to add.
+
+        Returns:
+            bool: False if the period was already present, else True.
+        """
+        i = bisect_right(self._starts, period) - 1
+        if i >= 0 and self._ends[i] >= period:
+            return False
+
+        joins_left = i >= 0 and self._ends[i] == period - 1
+        joins_right = i + 1 < len(self._starts) and self._starts[i + 1] == period + 1
+
+        if joins_left and joins_right:
+            self._drop_length(self._ends[i] - self._starts[i] + 1)
+            self._drop_length(self._ends[i + 1] - self._starts[i + 1] + 1)
+            self._ends[i] = self._ends[i + 1]
+            del self._starts[i + 1]
+            del self._ends[i + 1]
+            self._add_length(self._ends[i] - self._starts[i] + 1)
+        elif joins_left:
+            self._drop_length(self._ends[i] - self._starts[i] + 1)
+            self._ends[i] = period
+            self._add_length(self._ends[i] - self._starts[i] + 1)
+        elif joins_right:
+            self._drop_length(self._ends[i + 1] - self._starts[i + 1] + 1)
+            self._starts[i + 1] = period
+            self._add_length(self._ends[i + 1] - self._starts[i + 1] + 1)
+        else:
+            self._starts.insert(i + 1, period)
+            self._ends.insert(i + 1, period)
+            self._add_length(1)
+        return True
+
+    def remove(self, period: int) -> bool:
+        """
+        Remove a completed period, splitting its segment if needed.
+
+        Args:
+            period (int): The period number to remove.
+
+        Returns:
+            bool: False if the period was not present, else True.
+        """
+        i = bisect_right(self._starts, period) - 1
+        if i < 0 or self._ends[i] < period:
+            return False
+
+        start, end = self._starts[i], self._ends[i]
+        self._drop_length(end - start + 1)
+        if start == end:
+            del self._starts[i]
+            del self._ends[i]
+        elif period == start:
+            self._starts[i] = period + 1
+            self._add_length(end - period)
+        elif period == end:
+            self._ends[i] = period - 1
+            self._add_length(period - start)
+        else:
+            self._ends[i] = period - 1
+            self._starts.insert(i + 1, period + 1)
+            self._ends.insert(i + 1, end)
+            self._add_length(period - start)
+            self._add_length(end - period)
+        return True
+
+    def _add_length(self, length: int):
+        self._lengths[length] += 1
+        if length > self._longest:
+            self._longest = length
+
+    def _drop_length(self, length: int):
+        self._lengths[length] -= 1
+        if not self._lengths[length]:
+            del self._lengths[length]
+            if length == self._longest:
+                # Only the (few) distinct lengths are scanned, not the log
+                self._longest = max(self._lengths, default=0)
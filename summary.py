@@ -0,0 +1,110 @@
+"""
+Small sidecar file (habits.json.summary) with the per-habit numbers the status
+command prints, so it can answer without reading the full snapshot.
+
+The summary records the size and modification time of the snapshot and its
+journal when it was written; any change to either makes it stale, and readers
+fall back to loading the snapshot.
+
+This module is imported on the CLI's cold-start path, so it only depends on
+the standard library and period.py.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from period import period_number
+
+SUMMARY_FORMAT = 1
+
+# Columns of the rows returned by status_rows() (and printed by the status command)
+STATUS_COLUMNS = ["name", "periodicity", "checked", "completions", "longest_streak", "last_done"]
+
+
+def summary_path(snapshot: str) -> str:
+    """
+    Return the summary path belonging to a snapshot file.
+    """
+    return snapshot + ".summary"
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_summary(snapshot: str, habits: List[Dict]):
+    """
+    Write the summary of a snapshot (and its current journal).
+
+    Args:
+        snapshot (str): The JSON snapshot the summary describes.
+        habits (List[Dict]): One dict per habit with name, periodicity,
+            completions, longest_streak and last_done (ISO timestamp or None).
+    """
+    last_done = max((h["last_done"] for h in habits if h["last_done"]), default=None)
+    data = {
+        "format": SUMMARY_FORMAT,
+        "snapshot": _signature(snapshot),
+        "journal": _signature(snapshot + ".journal"),
+        "habit_count": len(habits),
+        "last_done": last_done,
+        "habits": habits,
+    }
+    tmp_file = summary_path(snapshot) + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_file, summary_path(snapshot))
+
+
+def read_summary(snapshot: str) -> Optional[Dict]:
+    """
+    Read the summary of a snapshot.
+
+    Returns:
+        Optional[Dict]: The summary, or None if it is missing, unreadable or
+        stale (the snapshot or journal changed since it was written).
+    """
+    try:
+        with open(summary_path(snapshot), "r") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if (data.get("format") != SUMMARY_FORMAT
+            or data.get("snapshot") != _signature(snapshot)
+            or data.get("journal") != _signature(snapshot + ".journal")):
+        return None
+    return data
+
+
+def status_rows(summary: Dict, date: datetime) -> Optional[List[Dict]]:
+    """
+    Compute the status rows (as printed by the status command) from a summary.
+
+    A habit is checked for the period of the date exactly when its last
+    completion falls into that period, as long as the date is not before the
+    last completion's period.
+
+    Returns:
+        Optional[List[Dict]]: The rows, or None if the date lies before some
+        habit's last completion and the full history is needed.
+    """
+    rows = []
+    for habit in summary["habits"]:
+        last_done = datetime.fromisoformat(habit["last_done"]) if habit["last_done"] else None
+        checked = False
+        if last_done is not None:
+            period = period_number(habit["periodicity"], date)
+            last_period = period_number(habit["periodicity"], last_done)
+            if period < last_period:
+                return None
+            checked = period == last_period
+        rows.append({"name": habit["name"], "periodicity": habit["periodicity"], "checked": checked,
+                     "completions": habit["completions"], "longest_streak": habit["longest_streak"],
+                     "last_done": last_done})
+    return rows
@@ -0,0 +1,106 @@
+"""
+The paged habit table of the interactive menu, redrawn incrementally.
+
+Each row is cached with the habit's version and the session date, so a redraw
+only rebuilds the rows of habits that changed since the last draw, and the
+table text is reused when no row on the page changed. Only one page of rows
+(PAGE_SIZE by default) is built and drawn, so large collections stay fast.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from tabulate import tabulate
+
+from analytics import get_habit_metrics
+from habit import Habit
+
+PAGE_SIZE = 20
+HEADERS = ["#", "check", "Habit", "Type", "Completions", "Longest Streak", "Last Done"]
+
+
+class HabitTable:
+    """
+    Renders one page of a manager's habits, caching rows between draws.
+
+    Rows are numbered by the habit's position in manager.habits, the number
+    the menu asks for, whatever page they are on.
+    """
+
+    def __init__(self, page_size: int = PAGE_SIZE):
+        """
+        Args:
+            page_size (int): Rows per page; 0 shows every habit on one page.
+        """
+        self.page_size = page_size
+        self.page = 0
+        self.rows_built = 0  # Rows (re)built so far, for tests and benchmarks
+        self._rows: "WeakKeyDictionary[Habit, tuple]" = WeakKeyDictionary()
+        self._last: Optional[Tuple[tuple, str]] = None  # ((page rows, page line), table text)
+
+    def page_count(self, habit_count: int) -> int:
+        """
+        Return the number of pages needed for habit_count habits (at least 1).
+        """
+        if not self.page_size:
+            return 1
+        return max(1, -(-habit_count // self.page_size))
+
+    def next_page(self, habit_count: int) -> bool:
+        """
+        Move to the next page. Returns False if already on the last one.
+        """
+        if self.page + 1 >= self.page_count(habit_count):
+            return False
+        self.page += 1
+        return True
+
+    def previous_page(self) -> bool:
+        """
+        Move to the previous page. Returns False if already on the first one.
+        """
+        if self.page == 0:
+            return False
+        self.page -= 1
+        return True
+
+    def row(self, habit: Habit, date: datetime) -> tuple:
+        """
+        Return the cells of a habit's row (without the number), rebuilt only if it changed.
+        """
+        version = habit.version
+        entry = self._rows.get(habit)
+        if entry is not None and entry[0] == version and entry[1] == date:
+            return entry[2]
+
+        # Served from the metadata saved with each habit, so drawing the
+        # table does not parse any completion log
+        metrics = get_habit_metrics(habit)
+        last_date = metrics["last_done"].date() if metrics["last_done"] else "N/A"
+        cells = ("[x]" if habit.is_checked(date) else "[ ]", habit.name.title(), habit.periodicity,
+                 metrics["completions"], metrics["longest_streak"], last_date)
+        self._rows[habit] = (version, date, cells)
+        self.rows_built += 1
+        return cells
+
+    def render(self, manager, date: datetime) -> str:
+        """
+        Return the current page of the table, with a page line if there are several.
+        """
+        habits = manager.habits
+        pages = self.page_count(len(habits))
+        self.page = min(self.page, pages - 1)  # Habits may have been removed
+        start = self.page * self.page_size
+        end = start + self.page_size if self.page_size else len(habits)
+
+        rows = [(idx, *self.row(h, date)) for idx, h in enumerate(habits[start:end], start + 1)]
+        page_line = f"Habits {start + 1}-{start + len(rows)} of {len(habits)} (page {self.page + 1}/{pages})"
+        key = (rows, page_line if pages > 1 else None)
+        if self._last is not None and self._last[0] == key:
+            return self._last[1]
+        text = tabulate(rows, headers=HEADERS, tablefmt="fancy_grid")
+        if pages > 1:
+            text += "\n" + page_line
+        self._last = (key, text)
+        return text
@@ -1,12 +1,20 @@
 import unittest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 from analytics import get_streak_summary
 from habit import Habit
+from habit_manager import HabitManager
 from analytics import (
     get_all_habits,
     filter_habits_by_periodicity,
     calculate_streak_for_habit,
     calculate_longest_streaks,
+    get_habit_metrics,
+    metrics_cache,
+    get_completion_rate,
+    get_rolling_adherence,
+    get_streak_histogram,
+    get_weekday_distribution,
 )
 
 class TestAnalytics(unittest.TestCase):
@@ -54,7 +62,7 @@ class TestAnalytics(unittest.TestCase):
         self.assertCountEqual([h.name for h in weekly], ["c", "d"])
 
     def test_calculate_streak_for_habit(self):
-        # Should delegate to get_current_streak (which is len(log) for now)
+        # Should delegate to get_current_streak (hab_a's 3-day streak ends today)
         self.assertEqual(calculate_streak_for_habit(self.hab_a), len(self.hab_a.completion_log))
 
     def test_calculate_longest_streaks_empty(self):
@@ -75,5 +83,48 @@ class TestAnalytics(unittest.TestCase):
             self.assertEqual(summary["longest_streak_overall"], 5)
             self.assertAlmostEqual(summary["average_streak"], 3.33, places=2) # Average of 3.33 from (3 + 5 + 2) / 3
 
+    @patch('builtins.print')
+    def test_metrics_cached_until_habit_changes(self, mock_print):
+        first = get_habit_metrics(self.hab_a)
+        self.assertIs(get_habit_metrics(self.hab_a), first)
+        self.assertEqual(first["longest_streak"], 3)
+
+        self.hab_a.check_off(datetime.now() - timedelta(days=3))
+        updated = get_habit_metrics(self.hab_a)
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated["longest_streak"], 4)
+        self.assertEqual(updated["completions"], 4)
+
+        self.hab_a.uncheck(datetime.now() - timedelta(days=1))
+        self.assertEqual(get_habit_metrics(self.hab_a)["longest_streak"], 2)
+
+    def test_metrics_follow_direct_log_changes(self):
+        self.assertEqual(get_habit_metrics(self.hab_c)["completions"], 2)
+        self.hab_c.completion_log.append(datetime.now() - timedelta(weeks=2))
+        self.assertEqual(get_habit_metrics(self.hab_c)["completions"], 3)
+        self.assertEqual(get_habit_metrics(self.hab_c)["longest_streak"], 3)
+
+    def test_remove_habit_evicts_metrics(self):
+        manager = HabitManager()
+        manager.add_habit(self.hab_a)
+        version = manager.version
+        get_habit_metrics(self.hab_a)
+        self.assertIn(self.hab_a, metrics_cache._entries)
+
+        manager.remove_habit("a")
+        self.assertNotIn(self.hab_a, metrics_cache._entries)
+        self.assertGreater(manager.version, version)
+
+    def test_group_time_series_metrics(self):
+        habits = [self.hab_a, self.hab_b, self.hab_d]
+        now = datetime.now()
+        self.assertAlmostEqual(get_completion_rate(habits, now - timedelta(days=4), now),
+                               (3 / 5 + 1 + self.hab_d.completion_rate(now - timedelta(days=4), now)) / 3)
+        adherence = get_rolling_adherence(habits, now, windows=(7,))
+        self.assertAlmostEqual(adherence[7], (3 / 7 + 5 / 7 + 2 / 7) / 3)
+        self.assertEqual(get_streak_histogram(habits), {1: 2, 3: 1, 5: 1})
+        self.assertEqual(sum(get_weekday_distribution(habits)), 10)
+        self.assertEqual(get_rolling_adherence([], now), {7: 0.0, 30: 0.0, 90: 0.0})
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+import main
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, "habits.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        """Run main.main() and return (exit code, stdout)."""
+        out = io.StringIO()
+        code = 0
+        with redirect_stdout(out), redirect_stderr(io.StringIO()):
+            try:
+                main.main(list(argv) + ["--file", self.file])
+            except SystemExit as e:
+                code = e.code
+        return code, out.getvalue()
+
+    def test_add_check_and_status(self):
+        self.assertEqual(self.run_cli("add", "Walk", "daily")[0], 0)
+        self.run_cli("check", "walk", "--date", "2025-07-09")
+        code, out = self.run_cli("check", "walk", "--date", "2025-07-10", "--format", "json")
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(out), [{"name": "walk", "command": "check", "changed": True}])
+
+        code, out = self.run_cli("status", "--date", "2025-07-10")
+        self.assertEqual(out.splitlines(), [
+            "name\tperiodicity\tchecked\tcompletions\tlongest_streak\tlast_done",
+            "walk\tdaily\ttrue\t2\t2\t2025-07-10T00:00:00",
+        ])
+
+    def test_streaks_and_missed(self):
+        self.run_cli("add", "walk", "daily")
+        self.run_cli("add", "budget", "weekly")
+        self.run_cli("check", "walk", "--date", "2025-07-10")
+        self.run_cli("uncheck", "walk", "--date", "2025-07-10")
+        self.run_cli("check", "budget", "--date", "2025-07-07")
+
+        _, out = self.run_cli("streaks", "--date", "2025-07-10", "--format", "json")
+        self.assertEqual([(r["name"], r["current_streak"]) for r in json.loads(out)],
+                         [("walk", 0), ("budget", 1)])
+        _, out = self.run_cli("missed", "--date", "2025-07-10")
+        self.assertEqual(out.splitlines(), ["name\tperiodicity", "walk\tdaily"])
+
+    def test_errors_exit_non_zero(self):
+        self.run_cli("add", "walk", "daily")
+        self.assertEqual(self.run_cli("add", "walk", "daily"), (1, ""))
+        self.assertEqual(self.run_cli("check", "swim"), (1, ""))
+        self.assertEqual(self.run_cli("serve", "--db", os.path.join(self.tmp_dir.name, "habits.db")), (2, ""))
+
+    def test_db_commands_skip_loading(self):
+        db = os.path.join(self.tmp_dir.name, "habits.db")
+        self.run_cli("add", "walk", "daily", "--db", db)
+        with patch("sqlite_storage.SqliteStorage.load", side_effect=AssertionError("habits loaded")):
+            for day in ("2025-07-09", "2025-07-10", "2025-07-11"):
+                self.assertEqual(self.run_cli("check", "walk", "--date", day, "--db", db)[0], 0)
+            _, out = self.run_cli("check", "walk", "--date", "2025-07-10", "--db", db, "--format", "json")
+            self.assertFalse(json.loads(out)[0]["changed"])
+            _, out = self.run_cli("uncheck", "walk", "--date", "2025-07-11", "--db", db, "--format", "json")
+            self.assertTrue(json.loads(out)[0]["changed"])
+            self.assertEqual(self.run_cli("check", "swim", "--db", db), (1, ""))
+
+            _, out = self.run_cli("streaks", "--date", "2025-07-11", "--db", db, "--format", "json")
+            self.assertEqual(json.loads(out), [{"name": "walk", "periodicity": "daily",
+                                                "current_streak": 2, "longest_streak": 2}])
+            _, out = self.run_cli("missed", "--date", "2025-07-11", "--db", db)
+            self.assertEqual(out.splitlines(), ["name\tperiodicity", "walk\tdaily"])
+
+    def test_import_csv(self):
+        self.run_cli("add", "walk", "daily")
+        self.run_cli("check", "walk", "--date", "2025-07-01")
+        csv_file = os.path.join(self.tmp_dir.name, "history.csv")
+        with open(csv_file, "w") as f:
+            f.write("name,date\nwalk,2025-07-03T08:00:00+02:00\n")
+        self.assertEqual(self.run_cli("import", csv_file)[0], 0)
+        code, out = self.run_cli("status", "--format", "json")
+        self.assertEqual(json.loads(out)[0]["completions"], 2)
+
+        with open(csv_file, "w") as f:
+            f.write("swim,2025-07-03\n")
+        err = io.StringIO()
+        with redirect_stdout(io.StringIO()), redirect_stderr(err), self.assertRaises(SystemExit) as cm:
+            main.main(["import", csv_file, "--file", self.file])
+        self.assertEqual(cm.exception.code, 1)
+        self.assertEqual(err.getvalue(), "error: Unknown habits: swim\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from habit import Habit
+from habit_manager import HabitManager
+
+START = datetime(2024, 1, 1, 9, 0)
+CHECKS_PER_WORKER = 40
+
+
+def check_off_days(filename: str, worker: int, compact_every: int):
+    """
+    Check off this worker's days in its own manager, as a separate CLI session would.
+    """
+    manager = HabitManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_from_file(filename)
+    manager.open_journal(filename, compact_every=compact_every)
+    for i in range(CHECKS_PER_WORKER):
+        manager.check_off_habit("walk", START + timedelta(days=worker * CHECKS_PER_WORKER + i))
+        if i % 10 == 9:
+            manager.checkpoint()  # Snapshot saves racing with other sessions' appends
+    manager.close_storage()
+
+
+def uncheck_days(filename: str, worker: int, compact_every: int):
+    """
+    Uncheck this worker's days in its own manager, as a cron `uncheck` would.
+    """
+    manager = HabitManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_from_file(filename)
+    manager.open_journal(filename, compact_every=compact_every)
+    for i in range(CHECKS_PER_WORKER):
+        manager.uncheck_habit("walk", START + timedelta(days=worker * CHECKS_PER_WORKER + i))
+        if i % 10 == 9:
+            manager.checkpoint()
+    manager.close_storage()
+
+
+class TestConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, "habits.json")
+        manager = HabitManager()
+        manager.add_habit(Habit("walk", "daily"))
+        manager.add_habit(Habit("budget", "weekly"))
+        manager.save_to_file(self.file)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def load(self) -> HabitManager:
+        manager = HabitManager()
+        manager.load_from_file(self.file)
+        return manager
+
+    def test_save_merges_other_sessions(self):
+        mine, theirs = self.load(), self.load()
+        mine.check_off_habit("walk", START)
+        theirs.check_off_habit("walk", START + timedelta(days=1))
+        theirs.add_habit(Habit("read", "daily"))
+        theirs.save_to_file(self.file)
+        mine.remove_habit("budget")
+        mine.save_to_file(self.file)
+
+        merged = self.load()
+        self.assertEqual(sorted(h.name for h in merged.habits), ["read", "walk"])
+        self.assertEqual(merged.get_habit("walk").get_completion_count(), 2)
+
+    def test_uncheck_survives_merge(self):
+        mine = self.load()
+        mine.check_off_habit("walk", START)
+        mine.save_to_file(self.file)
+        mine.uncheck_habit("walk", START)
+        mine.save_to_file(self.file)
+        self.assertEqual(self.load().get_habit("walk").get_completion_count(), 0)
+
+    def test_uncheck_elsewhere_survives_merge(self):
+        seeded = self.load()
+        seeded.check_off_habit("walk", START)
+        seeded.check_off_habit("walk", START + timedelta(days=2))
+        seeded.save_to_file(self.file)
+
+        mine, theirs = self.load(), self.load()
+        mine.check_off_habit("walk", START + timedelta(days=1))
+        mine.check_off_habit("walk", START + timedelta(days=2))  # Already checked: not a change
+        theirs.uncheck_habit("walk", START)
+        theirs.uncheck_habit("walk", START + timedelta(days=2))
+        theirs.save_to_file(self.file)
+        mine.save_to_file(self.file)
+
+        walk = self.load().get_habit("walk")
+        self.assertEqual(walk.completion_log, [START + timedelta(days=1)])
+
+    def test_recheck_wins_over_uncheck_elsewhere(self):
+        seeded = self.load()
+        seeded.check_off_habit("walk", START)
+        seeded.save_to_file(self.file)
+
+        mine, theirs = self.load(), self.load()
+        mine.uncheck_habit("walk", START)
+        mine.check_off_habit("walk", START)
+        theirs.uncheck_habit("walk", START)
+        theirs.save_to_file(self.file)
+        mine.save_to_file(self.file)
+        self.assertTrue(self.load().get_habit("walk").is_checked(START))
+
+    def test_unchecks_racing_check_offs(self):
+        processes = 4
+        seeded = self.load()
+        seeded.bulk_check_off(("walk", START + timedelta(days=d)) for d in range(processes * CHECKS_PER_WORKER))
+        seeded.save_to_file(self.file)
+
+        shared = self.load()
+        shared.open_journal(self.file, compact_every=25)
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=uncheck_days, args=(self.file, p, 15)) for p in range(processes)]
+        for p in procs:
+            p.start()
+        # Check-offs after the unchecked days, with snapshot saves merging the unchecks
+        for i in range(CHECKS_PER_WORKER):
+            shared.check_off_habit("walk", START + timedelta(days=processes * CHECKS_PER_WORKER + i))
+        for p in procs:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+        shared.checkpoint()
+        shared.close_storage()
+
+        walk = self.load().get_habit("walk")
+        self.assertEqual(walk.get_completion_count(), CHECKS_PER_WORKER)
+        self.assertEqual(walk.get_longest_streak(), CHECKS_PER_WORKER)
+
+    def test_threads_and_processes(self):
+        threads, processes = 8, 4
+        shared = self.load()
+        shared.open_journal(self.file, compact_every=25)
+
+        def check_off(worker: int):
+            for i in range(CHECKS_PER_WORKER):
+                shared.check_off_habit("walk", START + timedelta(days=worker * CHECKS_PER_WORKER + i))
+
+        started = time.perf_counter()
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=check_off_days, args=(self.file, threads + p, 15)) for p in range(processes)]
+        for p in procs:
+            p.start()
+        workers = [threading.Thread(target=check_off, args=(t,)) for t in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        shared.checkpoint()
+        shared.close_storage()
+        for p in procs:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+        elapsed = time.perf_counter() - started
+
+        total = (threads + processes) * CHECKS_PER_WORKER
+        walk = self.load().get_habit("walk")
+        self.assertEqual(walk.get_completion_count(), total)
+        self.assertEqual(walk.get_longest_streak(), total)
+        # Every check-off is fsync'd under the file lock; 480 of them plus process
+        # start-up should take well under this even on slow disks
+        self.assertLess(elapsed, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -59,6 +59,188 @@ class TestHabit(unittest.TestCase):
         self.assertEqual(len(self.weekly.completion_log), 1)
         self.assertEqual(self.weekly.completion_log[0].date(), custom_date.date())
 
+    @patch('builtins.print')
+    def test_is_checked_uses_period(self, mock_print):
+        """is_checked() should match any date in the same day (daily) or ISO week (weekly)."""
+        monday = datetime(2025, 7, 7, 8, 0)
+        self.daily.check_off(monday)
+        self.assertTrue(self.daily.is_checked(monday.replace(hour=22)))
+        self.assertFalse(self.daily.is_checked(monday + timedelta(days=1)))
+
+        self.weekly.check_off(monday)
+        self.assertTrue(self.weekly.is_checked(monday + timedelta(days=6)))
+        self.assertFalse(self.weekly.is_checked(monday + timedelta(days=7)))
+
+    @patch('builtins.print')
+    def test_weekly_duplicate_across_year_boundary(self, mock_print):
+        """Dates in the same ISO week but different calendar years are duplicates."""
+        self.weekly.check_off(datetime(2024, 12, 30))  # ISO week 1 of 2025
+        self.weekly.check_off(datetime(2025, 1, 2))
+        self.assertEqual(len(self.weekly.completion_log), 1)
+
+    @patch('builtins.print')
+    def test_uncheck_with_custom_date(self, mock_print):
+        """uncheck(date) should only remove the check-off of that date's period."""
+        day = datetime(2025, 7, 10)
+        self.daily.check_off(day)
+        self.daily.check_off(day - timedelta(days=1))
+        self.daily.uncheck(day)
+        self.assertEqual([d.date() for d in self.daily.completion_log], [(day - timedelta(days=1)).date()])
+        self.assertFalse(self.daily.is_checked(day))
+
+    @patch('builtins.print')
+    def test_index_follows_direct_log_changes(self, mock_print):
+        """Assigning or appending to completion_log should keep lookups in sync."""
+        day = datetime(2025, 7, 10)
+        self.daily.completion_log = [day]
+        self.assertTrue(self.daily.is_checked(day))
+        self.daily.completion_log.append(day + timedelta(days=1))
+        self.daily.check_off(day + timedelta(days=1))
+        self.assertEqual(len(self.daily.completion_log), 2)
+
+    @patch('builtins.print')
+    def test_compact_matches_list_mode(self, mock_print):
+        """Compact habits should behave like list-backed ones for check-offs and streaks."""
+        start = datetime(2025, 6, 30, 7, 15)
+        dates = [start - timedelta(days=i) for i in (0, 1, 2, 5, 6)]
+        for compact in (False, True):
+            habit = Habit("read", "daily", compact=compact)
+            for d in dates:
+                habit.check_off(d)
+            habit.check_off(start.replace(hour=20))  # duplicate for the same day
+            self.assertEqual(len(habit.completion_log), 5)
+            self.assertEqual(habit.get_longest_streak(), 3)
+            self.assertFalse(habit.is_broken(start - timedelta(days=6), start - timedelta(days=5)))
+            self.assertTrue(habit.is_broken(start - timedelta(days=4), start - timedelta(days=3, hours=1)))
+
+    @patch('builtins.print')
+    def test_compact_log_view(self, mock_print):
+        """Compact logs are kept sorted and exposed as datetimes."""
+        habit = Habit("plan", "weekly", compact=True)
+        later, earlier = datetime(2025, 7, 10, 9, 0), datetime(2025, 7, 1, 9, 0)
+        habit.check_off(later)
+        habit.check_off(earlier)
+        self.assertEqual(list(habit.completion_log), [earlier, later])
+        self.assertEqual(habit.completion_log[-1], later)
+        self.assertTrue(habit.is_checked(datetime(2025, 7, 13)))
+
+        habit.uncheck(datetime(2025, 7, 7))
+        self.assertEqual(list(habit.completion_log), [earlier])
+        self.assertEqual(habit.get_longest_streak(), 1)
+
+    @patch('builtins.print')
+    def test_current_streak(self, mock_print):
+        """get_current_streak() should count the streak that is still alive at a date."""
+        day = datetime(2025, 7, 10, 9, 0)
+        for i in (0, 1, 2, 4):
+            self.daily.check_off(day - timedelta(days=i))
+        self.assertEqual(self.daily.get_current_streak(day), 3)
+        self.assertEqual(self.daily.get_current_streak(day + timedelta(days=1)), 3)
+        self.assertEqual(self.daily.get_current_streak(day + timedelta(days=2)), 0)
+
+        self.daily.uncheck(day - timedelta(days=1))
+        self.assertEqual(self.daily.get_current_streak(day), 1)
+        self.assertEqual(self.daily.get_longest_streak(), 1)
+
+    @patch('builtins.print')
+    def test_weekly_streak_across_53_week_year(self, mock_print):
+        """2020 has an ISO week 53; weeks 52, 53 and 2021-W01 form one streak."""
+        for d in (datetime(2020, 12, 21), datetime(2020, 12, 28), datetime(2021, 1, 4)):
+            self.weekly.check_off(d)
+        self.assertEqual(self.weekly.get_longest_streak(), 3)
+        self.assertEqual(self.weekly.get_current_streak(datetime(2021, 1, 8)), 3)
+
+    @patch('builtins.print')
+    def test_monthly_periods(self, mock_print):
+        """Monthly habits dedupe by calendar month and streak across the new year."""
+        for compact in (False, True):
+            habit = Habit("budget", "monthly", compact=compact)
+            for d in (datetime(2024, 11, 30), datetime(2024, 12, 1), datetime(2025, 1, 31)):
+                self.assertTrue(habit.check_off(d))
+            self.assertFalse(habit.check_off(datetime(2025, 1, 1)))
+            self.assertTrue(habit.is_checked(datetime(2024, 12, 31, 23, 59)))
+            self.assertEqual(habit.get_longest_streak(), 3)
+            self.assertEqual(habit.get_current_streak(datetime(2025, 2, 15)), 3)
+            self.assertTrue(habit.uncheck(datetime(2024, 12, 15)))
+            self.assertEqual(habit.get_completion_count(), 2)
+            self.assertEqual(habit.gaps_between(datetime(2024, 11, 1), datetime(2025, 1, 1)),
+                             [(datetime(2024, 12, 1), datetime(2025, 1, 1))])
+
+    @patch('builtins.print')
+    def test_log_stays_sorted(self, mock_print):
+        """Out-of-order check-offs and appends are kept in time order."""
+        day = datetime(2025, 7, 10, 9, 0)
+        self.daily.completion_log = [day, day - timedelta(days=3)]
+        self.daily.check_off(day - timedelta(days=1))
+        self.daily.completion_log.append(day - timedelta(days=5))
+        self.assertEqual(list(self.daily.completion_log),
+                         [day - timedelta(days=i) for i in (5, 3, 1, 0)])
+        self.assertEqual(self.daily.get_last_completion(), day)
+
+    @patch('builtins.print')
+    def test_range_queries(self, mock_print):
+        """completions_between() and gaps_between() match a brute-force scan in both modes."""
+        day = datetime(2025, 7, 10, 9, 0)
+        dates = [day - timedelta(days=i) for i in (0, 1, 4, 5, 9)]
+        for compact in (False, True):
+            habit = Habit("read", "daily", compact=compact)
+            for d in reversed(dates):
+                habit.check_off(d)
+            start, end = day - timedelta(days=8), day - timedelta(days=1)
+            self.assertEqual(habit.completions_between(start, end),
+                             sorted(d for d in dates if start <= d <= end))
+            midnight = day.replace(hour=0)
+            self.assertEqual(habit.gaps_between(start, end), [
+                (midnight - timedelta(days=8), midnight - timedelta(days=5)),
+                (midnight - timedelta(days=3), midnight - timedelta(days=1)),
+            ])
+            self.assertEqual(habit.gaps_between(day - timedelta(days=1), day), [])
+
+    @patch('builtins.print')
+    def test_weekly_gaps_count_whole_weeks(self, mock_print):
+        """A weekly completion later in the window's last week still fills that week."""
+        self.weekly.check_off(datetime(2025, 7, 4))   # Friday, week of 2025-06-30
+        self.weekly.check_off(datetime(2025, 7, 17))  # Thursday, week of 2025-07-14
+        gaps = self.weekly.gaps_between(datetime(2025, 7, 1), datetime(2025, 7, 15))
+        self.assertEqual(gaps, [(datetime(2025, 7, 7), datetime(2025, 7, 14))])
+
+    @patch('builtins.print')
+    def test_add_completions_dedupes_batch(self, mock_print):
+        """add_completions() skips repeated and already checked periods and keeps the log sorted."""
+        day = datetime(2025, 7, 10, 9, 0)
+        for compact in (False, True):
+            habit = Habit("read", "daily", compact=compact)
+            habit.check_off(day)
+            batch = [day - timedelta(days=2), day.replace(hour=20), day - timedelta(days=1),
+                     day - timedelta(days=2, hours=-3)]
+            self.assertEqual(habit.add_completions(batch), 2)
+            self.assertEqual(list(habit.completion_log), [day - timedelta(days=i) for i in (2, 1, 0)])
+            self.assertEqual(habit.get_longest_streak(), 3)
+            self.assertEqual(habit.add_completions([day]), 0)
+
+    @patch('builtins.print')
+    def test_incremental_aggregates(self, mock_print):
+        """Rates, histograms and weekday counts follow check_off/uncheck and match a fresh rebuild."""
+        day = datetime(2025, 7, 10, 9, 0)  # Thursday
+        for compact in (False, True):
+            habit = Habit("read", "daily", compact=compact)
+            for i in (0, 1, 2, 4, 5, 9):
+                habit.check_off(day - timedelta(days=i))
+            habit.uncheck(day - timedelta(days=5))
+            self.assertEqual(habit.completion_rate(day - timedelta(days=9), day), 0.5)
+            self.assertEqual(habit.rolling_adherence(day, windows=(2, 5)), {2: 1.0, 5: 0.8})
+            self.assertEqual(habit.streak_histogram(), {3: 1, 1: 2})
+            self.assertEqual(habit.weekday_distribution(), [0, 2, 1, 1, 0, 0, 1])
+
+            rebuilt = Habit("read", "daily", compact=compact)
+            rebuilt.completion_log = list(habit.completion_log)
+            self.assertEqual(rebuilt.weekday_distribution(), habit.weekday_distribution())
+            self.assertEqual(rebuilt.streak_histogram(), habit.streak_histogram())
+
+        self.weekly.check_off(datetime(2025, 7, 4))
+        self.weekly.check_off(datetime(2025, 7, 17))
+        self.assertEqual(self.weekly.completion_rate(datetime(2025, 7, 1), datetime(2025, 7, 20)), 2 / 3)
+
 if __name__ == "__main__":
     unittest.main()
 # This code is a unit test for the Habit class, testing its methods and behaviors.
\ No newline at end of file
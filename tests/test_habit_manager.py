@@ -1,11 +1,15 @@
 import unittest
 import os
+import io
 import json
 import tempfile
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from habit import Habit
-from habit_manager import HabitManager
+from habit_manager import HabitManager, iter_check_off_csv, iter_json_array
+from analytics import get_streak_summary
+from summary import read_summary, status_rows
 
 class TestHabitManager(unittest.TestCase):
     def setUp(self):
@@ -21,11 +25,12 @@ class TestHabitManager(unittest.TestCase):
         self.manager = HabitManager()
 
     def tearDown(self):
-        # Clean up the temp file
-        try:
-            os.remove(self.tmp_path)
-        except FileNotFoundError:
-            pass
+        # Clean up the temp file and the files saved next to it
+        for path in (self.tmp_path, self.tmp_path + ".summary", self.tmp_path + ".journal"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     def test_add_and_remove_habit(self):
         h1 = Habit("test1", "daily")
@@ -52,6 +57,102 @@ class TestHabitManager(unittest.TestCase):
         self.assertCountEqual([h.name for h in daily], ["d", "d2"])
         self.assertEqual([h.name for h in weekly], ["w"])
 
+    def test_period_status_and_missed(self):
+        session = datetime(2025, 1, 1, 12, 0)  # Wednesday of ISO week 2025-W01
+        daily = Habit("d", "daily")
+        daily.completion_log = [session - timedelta(days=1)]
+        weekly = Habit("w", "weekly")
+        weekly.completion_log = [datetime(2024, 12, 30, 9, 0)]  # Monday of the same ISO week
+        done = Habit("done", "daily")
+        done.completion_log = [session.replace(hour=7)]
+        for h in (daily, weekly, done):
+            self.manager.add_habit(h)
+
+        status = [(h.name, checked) for h, checked in self.manager.period_status(session)]
+        self.assertEqual(status, [("d", False), ("w", True), ("done", True)])
+        self.assertEqual([h.name for h in self.manager.get_missed_habits(session)], ["d"])
+
+    def test_get_broken_habits(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        steady = Habit("steady", "daily")
+        steady.completion_log = [day - timedelta(days=i) for i in range(10)]
+        broken = Habit("broken", "daily")
+        broken.completion_log = [day - timedelta(days=i) for i in range(10) if i != 4]
+        self.manager.add_habit(steady)
+        self.manager.add_habit(broken)
+        broke = self.manager.get_broken_habits(day - timedelta(days=9), day)
+        self.assertEqual([h.name for h in broke], ["broken"])
+
+    def test_bulk_check_off(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        self.manager.add_habit(Habit("walk", "daily"))
+        self.manager.add_habit(Habit("budget", "weekly"))
+        records = [("walk", day - timedelta(days=i)) for i in range(5)]
+        records += [("budget", day), ("budget", day - timedelta(days=1)), ("walk", day)]
+        self.assertEqual(self.manager.bulk_check_off(records), 6)
+        self.assertEqual(self.manager.get_longest_streak_for_habit("walk"), 5)
+        self.assertEqual(len(self.manager.get_habit("budget").completion_log), 1)
+
+    def test_bulk_check_off_rejects_unknown_names(self):
+        self.manager.add_habit(Habit("walk", "daily"))
+        with self.assertRaises(KeyError):
+            self.manager.bulk_check_off([("walk", datetime(2025, 7, 10)), ("swim", datetime(2025, 7, 10))])
+        self.assertEqual(len(self.manager.get_habit("walk").completion_log), 0)
+
+    def test_bulk_check_off_saves_once(self):
+        self.manager.add_habit(Habit("walk", "daily"))
+        self.manager.open_journal(self.tmp_path)
+        try:
+            self.manager.bulk_check_off([("walk", datetime(2025, 7, d)) for d in range(1, 11)])
+            self.assertEqual(len(self.manager.storage.journal), 0)
+        finally:
+            self.manager.close_storage()
+
+        loaded = HabitManager()
+        loaded.load_from_file(self.tmp_path)
+        self.assertEqual(loaded.get_habit("walk").get_longest_streak(), 10)
+
+    def test_iter_check_off_csv(self):
+        f = io.StringIO("name,date\nWalk,2025-07-10\n\nbudget, 2025-07-11T08:30:00\n")
+        self.assertEqual(list(iter_check_off_csv(f)), [
+            ("walk", datetime(2025, 7, 10)),
+            ("budget", datetime(2025, 7, 11, 8, 30)),
+        ])
+        with self.assertRaises(ValueError):
+            list(iter_check_off_csv(io.StringIO("walk,yesterday\n")))
+
+    def test_iter_check_off_csv_makes_offsets_local(self):
+        aware = datetime.fromisoformat("2025-07-02T08:00:00+02:00")
+        (_, date), = iter_check_off_csv(io.StringIO(f"walk,{aware.isoformat()}\n"))
+        self.assertIsNone(date.tzinfo)
+        self.assertEqual(date, aware.astimezone().replace(tzinfo=None))
+
+    def test_summary_matches_snapshot(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        walk = Habit("walk", "daily")
+        walk.completion_log = [day - timedelta(days=i) for i in range(3)]
+        self.manager.add_habit(walk)
+        self.manager.add_habit(Habit("budget", "weekly"))
+        self.manager.save_to_file(self.tmp_path)
+
+        summary = read_summary(self.tmp_path)
+        self.assertEqual(summary["habit_count"], 2)
+        self.assertEqual(summary["last_done"], day.isoformat())
+        rows = status_rows(summary, day + timedelta(days=1))
+        self.assertEqual([(r["name"], r["checked"], r["longest_streak"]) for r in rows],
+                         [("walk", False, 3), ("budget", False, 0)])
+        self.assertTrue(status_rows(summary, day)[0]["checked"])
+        self.assertIsNone(status_rows(summary, day - timedelta(days=1)))
+
+        # Any journal record makes the summary stale until it is rewritten
+        with open(self.tmp_path + ".journal", "a") as f:
+            f.write(json.dumps({"op": "check", "name": "budget", "date": day.isoformat()}) + "\n")
+        self.assertIsNone(read_summary(self.tmp_path))
+        loaded = HabitManager()
+        loaded.load_from_file(self.tmp_path)
+        loaded.save_summary(self.tmp_path)
+        self.assertTrue(status_rows(read_summary(self.tmp_path), day)[1]["checked"])
+
     def test_get_longest_streaks(self):
         # create habits with known streaks
         h1 = Habit("h1", "daily")
@@ -82,6 +183,153 @@ class TestHabitManager(unittest.TestCase):
         self.assertEqual(loaded.periodicity, "daily")
         self.assertEqual(len(loaded.completion_log), 1)
 
+    def test_load_rebuilds_period_index(self):
+        day = datetime(2025, 7, 10, 9, 30)
+        h = Habit("indexed", "weekly")
+        h.completion_log = [day]
+        self.manager.add_habit(h)
+        self.manager.save_to_file(self.tmp_path)
+
+        mgr2 = HabitManager()
+        mgr2.load_from_file(self.tmp_path)
+        self.assertTrue(mgr2.habits[0].is_checked(day + timedelta(days=2)))
+        self.assertFalse(mgr2.habits[0].is_checked(day + timedelta(days=7)))
+
+    def test_save_and_load_compact(self):
+        now = datetime(2025, 7, 10, 9, 30)
+        h = Habit("compact", "daily", compact=True)
+        h.completion_log = [now - timedelta(days=i) for i in range(4)]
+        self.manager.add_habit(h)
+        self.manager.save_to_file(self.tmp_path)
+
+        for compact in (False, True):
+            mgr2 = HabitManager(compact=compact)
+            mgr2.load_from_file(self.tmp_path)
+            loaded = mgr2.habits[0]
+            self.assertEqual(loaded.compact, compact)
+            self.assertEqual(sorted(loaded.completion_log), [now - timedelta(days=i) for i in range(3, -1, -1)])
+            self.assertEqual(loaded.get_longest_streak(), 4)
+
+    def test_lookup_by_name(self):
+        h = Habit("read", "daily")
+        self.manager.add_habit(h)
+        self.assertIs(self.manager.get_habit("read"), h)
+        self.assertTrue(self.manager.has_habit("read"))
+        self.assertIn("read", self.manager)
+        self.assertIsNone(self.manager.get_habit("nope"))
+
+        self.assertIs(self.manager.remove_habit("read"), h)
+        self.assertIsNone(self.manager.remove_habit("read"))
+        self.assertFalse(self.manager.has_habit("read"))
+        self.assertEqual(self.manager.get_habits_by_periodicity("daily"), [])
+
+    def test_duplicate_names_rejected(self):
+        self.manager.add_habit(Habit("read", "daily"))
+        with self.assertRaises(ValueError):
+            self.manager.add_habit(Habit("read", "weekly"))
+        self.assertEqual(len(self.manager), 1)
+        self.assertEqual(self.manager.get_habits_by_periodicity("weekly"), [])
+
+    def test_habits_keep_insertion_order(self):
+        for name in ("c", "a", "b"):
+            self.manager.add_habit(Habit(name, "daily"))
+        self.manager.remove_habit("a")
+        self.manager.add_habit(Habit("a", "weekly"))
+        self.assertEqual([h.name for h in self.manager.habits], ["c", "b", "a"])
+
+    def test_load_merges_duplicate_names(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        with open(self.tmp_path, "w") as f:
+            json.dump([
+                {"name": "dup", "periodicity": "daily", "created_at": day.isoformat(),
+                 "completion_log": [day.isoformat()]},
+                {"name": "dup", "periodicity": "daily", "created_at": day.isoformat(),
+                 "completion_log": [(day - timedelta(days=1)).isoformat()]},
+            ], f)
+        self.manager.load_from_file(self.tmp_path)
+        self.assertEqual(len(self.manager.habits), 1)
+        self.assertEqual(self.manager.get_habit("dup").get_longest_streak(), 2)
+
+    def test_iter_json_array_small_chunks(self):
+        data = [{"name": "a ] , [", "n": [1, 2, {"x": "}"}]}, 12345, "text", [], {}]
+        text = "  [ " + " ,\n ".join(json.dumps(v) for v in data) + " ]  "
+        for chunk_size in (1, 2, 3, 7, 1 << 16):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), data)
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "), 1)), [])
+
+    def test_iter_json_array_numbers_cut_by_chunks(self):
+        data = [-25000000000.0, 1.5e-7, 12345678901234567890, -0.25, 3E+10, True, None]
+        text = json.dumps(data)
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), json.loads(text), chunk_size)
+
+    def test_iter_json_array_rejects_malformed(self):
+        for text in ('{"a": 1}', '[{"a": 1} {"b": 2}]', '[{"a": 1}, {"b": ', '[]x', '[1, 2] ,', '[1.5x]'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(io.StringIO(text), 4))
+
+    def test_iter_habits_from_file(self):
+        now = datetime(2025, 7, 10, 9, 0)
+        for i in range(3):
+            h = Habit(f"h{i}", "daily")
+            h.completion_log = [now - timedelta(days=d) for d in range(i + 1)]
+            self.manager.add_habit(h)
+        self.manager.save_to_file(self.tmp_path)
+
+        stream = HabitManager.iter_habits_from_file(self.tmp_path)
+        self.assertEqual(next(stream).name, "h0")
+        summary = get_streak_summary(HabitManager.iter_habits_from_file(self.tmp_path, compact=True))
+        self.assertEqual(summary, {"total_habits": 3, "longest_streak_overall": 3, "average_streak": 2.0})
+
+    @patch('builtins.print')
+    def test_load_is_lazy(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        h = Habit("lazy", "daily")
+        h.completion_log = [day - timedelta(days=i) for i in (0, 1, 2, 4)]
+        self.manager.add_habit(h)
+        self.manager.save_to_file(self.tmp_path)
+
+        mgr2 = HabitManager()
+        mgr2.load_from_file(self.tmp_path)
+        loaded = mgr2.get_habit("lazy")
+        self.assertFalse(loaded.hydrated)
+        self.assertEqual(loaded.get_completion_count(), 4)
+        self.assertEqual(loaded.get_longest_streak(), 3)
+        self.assertEqual(loaded.get_last_completion(), day)
+        self.assertTrue(loaded.is_checked(day))
+        self.assertFalse(loaded.is_checked(day + timedelta(days=1)))
+        self.assertEqual(get_streak_summary(mgr2.habits)["longest_streak_overall"], 3)
+        self.assertEqual([loaded.get_current_streak(day + timedelta(days=i)) for i in (0, 1, 2)], [3, 3, 0])
+        self.assertFalse(loaded.hydrated)
+
+        # Saving again copies the raw log and its metadata without parsing it
+        mgr2.save_to_file(self.tmp_path)
+        self.assertFalse(loaded.hydrated)
+        mgr3 = HabitManager()
+        mgr3.load_from_file(self.tmp_path)
+        self.assertEqual(mgr3.get_habit("lazy").get_current_streak(day), 3)
+        self.assertFalse(mgr3.get_habit("lazy").hydrated)
+
+        # Questions about older periods and changes parse the log
+        self.assertFalse(loaded.is_checked(day - timedelta(days=3)))
+        self.assertTrue(loaded.hydrated)
+        mgr2.check_off_habit("lazy", day + timedelta(days=1))
+        self.assertEqual(loaded.get_completion_count(), 5)
+        self.assertEqual(loaded.get_current_streak(day + timedelta(days=1)), 4)
+
+    @patch('builtins.print')
+    def test_lazy_load_without_metadata(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        with open(self.tmp_path, "w") as f:
+            json.dump([{"name": "old", "periodicity": "weekly", "created_at": day.isoformat(),
+                        "completion_log": [day.isoformat(), (day - timedelta(weeks=1)).isoformat()]}], f)
+        self.manager.load_from_file(self.tmp_path)
+        loaded = self.manager.get_habit("old")
+        self.assertFalse(loaded.hydrated)
+        self.assertEqual(loaded.get_longest_streak(), 2)
+        self.assertTrue(loaded.hydrated)
+        self.assertTrue(loaded.is_checked(day))
+
     def test_load_or_create_sample_data(self):
         # Ensure no file exists
         try:
@@ -0,0 +1,129 @@
+import unittest
+import os
+import json
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from habit import Habit
+from habit_manager import HabitManager
+from journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmp_dir.name, "habits.json")
+        self.journal_path = Journal.path_for(self.snapshot)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_append_and_read(self):
+        journal = Journal(self.journal_path)
+        journal.append("remove", name="a")
+        journal.append("check", name="b", date="2025-07-10T09:00:00")
+        journal.close()
+        records = list(Journal.read(self.journal_path))
+        self.assertEqual([r["op"] for r in records], ["remove", "check"])
+        self.assertEqual(len(Journal(self.journal_path)), 2)
+
+    def test_batch_syncs_once(self):
+        journal = Journal(self.journal_path)
+        with patch("journal.os.fsync") as fsync:
+            with journal.batch():
+                for i in range(5):
+                    journal.append("remove", name=f"h{i}")
+                self.assertEqual(fsync.call_count, 0)
+            self.assertEqual(fsync.call_count, 1)
+        journal.close()
+        self.assertEqual(len(list(Journal.read(self.journal_path))), 5)
+
+    def test_truncated_last_line_is_dropped(self):
+        with open(self.journal_path, "w") as f:
+            f.write(json.dumps({"op": "remove", "name": "a"}) + "\n")
+            f.write('{"op": "check", "na')
+        journal = Journal(self.journal_path)
+        self.assertEqual(len(journal), 1)
+        journal.append("remove", name="b")
+        journal.close()
+        self.assertEqual([r["name"] for r in Journal.read(self.journal_path)], ["a", "b"])
+
+    @patch('builtins.print')
+    def test_changes_survive_without_save(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        manager = HabitManager()
+        manager.add_habit(Habit("walk", "daily"))
+        manager.add_habit(Habit("budget", "weekly"))
+        manager.save_to_file(self.snapshot)
+
+        manager.open_journal(self.snapshot)
+        manager.add_habit(Habit("read", "daily"))
+        manager.check_off_habit("walk", day)
+        manager.check_off_habit("walk", day - timedelta(days=1))
+        manager.uncheck_habit("walk", day)
+        manager.check_off_habit("read", day)
+        manager.remove_habit("budget")
+        manager.close_storage()  # Simulate a crash: no snapshot written
+
+        reloaded = HabitManager()
+        reloaded.load_from_file(self.snapshot)
+        self.assertEqual([h.name for h in reloaded.habits], ["walk", "read"])
+        self.assertEqual(list(reloaded.get_habit("walk").completion_log), [day - timedelta(days=1)])
+        self.assertTrue(reloaded.get_habit("read").is_checked(day))
+
+    @patch('builtins.print')
+    def test_compaction_writes_snapshot(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        manager = HabitManager()
+        manager.add_habit(Habit("walk", "daily"))
+        manager.save_to_file(self.snapshot)
+        manager.open_journal(self.snapshot, compact_every=3)
+        for i in range(4):
+            manager.check_off_habit("walk", day - timedelta(days=i))
+
+        self.assertEqual(len(manager.storage.journal), 1)
+        with open(self.snapshot) as f:
+            self.assertEqual(len(json.load(f)[0]["completion_log"]), 3)
+
+        manager.checkpoint()
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        reloaded = HabitManager()
+        reloaded.load_from_file(self.snapshot)
+        self.assertEqual(reloaded.get_habit("walk").get_longest_streak(), 4)
+
+    @patch('builtins.print')
+    def test_compaction_waits_for_batch(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        manager = HabitManager()
+        manager.add_habit(Habit("walk", "daily"))
+        manager.save_to_file(self.snapshot)
+        manager.open_journal(self.snapshot, compact_every=3)
+        with manager.batch():
+            for i in range(5):
+                manager.check_off_habit("walk", day - timedelta(days=i))
+            self.assertEqual(len(manager.storage.journal), 5)  # Not reset mid-batch
+        self.assertEqual(len(manager.storage.journal), 0)
+        with open(self.snapshot) as f:
+            self.assertEqual(len(json.load(f)[0]["completion_log"]), 5)
+        manager.close_storage()
+
+    @patch('builtins.print')
+    def test_replay_is_idempotent(self, mock_print):
+        day = datetime(2025, 7, 10, 9, 0)
+        manager = HabitManager()
+        manager.open_journal(self.snapshot)
+        manager.add_habit(Habit("walk", "daily"))
+        manager.check_off_habit("walk", day)
+        manager.save_to_file(self.snapshot)  # Snapshot already contains the journaled changes
+        manager.close_storage()
+
+        reloaded = HabitManager()
+        reloaded.load_from_file(self.snapshot)
+        self.assertEqual(len(reloaded.habits), 1)
+        self.assertEqual(len(reloaded.get_habit("walk").completion_log), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
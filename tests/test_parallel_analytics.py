@@ -0,0 +1,84 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from analytics import get_streak_summary
+from habit import Habit
+from habit_manager import HabitManager, iter_json_array
+from parallel_analytics import merge_partials, parallel_streak_summary
+
+
+class TestParallelAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        self.habits = []
+        for i in range(25):
+            periodicity = "weekly" if i % 3 == 0 else "daily"
+            step = 7 if periodicity == "weekly" else 1
+            h = Habit(f"h{i}", periodicity, compact=i % 2 == 0)
+            # Streaks of length i % 5 + 1, broken once, with a duplicate entry in one period
+            h.completion_log = [day - timedelta(days=step * k) for k in range(i % 5 + 1)] + \
+                               [day - timedelta(days=step * 9), day - timedelta(days=step * 9, hours=1)]
+            self.habits.append(h)
+
+    def expected(self):
+        summary = get_streak_summary(self.habits)
+        summary["total_completions"] = sum(h.get_completion_count() for h in self.habits)
+        return summary
+
+    def check(self, result, expected):
+        for key, value in expected.items():
+            self.assertEqual(result[key], value, key)
+        self.assertEqual(sum(result["streak_histogram"].values()), expected["total_habits"])
+
+    def test_matches_serial_summary(self):
+        expected = self.expected()
+        for workers in (1, 2):
+            self.check(parallel_streak_summary(self.habits, max_workers=workers, chunk_size=4), expected)
+
+    def test_raw_records(self):
+        expected = self.expected()
+        buffer = io.StringIO()
+        records = [{"name": h.name, "periodicity": h.periodicity,
+                    "completion_log": h.serialized_log()} for h in self.habits]
+        json.dump(records, buffer)
+        buffer.seek(0)
+        result = parallel_streak_summary(iter_json_array(buffer), max_workers=2, chunk_size=7)
+        self.check(result, expected)
+        self.assertEqual(result["streak_histogram"], {1: 5, 2: 5, 3: 5, 4: 5, 5: 5})
+
+    def test_known_metrics_skip_the_pool(self):
+        parsed = [h for h in self.habits if not h.compact]  # Compact logs are analysed in workers
+        expected = get_streak_summary(parsed)
+        with patch("parallel_analytics.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            result = parallel_streak_summary(parsed, max_workers=2, chunk_size=4)
+        self.assertEqual(result["longest_streak_overall"], expected["longest_streak_overall"])
+        self.assertEqual(result["total_habits"], len(parsed))
+
+    def test_saved_file_skips_the_pool(self):
+        expected = self.expected()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for suffix in (".json", ".bin"):
+                filename = os.path.join(tmp_dir, "habits" + suffix)
+                manager = HabitManager()
+                manager.load_habits(self.habits)
+                manager.save_to_file(filename, merge=False)
+                loaded = list(HabitManager.iter_habits_from_file(filename))
+                with patch("parallel_analytics.ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+                    result = parallel_streak_summary(loaded, max_workers=2, chunk_size=4)
+                self.check(result, expected)
+                self.assertFalse(any(h.hydrated for h in loaded))
+
+    def test_empty_and_merge(self):
+        self.assertEqual(parallel_streak_summary([], max_workers=2)["total_habits"], 0)
+        merged = merge_partials([])
+        self.assertEqual(merged[:4], (0, 0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
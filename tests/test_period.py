@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime, timedelta
+
+from period import (PERIODICITIES, day_to_period, month_of_day, period_days, period_number,
+                    period_start, week_of_day)
+
+
+class TestPeriod(unittest.TestCase):
+
+    def test_weeks_match_iso_calendar(self):
+        """Same period number iff same ISO (year, week), including 53-week years."""
+        day = datetime(2019, 12, 1)
+        previous = None
+        while day < datetime(2027, 1, 31):
+            iso_year, iso_week, _ = day.isocalendar()
+            number = period_number("weekly", day)
+            if previous is not None:
+                same_week = (iso_year, iso_week) == previous[0]
+                self.assertEqual(number, previous[1] if same_week else previous[1] + 1)
+            previous = (iso_year, iso_week), number
+            day += timedelta(days=1)
+        # 2020-W53 and 2021-W01 are adjacent
+        self.assertEqual(period_number("weekly", datetime(2021, 1, 4)),
+                         period_number("weekly", datetime(2020, 12, 31)) + 1)
+
+    def test_months(self):
+        self.assertEqual(period_number("monthly", datetime(2025, 1, 31)),
+                         period_number("monthly", datetime(2024, 12, 1)) + 1)
+        self.assertEqual(period_start("monthly", period_number("monthly", datetime(2024, 2, 29))),
+                         datetime(2024, 2, 1))
+        for year in (1850, 1900, 2024, 2200, 2300):  # Inside and outside the lookup table
+            for day in (datetime(year, 1, 1), datetime(year, 2, 28), datetime(year, 12, 31)):
+                self.assertEqual(month_of_day(day.toordinal()), year * 12 + day.month - 1)
+
+    def test_day_ordinals_and_bounds(self):
+        day = datetime(2020, 12, 31, 18, 30)
+        for periodicity in PERIODICITIES:
+            number = period_number(periodicity, day)
+            self.assertEqual(day_to_period(periodicity, day.toordinal()), number)
+            first, end = period_days(periodicity, day)
+            self.assertEqual(period_number(periodicity, datetime.fromordinal(first)), number)
+            self.assertEqual(period_number(periodicity, datetime.fromordinal(end)), number + 1)
+            self.assertEqual(period_number(periodicity, datetime.fromordinal(first - 1)), number - 1)
+        self.assertEqual(period_days("weekly", day), (datetime(2020, 12, 28).toordinal(),
+                                                      datetime(2021, 1, 4).toordinal()))
+        self.assertEqual(week_of_day(1), 0)  # Ordinal 1 is a Monday
+
+    def test_unknown_periodicity(self):
+        with self.assertRaises(ValueError):
+            period_number("yearly", datetime(2025, 1, 1))
+        with self.assertRaises(ValueError):
+            day_to_period("yearly", 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import io
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import analytics
+import commands
+from habit import Habit
+from habit_manager import HabitManager
+from profiling import LatencyHistogram, Profiler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, "habits.json")
+        self.profiler = Profiler()
+
+    def tearDown(self):
+        self.profiler.uninstall()
+        self.tmp_dir.cleanup()
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for ns in [100] * 90 + [5000] * 9 + [1_000_000]:
+            histogram.add(ns)
+        self.assertEqual((histogram.count, histogram.max_ns), (100, 1_000_000))
+        self.assertEqual(histogram.total_ns, 9000 + 45000 + 1_000_000)
+        self.assertEqual(histogram.percentile(0.5), 128)
+        self.assertEqual(histogram.percentile(0.95), 8192)
+        self.assertEqual(histogram.percentile(1.0), 1_000_000)
+        self.assertEqual(histogram.nonempty_buckets(), [(128, 90), (8192, 9), (1 << 20, 1)])
+
+    def test_counts_calls_and_restores(self):
+        original_save = HabitManager.save_to_file
+        original_metrics = analytics.get_habit_metrics
+        self.profiler.install()
+        self.assertIsNot(HabitManager.save_to_file, original_save)
+        # Names imported with `from analytics import ...` are timed too
+        self.assertIs(commands.get_habit_metrics, analytics.get_habit_metrics)
+
+        manager = HabitManager()
+        habit = Habit("walk", "daily")
+        habit.completion_log = [datetime(2025, 7, 10) - timedelta(days=i) for i in range(10)]
+        manager.add_habit(habit)
+        manager.save_to_file(self.file)
+        loaded = HabitManager()
+        loaded.load_from_file(self.file)
+        analytics.get_streak_summary(loaded.habits)
+
+        stats = self.profiler.stats
+        self.assertEqual(stats["HabitManager.save_to_file"].count, 1)
+        self.assertEqual(stats["HabitManager.load_from_file"].count, 1)
+        self.assertEqual(stats["analytics.get_streak_summary"].count, 1)
+        self.assertGreater(stats["HabitManager.save_to_file"].total_ns, 0)
+
+        out = io.StringIO()
+        self.profiler.report(out)
+        self.assertIn("HabitManager.save_to_file", out.getvalue())
+        self.assertNotIn("HabitManager.uncheck_habit", out.getvalue())  # Never called
+
+        self.profiler.uninstall()
+        self.assertIs(HabitManager.save_to_file, original_save)
+        self.assertIs(analytics.get_habit_metrics, original_metrics)
+        self.assertIs(commands.get_habit_metrics, original_metrics)
+
+    def test_cli_profile_flag(self):
+        pstats_file = os.path.join(self.tmp_dir.name, "session.prof")
+        result = subprocess.run([sys.executable, "main.py", "add", "walk", "daily", "--file", self.file,
+                                 "--profile-out", pstats_file],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertIn("Profile (inclusive wall time per operation):", result.stderr)
+        self.assertIn("JsonStorage.record", result.stderr)
+        self.assertIn("Latency histograms", result.stderr)
+        self.assertTrue(pstats.Stats(pstats_file).total_calls > 0)
+
+        env = dict(os.environ, HABIT_PROFILE="1")
+        result = subprocess.run([sys.executable, "main.py", "summary", "--file", self.file],
+                                cwd=ROOT, capture_output=True, text=True, check=True, env=env)
+        self.assertIn("HabitManager.load_from_file", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
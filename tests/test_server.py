@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from client import send_request
+from habit import Habit
+from habit_manager import HabitManager
+from server import HabitServer
+
+
+class TestHabitServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp_dir.name, "habits.json")
+        self.socket = os.path.join(self.tmp_dir.name, "habits.sock")
+        manager = HabitManager()
+        manager.add_habit(Habit("walk", "daily"))
+        manager.add_habit(Habit("budget", "weekly"))
+        manager.save_to_file(self.file)
+
+        # Run the server on its own event loop in a background thread
+        self.server = HabitServer(self.file, self.socket)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(5)
+
+    def tearDown(self):
+        self.stop_server()
+        self.tmp_dir.cleanup()
+
+    def stop_server(self):
+        if self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+
+    def request(self, command, **fields):
+        return send_request(self.socket, {"command": command, **fields})
+
+    def test_check_and_status(self):
+        day = datetime(2025, 7, 10, 9, 0)
+        response = self.request("check", name="walk", date=day.isoformat())
+        self.assertEqual(response["rows"], [{"name": "walk", "command": "check", "changed": True}])
+        response = self.request("status", date=day.isoformat())
+        self.assertEqual([(r["name"], r["checked"]) for r in response["rows"]], [("walk", True), ("budget", False)])
+        self.assertEqual(response["rows"][0]["last_done"], day.isoformat())
+
+    def test_errors(self):
+        self.assertFalse(self.request("check", name="swim")["ok"])
+        self.assertFalse(self.request("add", name="walk", periodicity="daily")["ok"])
+        self.assertFalse(self.request("explode")["ok"])
+        for fields in ({"periodicity": "yearly"}, {"periodicity": None}, {}):
+            response = self.request("add", name="swim", **fields)
+            self.assertFalse(response["ok"])
+            self.assertIn("Periodicity must be one of", response["error"])
+        self.assertEqual([r["name"] for r in self.request("status")["rows"]], ["walk", "budget"])
+
+    def test_concurrent_writes_are_all_persisted(self):
+        start = datetime(2025, 1, 1, 8, 0)
+        days = [start + timedelta(days=i) for i in range(100)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            responses = list(pool.map(lambda d: self.request("check", name="walk", date=d.isoformat()), days))
+        self.assertTrue(all(r["ok"] and r["rows"][0]["changed"] for r in responses))
+
+        summary = self.request("summary")["rows"][0]
+        self.assertEqual((summary["total_completions"], summary["longest_streak"]), (100, 100))
+
+        self.stop_server()
+        self.assertFalse(os.path.exists(self.socket))
+        loaded = HabitManager()
+        loaded.load_from_file(self.file)
+        self.assertEqual(loaded.get_habit("walk").get_longest_streak(), 100)
+
+    def test_second_server_is_refused(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(HabitServer(self.file, self.socket).start())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from habit import Habit
+from habit_manager import HabitManager
+from shard_store import HABIT_BYTES, ShardedHabitStore, user_summary
+
+
+class TestShardedHabitStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.day = datetime(2025, 7, 10, 9, 0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def fill(self, store: ShardedHabitStore, user: str, days: int):
+        with store.open(user) as manager:
+            manager.add_habit(Habit("walk", "daily"))
+            for i in range(days):
+                manager.check_off_habit("walk", self.day - timedelta(days=i))
+
+    def test_users_get_their_own_files(self):
+        store = ShardedHabitStore(self.tmp_dir.name, partitions=4)
+        self.fill(store, "alice", 3)
+        self.fill(store, "bob", 1)
+        store.close()
+
+        self.assertTrue(store.path_for("alice").startswith(self.tmp_dir.name + os.sep))
+        self.assertEqual(store.users(), ["alice", "bob"])
+        manager = HabitManager()
+        manager.load_from_file(store.path_for("alice"))
+        self.assertEqual(manager.get_habit("walk").get_completion_count(), 3)
+
+        with self.assertRaises(ValueError):
+            store.path_for("../etc")
+
+    def test_lru_eviction_writes_back(self):
+        store = ShardedHabitStore(self.tmp_dir.name, max_open=2)
+        for user in ("a", "b", "c"):
+            self.fill(store, user, 2)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.write_backs, 1)  # 'a' was evicted
+        self.assertTrue(os.path.exists(store.path_for("a")))
+        self.assertFalse(os.path.exists(store.path_for("c")))
+
+        # Reading an evicted user loads it again; unchanged managers are not rewritten
+        with store.open("a") as manager:
+            self.assertEqual(manager.get_habit("walk").get_completion_count(), 2)
+        self.assertEqual(store.loads, 4)
+        store.close()
+        self.assertEqual(store.write_backs, 3)  # 'b' and 'c', but not 'a' again
+
+    def test_removing_unloaded_habit_is_written_back(self):
+        store = ShardedHabitStore(self.tmp_dir.name, max_open=1)
+        with store.open("a") as manager:
+            manager.add_habit(Habit("walk", "daily"))
+            manager.add_habit(Habit("read", "daily"))
+        store.close()
+
+        # The reloaded habits are lazy (version 1); removing one must still count as a change
+        with store.open("a") as manager:
+            manager.remove_habit("read")
+        self.fill(store, "b", 1)  # Evicts 'a'
+        store.close()
+        manager = HabitManager()
+        manager.load_from_file(store.path_for("a"))
+        self.assertEqual([h.name for h in manager.habits], ["walk"])
+
+    def test_memory_cap(self):
+        store = ShardedHabitStore(self.tmp_dir.name, max_bytes=2 * HABIT_BYTES)
+        for user in ("a", "b", "c"):
+            self.fill(store, user, 0)
+        self.assertEqual(len(store), 2)
+        self.assertLessEqual(store.cached_bytes, 2 * HABIT_BYTES)
+
+        # Open managers are never evicted, even over the cap
+        with store.open("a"), store.open("b"), store.open("c"):
+            self.assertEqual(len(store), 3)
+        self.assertEqual(len(store), 2)
+        store.close()
+
+    def test_map_users_and_summary(self):
+        store = ShardedHabitStore(self.tmp_dir.name, partitions=2)
+        self.fill(store, "alice", 3)
+        self.fill(store, "bob", 1)
+        with store.open("bob") as manager:
+            manager.add_habit(Habit("read", "weekly"))
+
+        # Cached changes are flushed before the workers load the files
+        results = store.map_users(user_summary, max_workers=2)
+        self.assertEqual(results["alice"]["longest_streak"], 3)
+        self.assertEqual(results["bob"]["total_habits"], 2)
+        self.assertEqual(store.summary(max_workers=2), {
+            "users": 2, "total_habits": 3, "total_completions": 4,
+            "longest_streak": 3, "average_streak": 1.33})
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from habit import Habit
+from habit_manager import HabitManager
+from snapshot import EncodedLog, is_binary_snapshot, iter_snapshot_habits
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.json_file = os.path.join(self.tmp_dir.name, "habits.json")
+        self.bin_file = os.path.join(self.tmp_dir.name, "habits.bin")
+        day = datetime(2025, 7, 10, 9, 0)
+
+        self.manager = HabitManager()
+        same_time = Habit("walk", "daily")
+        same_time.completion_log = [day - timedelta(days=i) for i in range(400)]
+        varying = Habit("read", "daily")
+        varying.completion_log = [day - timedelta(days=i * 3, hours=i % 5, seconds=i) for i in range(50)]
+        precise = Habit("budget", "weekly")
+        precise.completion_log = [day - timedelta(weeks=i, microseconds=i * 1234) for i in range(20)]
+        precise.completion_log.append(datetime(1999, 12, 31, 23, 59, 59))  # Deltas needing several bytes
+        compact = Habit("stretch", "daily", compact=True)
+        compact.completion_log = [day - timedelta(days=i, minutes=i) for i in range(30)]
+        for habit in (same_time, varying, precise, compact, Habit("new", "weekly")):
+            self.manager.add_habit(habit)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def load(self, filename: str, compact: bool = False) -> HabitManager:
+        manager = HabitManager(compact=compact)
+        manager.load_from_file(filename)
+        return manager
+
+    def assertSameHabits(self, first: HabitManager, second: HabitManager):
+        self.assertEqual([h.name for h in first.habits], [h.name for h in second.habits])
+        for a, b in zip(first.habits, second.habits):
+            self.assertEqual((a.periodicity, a.created_at), (b.periodicity, b.created_at))
+            self.assertEqual(a.get_completion_count(), b.get_completion_count())
+            self.assertEqual(a.get_longest_streak(), b.get_longest_streak())
+            self.assertEqual(a.get_last_completion(), b.get_last_completion())
+            self.assertEqual(list(a.completion_log), list(b.completion_log))
+
+    def test_round_trip_matches_json(self):
+        self.manager.save_to_file(self.json_file)
+        self.manager.save_to_file(self.bin_file)
+        self.assertTrue(is_binary_snapshot(self.bin_file))
+        self.assertFalse(is_binary_snapshot(self.json_file))
+        self.assertLess(os.path.getsize(self.bin_file) * 10, os.path.getsize(self.json_file))
+
+        from_json, from_bin = self.load(self.json_file), self.load(self.bin_file)
+        self.assertSameHabits(from_json, from_bin)
+        self.assertSameHabits(self.manager, from_bin)
+        self.assertSameHabits(self.load(self.json_file, compact=True), self.load(self.bin_file, compact=True))
+
+        # Binary -> JSON -> binary gives the same files
+        other_json = os.path.join(self.tmp_dir.name, "other.json")
+        other_bin = os.path.join(self.tmp_dir.name, "other.bin")
+        self.load(self.bin_file).save_to_file(other_json)
+        self.load(other_json).save_to_file(other_bin)
+        with open(self.bin_file, "rb") as a, open(other_bin, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_logs_decoded_on_demand(self):
+        self.manager.save_to_file(self.bin_file)
+        loaded = self.load(self.bin_file)
+        walk = loaded.get_habit("walk")
+        self.assertIsInstance(walk.raw_log, EncodedLog)
+        self.assertEqual(walk.get_completion_count(), 400)
+        self.assertEqual(walk.get_longest_streak(), 400)
+        self.assertTrue(walk.is_checked(datetime(2025, 7, 10)))
+        self.assertFalse(walk.hydrated)
+
+        # Saving copies undecoded logs; changes decode just that habit
+        loaded.check_off_habit("read", datetime(2025, 7, 11))
+        self.assertFalse(walk.hydrated)
+        loaded.save_to_file(self.bin_file)
+        self.assertFalse(walk.hydrated)
+        reloaded = self.load(self.bin_file)
+        self.assertEqual(reloaded.get_habit("read").get_completion_count(), 51)
+        self.assertEqual(list(reloaded.get_habit("walk").completion_log),
+                         list(self.manager.get_habit("walk").completion_log))
+
+    def test_rejects_other_files(self):
+        self.manager.save_to_file(self.json_file)
+        with self.assertRaises(ValueError):
+            list(iter_snapshot_habits(self.json_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from habit import Habit
+from habit_manager import HabitManager
+from sqlite_storage import SqliteStorage, migrate_json_to_sqlite
+
+
+class TestSqliteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "habits.db")
+        self.day = datetime(2025, 7, 10, 9, 0)
+
+        self.manager = HabitManager()
+        walk = Habit("walk", "daily")
+        walk.completion_log = [self.day - timedelta(days=i) for i in (0, 1, 2, 5)]
+        budget = Habit("budget", "weekly")
+        budget.completion_log = [self.day - timedelta(weeks=i) for i in (1, 2)]
+        self.manager.add_habit(walk)
+        self.manager.add_habit(budget)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load(self):
+        storage = SqliteStorage(self.db_path)
+        storage.save(self.manager)
+        storage.close()
+
+        loaded = HabitManager()
+        storage = SqliteStorage(self.db_path)
+        storage.load(loaded)
+        storage.close()
+        self.assertEqual([h.name for h in loaded.habits], ["walk", "budget"])
+        self.assertEqual(sorted(loaded.get_habit("walk").completion_log),
+                         sorted(self.manager.get_habit("walk").completion_log))
+
+    def test_queries_match_in_memory_results(self):
+        storage = SqliteStorage(self.db_path)
+        storage.save(self.manager)
+        self.assertEqual(storage.habit_count(), 2)
+        self.assertEqual(storage.longest_streaks(), {"walk": 3, "budget": 2})
+        self.assertEqual(storage.missed_habits(self.day), [("budget", "weekly")])
+        self.assertEqual(storage.missed_habits(self.day + timedelta(days=1)),
+                         [("walk", "daily"), ("budget", "weekly")])
+        storage.close()
+
+    def test_current_streaks_match_habits(self):
+        storage = SqliteStorage(self.db_path)
+        storage.save(self.manager)
+        for days in range(-10, 20):
+            date = self.day + timedelta(days=days)
+            self.assertEqual(storage.current_streaks(date),
+                             {h.name: h.get_current_streak(date) for h in self.manager.habits}, date)
+            self.assertEqual(storage.is_checked("walk", date), self.manager.get_habit("walk").is_checked(date))
+        self.assertIsNone(storage.is_checked("swim", self.day))
+        self.assertEqual(storage.list_habits(), [("walk", "daily"), ("budget", "weekly")])
+        storage.close()
+
+    @patch('builtins.print')
+    def test_changes_are_recorded(self, mock_print):
+        storage = SqliteStorage(self.db_path)
+        storage.save(self.manager)
+        self.manager.attach_storage(storage)
+        self.manager.check_off_habit("budget", self.day)
+        self.manager.uncheck_habit("walk", self.day - timedelta(days=1))
+        self.manager.add_habit(Habit("read", "daily"))
+        self.manager.check_off_habit("read", self.day)
+        self.manager.remove_habit("walk")
+
+        self.assertEqual(storage.longest_streaks(), {"budget": 3, "read": 1})
+        self.assertEqual(storage.missed_habits(self.day), [])
+        self.manager.close_storage()
+
+    def test_migrate_from_json(self):
+        json_path = os.path.join(self.tmp_dir.name, "habits.json")
+        self.manager.save_to_file(json_path)
+        self.assertEqual(migrate_json_to_sqlite(json_path, self.db_path), 2)
+
+        loaded = HabitManager()
+        storage = SqliteStorage(self.db_path)
+        storage.load(loaded)
+        storage.close()
+        self.assertEqual(loaded.get_longest_streak_for_habit("walk"), 3)
+        self.assertEqual(loaded.get_longest_streak_for_habit("budget"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
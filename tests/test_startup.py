@@ -0,0 +1,56 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from habit import Habit
+from habit_manager import HabitManager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only specific code paths need and must not be loaded at startup
+HEAVY_MODULES = {"tabulate", "sqlite3", "csv", "numpy", "habit", "habit_manager", "analytics", "sqlite_storage",
+                 "profiling", "cProfile", "table_view"}
+
+
+def import_times(*args):
+    """
+    Run Python with -X importtime and return {module: cumulative microseconds}.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_main_is_lightweight(self):
+        # The import time itself is tracked by benchmarks/bench_suite.py (main.import)
+        times = import_times("-c", "import main")
+        self.assertIn("main", times)
+        self.assertFalse(HEAVY_MODULES & set(times))
+
+    def test_status_uses_summary_without_habit_modules(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "habits.json")
+            manager = HabitManager()
+            habit = Habit("walk", "daily")
+            habit.completion_log = [datetime(2025, 7, 10, 9, 0)]
+            manager.add_habit(habit)
+            manager.save_to_file(filename)
+
+            times = import_times("main.py", "status", "--file", filename, "--date", "2025-07-10")
+            self.assertIn("summary", times)
+            self.assertFalse(HEAVY_MODULES & set(times))
+
+
+if __name__ == "__main__":
+    unittest.main()
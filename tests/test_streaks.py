@@ -0,0 +1,82 @@
+import unittest
+import random
+
+from streaks import StreakEngine
+
+
+def brute_force(periods):
+    """Reference implementation: segments from a sorted scan."""
+    segments = []
+    for p in sorted(set(periods)):
+        if segments and segments[-1][1] == p - 1:
+            segments[-1][1] = p
+        else:
+            segments.append([p, p])
+    return [tuple(s) for s in segments]
+
+
+class TestStreakEngine(unittest.TestCase):
+
+    def test_build_from_unsorted_periods(self):
+        engine = StreakEngine([5, 3, 4, 10, 4, 11])
+        self.assertEqual(engine.segments(), [(3, 5), (10, 11)])
+        self.assertEqual(engine.longest, 3)
+        self.assertEqual(engine.length_histogram(), {3: 1, 2: 1})
+
+    def test_add_merges_neighbours(self):
+        engine = StreakEngine([1, 2, 4, 5])
+        self.assertTrue(engine.add(3))
+        self.assertFalse(engine.add(3))
+        self.assertEqual(engine.segments(), [(1, 5)])
+        self.assertEqual(engine.longest, 5)
+
+    def test_remove_splits_segment(self):
+        engine = StreakEngine(range(1, 8))
+        self.assertTrue(engine.remove(4))
+        self.assertFalse(engine.remove(4))
+        self.assertEqual(engine.segments(), [(1, 3), (5, 7)])
+        self.assertEqual(engine.longest, 3)
+        engine.remove(1)
+        engine.remove(5)
+        self.assertEqual(engine.longest, 2)
+
+    def test_current_streak(self):
+        engine = StreakEngine([1, 2, 3, 7, 8])
+        self.assertEqual(engine.current(8), 2)
+        self.assertEqual(engine.current(9), 2)  # Period 9 can still be completed
+        self.assertEqual(engine.current(10), 0)
+        self.assertEqual(engine.current(3), 3)
+        self.assertEqual(engine.current(2), 2)  # Only counts up to the reference period
+        self.assertEqual(engine.current(0), 0)
+        self.assertEqual(StreakEngine().current(5), 0)
+
+    def test_count_between(self):
+        engine = StreakEngine([1, 2, 3, 7, 8, 20])
+        self.assertEqual(engine.count_between(2, 7), 3)
+        self.assertEqual(engine.count_between(0, 100), 6)
+        self.assertEqual(engine.count_between(9, 19), 0)
+        self.assertEqual(engine.count_between(5, 4), 0)
+
+    def test_random_updates_match_brute_force(self):
+        rng = random.Random(42)
+        engine = StreakEngine()
+        present = set()
+        for _ in range(2000):
+            p = rng.randrange(100)
+            if rng.random() < 0.6:
+                self.assertEqual(engine.add(p), p not in present)
+                present.add(p)
+            else:
+                self.assertEqual(engine.remove(p), p in present)
+                present.discard(p)
+            expected = brute_force(present)
+            self.assertEqual(engine.segments(), expected)
+            self.assertEqual(engine.longest, max((e - s + 1 for s, e in expected), default=0))
+            first = rng.randrange(100)
+            last = first + rng.randrange(-5, 30)
+            self.assertEqual(engine.count_between(first, last),
+                             sum(1 for q in present if first <= q <= last))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime
+
+from habit import Habit
+from habit_manager import HabitManager
+from table_view import HabitTable
+
+DAY = datetime(2025, 7, 10, 9, 0)
+
+
+class TestHabitTable(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = HabitManager()
+        for i in range(25):
+            self.manager.add_habit(Habit(f"habit {i:02d}", "daily" if i % 2 == 0 else "weekly"))
+        self.table = HabitTable(page_size=10)
+
+    def test_pages(self):
+        text = self.table.render(self.manager, DAY)
+        self.assertIn("Habit 00", text)
+        self.assertNotIn("Habit 10", text)
+        self.assertTrue(text.endswith("Habits 1-10 of 25 (page 1/3)"))
+        self.assertEqual(self.table.rows_built, 10)
+
+        self.assertTrue(self.table.next_page(25))
+        self.assertTrue(self.table.next_page(25))
+        self.assertFalse(self.table.next_page(25))
+        text = self.table.render(self.manager, DAY)
+        self.assertIn("│  25 │", text)  # Rows keep their number in manager.habits
+        self.assertTrue(text.endswith("Habits 21-25 of 25 (page 3/3)"))
+
+        # Removing habits moves back to the new last page
+        for i in range(15, 25):
+            self.manager.remove_habit(f"habit {i}")
+        self.assertTrue(self.table.render(self.manager, DAY).endswith("(page 2/2)"))
+        self.assertTrue(self.table.previous_page())
+        self.assertFalse(self.table.previous_page())
+
+    def test_single_page_without_page_line(self):
+        table = HabitTable(page_size=0)
+        text = table.render(self.manager, DAY)
+        self.assertIn("Habit 24", text)
+        self.assertNotIn("page", text)
+
+    def test_only_changed_rows_are_rebuilt(self):
+        first = self.table.render(self.manager, DAY)
+        self.assertIs(self.table.render(self.manager, DAY), first)
+        self.assertEqual(self.table.rows_built, 10)
+
+        self.manager.check_off_habit("habit 03", DAY)
+        text = self.table.render(self.manager, DAY)
+        self.assertEqual(self.table.rows_built, 11)
+        self.assertIn("│   4 │ [x]     │ Habit 03", text)
+
+        # Changes to habits on other pages do not redraw this one
+        self.manager.check_off_habit("habit 20", DAY)
+        self.assertIs(self.table.render(self.manager, DAY), text)
+        self.assertEqual(self.table.rows_built, 11)
+
+        # A new session date rebuilds the check boxes
+        self.table.render(self.manager, datetime(2025, 7, 11))
+        self.assertEqual(self.table.rows_built, 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import importlib
+import random
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from habit import Habit
+import vector_analytics
+from vector_analytics import compute_metrics, get_streak_summary
+from analytics import get_habit_metrics, get_streak_summary as scalar_streak_summary
+
+
+def random_habits(count, seed=1):
+    rng = random.Random(seed)
+    end = datetime(2025, 7, 1, 8, 0)
+    habits = []
+    for i in range(count):
+        periodicity = rng.choice(["daily", "weekly"])
+        habit = Habit(f"habit {i}", periodicity)
+        days = rng.sample(range(120), rng.randint(0, 60))
+        habit.completion_log = [end - timedelta(days=d, hours=rng.randint(0, 8)) for d in days]
+        habits.append(habit)
+    return habits
+
+
+@unittest.skipUnless(vector_analytics.HAS_NUMPY, "NumPy not installed")
+class TestVectorAnalytics(unittest.TestCase):
+
+    def test_numpy_matches_pure_python(self):
+        habits = random_habits(200)
+        session_date = datetime(2025, 7, 1, 12, 0)
+        vectorized = compute_metrics(habits, session_date, use_numpy=True)
+        fallback = compute_metrics(habits, session_date, use_numpy=False)
+        self.assertEqual(vectorized, fallback)
+
+    def test_compact_logs_match_list_logs(self):
+        habits = random_habits(100, seed=3)
+        mixed = []
+        for i, habit in enumerate(habits):
+            copy = Habit(habit.name, habit.periodicity, compact=i % 2 == 0)
+            copy.completion_log = list(habit.completion_log)
+            mixed.append(copy)
+        session_date = datetime(2025, 7, 1, 12, 0)
+        self.assertEqual(compute_metrics(mixed, session_date, use_numpy=True),
+                         compute_metrics(habits, session_date, use_numpy=False))
+
+    def test_metrics_of_simple_habit(self):
+        habit = Habit("read", "daily")
+        base = datetime(2025, 7, 10, 9, 0)
+        habit.completion_log = [base - timedelta(days=d) for d in (0, 1, 2, 5, 6)] + [base]
+        metrics = compute_metrics([habit], base, window=10, use_numpy=True)["read"]
+        self.assertEqual(metrics["completions"], 6)
+        self.assertEqual(metrics["longest_streak"], 3)
+        self.assertEqual(metrics["current_streak"], 3)
+        self.assertAlmostEqual(metrics["adherence"], 0.5)
+
+    def test_current_streak_ends_before_session_period(self):
+        habit = Habit("gym", "weekly")
+        base = datetime(2025, 7, 10, 9, 0)
+        habit.completion_log = [base - timedelta(weeks=w) for w in (1, 2, 3)]
+        self.assertEqual(compute_metrics([habit], base, use_numpy=True)["gym"]["current_streak"], 3)
+        later = base + timedelta(weeks=1)
+        self.assertEqual(compute_metrics([habit], later, use_numpy=True)["gym"]["current_streak"], 0)
+
+    def test_habits_without_completions(self):
+        habits = [Habit("a", "daily"), Habit("b", "weekly")]
+        for use_numpy in (True, False):
+            metrics = compute_metrics(habits, use_numpy=use_numpy)
+            self.assertEqual(metrics["a"], {"completions": 0, "longest_streak": 0,
+                                            "current_streak": 0, "adherence": 0.0})
+
+    def test_streak_summary_matches_analytics(self):
+        habits = random_habits(50, seed=7)
+        self.assertEqual(get_streak_summary(habits), scalar_streak_summary(habits))
+        self.assertEqual(get_streak_summary([]), scalar_streak_summary([]))
+
+
+class TestPurePythonFallback(unittest.TestCase):
+    """Runs with or without NumPy installed."""
+
+    def test_fallback_matches_analytics(self):
+        habits = random_habits(100, seed=5)
+        session_date = datetime(2025, 7, 1, 12, 0)
+        with patch.object(vector_analytics, "HAS_NUMPY", False):
+            metrics = compute_metrics(habits, session_date)
+            summary = get_streak_summary(habits)
+            with self.assertRaises(ImportError):
+                compute_metrics(habits, session_date, use_numpy=True)
+        for habit in habits:
+            expected = get_habit_metrics(habit)
+            self.assertEqual(metrics[habit.name]["completions"], expected["completions"])
+            self.assertEqual(metrics[habit.name]["longest_streak"], expected["longest_streak"])
+            self.assertEqual(metrics[habit.name]["current_streak"], habit.get_current_streak(session_date))
+        self.assertEqual(summary, scalar_streak_summary(habits))
+
+    def test_import_without_numpy(self):
+        try:
+            with patch.dict(sys.modules, {"numpy": None}):  # Makes `import numpy` raise ImportError
+                module = importlib.reload(vector_analytics)
+                self.assertFalse(module.HAS_NUMPY)
+                habits = random_habits(20, seed=9)
+                self.assertEqual(module.get_streak_summary(habits), scalar_streak_summary(habits))
+        finally:
+            importlib.reload(vector_analytics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Batch analytics over many habits at once.
+
+All completion logs are packed into one columnar (habit_id, period) array and
+streaks, completion counts and adherence are computed for every habit in a
+few NumPy passes. NumPy is optional: without it (or with use_numpy=False) the
+same results are computed per habit in pure Python.
+"""
+
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from habit import EPOCH_ORDINAL, SECONDS_PER_DAY, CompactLogView, Habit
+from period import DAILY, WEEKLY, day_mapper, week_of_day
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+def pack_periods(habits: Sequence[Habit]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Pack every habit's completions into two parallel arrays.
+
+    Compact logs are read straight from their seconds buffers; all list logs
+    are converted in a single toordinal() pass. The mapping from days to weeks
+    is then done for all entries at once (other periodicities go through
+    period.day_mapper()).
+
+    Args:
+        habits (Sequence[Habit]): The habits; a habit's position is its habit_id.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (habit_ids, periods), both int64 and in log order.
+    """
+    logs = [h.completion_log for h in habits]
+    counts = np.fromiter(map(len, logs), dtype=np.int64, count=len(logs))
+    habit_ids = np.repeat(np.arange(len(logs), dtype=np.int64), counts)
+
+    compact = np.fromiter((isinstance(log, CompactLogView) for log in logs), dtype=bool, count=len(logs))
+    entry_compact = compact[habit_ids]
+    days = np.empty(len(habit_ids), dtype=np.int64)
+    list_logs = [log for log, is_compact in zip(logs, compact.tolist()) if not is_compact]
+    days[~entry_compact] = np.fromiter(map(datetime.toordinal, chain.from_iterable(list_logs)),
+                                       dtype=np.int64, count=len(habit_ids) - int(entry_compact.sum()))
+    if compact.any():
+        seconds = [np.frombuffer(log.seconds, dtype=np.int64) for log in logs if isinstance(log, CompactLogView)]
+        days[entry_compact] = np.concatenate(seconds) // SECONDS_PER_DAY + EPOCH_ORDINAL
+
+    periods = days  # Day ordinals are daily periods; other periodicities are mapped in place
+    for periodicity in {h.periodicity for h in habits} - {DAILY}:
+        selected = np.fromiter((h.periodicity == periodicity for h in habits), dtype=bool, count=len(habits))
+        entries = selected[habit_ids]
+        if periodicity == WEEKLY:
+            periods[entries] = week_of_day(days[entries])
+        else:
+            periods[entries] = np.fromiter(map(day_mapper(periodicity), days[entries].tolist()), dtype=np.int64)
+    return habit_ids, periods
+
+
+def _numpy_metrics(habits: Sequence[Habit], reference: "np.ndarray", window: int) -> Dict[str, "np.ndarray"]:
+    n = len(habits)
+    habit_ids, periods = pack_periods(habits)
+    completions = np.bincount(habit_ids, minlength=n)
+
+    if not len(periods):
+        zeros = np.zeros(n, dtype=np.int64)
+        return {"completions": completions, "longest_streak": zeros,
+                "current_streak": zeros, "adherence": np.zeros(n)}
+
+    # Sort by (habit, period) and drop repeated periods
+    order = np.lexsort((periods, habit_ids))
+    habit_ids, periods = habit_ids[order], periods[order]
+    keep = np.ones(len(periods), dtype=bool)
+    keep[1:] = (habit_ids[1:] != habit_ids[:-1]) | (periods[1:] != periods[:-1])
+    habit_ids, periods = habit_ids[keep], periods[keep]
+
+    # A run (streak) starts at a new habit or where the period is not previous + 1
+    run_start = np.ones(len(periods), dtype=bool)
+    run_start[1:] = (habit_ids[1:] != habit_ids[:-1]) | (periods[1:] != periods[:-1] + 1)
+    run_id = np.cumsum(run_start) - 1
+    start_idx = np.flatnonzero(run_start)
+    run_length = np.diff(np.append(start_idx, len(periods)))
+
+    longest = np.zeros(n, dtype=np.int64)
+    np.maximum.at(longest, habit_ids[start_idx], run_length)
+
+    # One sortable key per (habit, period) so per-habit lookups become searchsorted calls
+    offset = min(int(periods.min()), int(reference.min()) - window) - 1
+    span = max(int(periods.max()), int(reference.max())) - offset + 1
+    keys = habit_ids * span + (periods - offset)
+    ids = np.arange(n, dtype=np.int64)
+    ref_keys = ids * span + (reference - offset)
+
+    # Current streak: the last completed period at or before the reference period
+    # must be the reference period itself or the one right before it
+    last = np.searchsorted(keys, ref_keys, side="right") - 1
+    valid = last >= 0
+    last_clipped = np.where(valid, last, 0)
+    valid &= habit_ids[last_clipped] == ids
+    valid &= periods[last_clipped] >= reference - 1
+    current = np.where(valid, periods[last_clipped] - periods[start_idx[run_id[last_clipped]]] + 1, 0)
+
+    # Adherence: share of the `window` periods up to the reference period that were completed
+    in_window = last + 1 - np.searchsorted(keys, ref_keys - window, side="right")
+    adherence = in_window / window
+
+    return {"completions": completions, "longest_streak": longest,
+            "current_streak": current, "adherence": adherence}
+
+
+def _python_metrics(habits: Sequence[Habit], reference: List[int], window: int,
+                    session_date: datetime) -> Dict[str, list]:
+    completions, longest, current, adherence = [], [], [], []
+    for habit, ref in zip(habits, reference):
+        completions.append(habit.get_completion_count())
+        longest.append(habit.get_longest_streak())
+        current.append(habit.get_current_streak(session_date))
+        in_window = sum(1 for p in set(habit.period_numbers()) if ref - window < p <= ref)
+        adherence.append(in_window / window)
+    return {"completions": completions, "longest_streak": longest,
+            "current_streak": current, "adherence": adherence}
+
+
+def compute_metrics(habits: Iterable[Habit], session_date: Optional[datetime] = None,
+                    window: int = 30, use_numpy: Optional[bool] = None) -> Dict[str, Dict]:
+    """
+    Compute metrics for every habit in one batch.
+
+    Keys per habit:
+    - completions: number of logged completions
+    - longest_streak: longest uninterrupted streak
+    - current_streak: streak still alive at the session date
+    - adherence: share of the last `window` periods (days or weeks) up to the session date that were completed
+
+    Args:
+        habits (Iterable[Habit]): The habits to analyse.
+        session_date (Optional[datetime]): Reference date for current streak and adherence. Defaults to now.
+        window (int): Number of periods in the adherence window.
+        use_numpy (Optional[bool]): Force the NumPy (True) or pure-Python (False) engine.
+            Defaults to NumPy when it is installed.
+
+    Returns:
+        Dict[str, Dict]: Habit name -> metrics.
+    """
+    habits = list(habits)
+    session_date = session_date or datetime.now()
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise ImportError("NumPy is not installed.")
+
+    reference = [h.period_number(session_date) for h in habits]
+    if use_numpy:
+        columns = _numpy_metrics(habits, np.array(reference, dtype=np.int64), window)
+        columns = {key: values.tolist() for key, values in columns.items()}
+    else:
+        columns = _python_metrics(habits, reference, window, session_date)
+
+    return {
+        habit.name: {key: values[i] for key, values in columns.items()}
+        for i, habit in enumerate(habits)
+    }
+
+
+def get_streak_summary(habits: Iterable[Habit], use_numpy: Optional[bool] = None) -> dict:
+    """
+    Batch version of analytics.get_streak_summary with the same keys and results.
+    """
+    metrics = compute_metrics(habits, use_numpy=use_numpy)
+    if not metrics:
+        return {"total_habits": 0, "longest_streak_overall": 0, "average_streak": 0.0}
+    streaks = [m["longest_streak"] for m in metrics.values()]
+    return {
+        "total_habits": len(streaks),
+        "longest_streak_overall": max(streaks),
+        "average_streak": round(sum(streaks) / len(streaks), 2),
+    }